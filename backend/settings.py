@@ -1,5 +1,6 @@
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -18,6 +19,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'django_filters',
@@ -28,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'utils.metrics.RequestMetricsMiddleware',  # first, so its timings cover the whole stack
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -38,6 +41,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Requests running more queries than this are logged as possible N+1 loops
+METRICS_QUERY_WARN = int(os.getenv('METRICS_QUERY_WARN', '30'))
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [{
@@ -75,6 +81,38 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Pre-rendered public API snapshot (manage.py export_static_api), for nginx to serve
+STATIC_API_ROOT = Path(os.getenv('STATIC_API_ROOT', BASE_DIR / 'var' / 'static-api'))
+
+# Bulk gallery ingestion: process-pool size (unset = CPU count, 0 = inline)
+GALLERY_INGEST_WORKERS = int(os.environ['GALLERY_INGEST_WORKERS']) if os.getenv('GALLERY_INGEST_WORKERS') else None
+
+# Response cache for public read endpoints (utils.cache): API_CACHE_BACKEND=file|db|locmem.
+# It also holds the invalidation versions bumped by worker commands, so it must be shared
+# by every process: file (default, one host) or db (several hosts, run createcachetable).
+# locmem is per process: only for single-process development.
+API_CACHE_ALIAS = 'api'
+_API_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+}
+_API_CACHE_LOCATIONS = {
+    'file': str(BASE_DIR / 'var' / 'api-cache'),
+    'db': 'api_cache',
+}
+# Tests get a fresh per-process cache (a file cache would outlive the test database)
+TESTING = sys.argv[1:2] == ['test']
+_API_CACHE_BACKEND = 'locmem' if TESTING else os.getenv('API_CACHE_BACKEND', 'file')
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    API_CACHE_ALIAS: {
+        'BACKEND': _API_CACHE_BACKENDS.get(_API_CACHE_BACKEND, _API_CACHE_BACKEND),
+        'LOCATION': os.getenv('API_CACHE_LOCATION', _API_CACHE_LOCATIONS.get(_API_CACHE_BACKEND, 'api')),
+        'TIMEOUT': int(os.getenv('API_CACHE_TIMEOUT', '600')),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -82,11 +120,25 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
+        'utils.search.RankedSearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # orjson for API responses (utils/renderers.py); identical output to DRF's JSONRenderer
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 12,
+    # Token buckets for anonymous form POSTs (utils/throttling.py): burst of N, refilled over the period
+    'DEFAULT_THROTTLE_RATES': {
+        'contact_ip': os.getenv('THROTTLE_CONTACT_IP', '10/hour'),
+        'contact_email': os.getenv('THROTTLE_CONTACT_EMAIL', '5/hour'),
+        'quote_ip': os.getenv('THROTTLE_QUOTE_IP', '10/hour'),
+        'quote_email': os.getenv('THROTTLE_QUOTE_EMAIL', '5/hour'),
+    },
+    # Reverse proxies in front of Django; 0 = use REMOTE_ADDR and ignore X-Forwarded-For
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -98,5 +150,13 @@ SPECTACULAR_SETTINGS = {
 CORS_ALLOWED_ORIGINS = [o for o in os.getenv(
     'CORS_ALLOWED_ORIGINS', '').split(',') if o]
 
+# /api/changes/: re-read window before each client's ?since= (longer than any write transaction)
+# and how long deletion tombstones are kept (manage.py prune_tombstones)
+CHANGES_OVERLAP_SECONDS = int(os.getenv('CHANGES_OVERLAP_SECONDS', '300'))
+TOMBSTONE_RETENTION_DAYS = int(os.getenv('TOMBSTONE_RETENTION_DAYS', '90'))
+
+# Most sub-requests one /api/batch/ call may dispatch
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '10'))
+
 CONTACT_NOTIFY_EMAIL = os.getenv('CONTACT_NOTIFY_EMAIL')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'web@localhost')
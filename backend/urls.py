@@ -1,17 +1,17 @@
+import re
 
 from quotes.views import QuoteViewSet
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
-from core.views import SiteInfoViewSet, StaticPageViewSet
+from core.views import SiteInfoViewSet, StaticPageViewSet, SearchView, MetricsView, BatchView, ChangesView, serve_media
 from services.views import ServiceViewSet
 from mediahub.views import GalleryViewSet
 from blog.views import PostViewSet
-from contact.views import ContactMessageCreateView
+from contact.views import ContactMessageCreateView, ContactMessageExportView
+from utils.lazy import lazy_view
 
 router = DefaultRouter()
 router.register(r'site', SiteInfoViewSet, basename='site-info')
@@ -26,6 +26,20 @@ urlpatterns = [
     path('api/', include(router.urls)),
     path('api/contact-messages/', ContactMessageCreateView.as_view(),
          name='contact-messages'),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('api/contact-messages/export_csv/', ContactMessageExportView.as_view(export_format='csv'),
+         name='contact-messages-export-csv'),
+    path('api/contact-messages/export_ndjson/', ContactMessageExportView.as_view(export_format='ndjson'),
+         name='contact-messages-export-ndjson'),
+    path('api/search/', SearchView.as_view(), name='search'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/changes/', ChangesView.as_view(), name='changes'),
+    path('api/_metrics', MetricsView.as_view(), name='metrics'),
+    # drf-spectacular is imported on the first docs request, not at worker boot
+    path('api/schema/', lazy_view('drf_spectacular.views.SpectacularAPIView'), name='schema'),
+    path('api/docs/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema')),
+]
+
+if settings.DEBUG:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_alter_post_slug'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_published', '-published_at', '-id'], name='post_published_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:32
+
+from django.db import migrations, models
+
+from utils.rendering import RENDERER_VERSION, render_body
+
+
+def render_existing_bodies(apps, schema_editor):
+    Model = apps.get_model('blog', 'Post')
+    rows = list(Model.objects.only('id', 'body'))
+    for row in rows:
+        for field, value in render_body(row.body).items():
+            setattr(row, field, value)
+        row.body_renderer_version = RENDERER_VERSION
+    Model.objects.bulk_update(
+        rows, ['body_html', 'toc', 'reading_time', 'body_renderer_version'], batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='body_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='body_renderer_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='toc',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(render_existing_bodies, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,39 @@
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 
-class Post(models.Model):
+from utils.rendering import RenderedBodyMixin
+from utils.search import SearchVectorMixin
+
+class Post(SearchVectorMixin, RenderedBodyMixin, models.Model):
     title = models.CharField(max_length=180)
     slug = models.SlugField(unique=True, blank=True, max_length=180)
     excerpt = models.TextField(blank=True)
     body = models.TextField()  # Markdown or HTML
+    # Pre-rendered from body on save (utils.rendering)
+    body_html = models.TextField(blank=True, editable=False)
+    toc = models.JSONField(default=list, blank=True, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)  # minutes
+    body_renderer_version = models.PositiveSmallIntegerField(default=0, editable=False)
     cover_image = models.ImageField(upload_to='blog/', blank=True, null=True)
     published_at = models.DateTimeField()
     is_published = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    search_vector_fields = (('title', 'A'), ('excerpt', 'B'), ('body', 'C'))
 
     class Meta:
         ordering = ['-published_at']
+        indexes = [
+            # Keyset (cursor) pagination of published posts
+            models.Index(fields=['is_published', '-published_at', '-id'], name='post_published_idx'),
+            GinIndex(fields=['search_vector'], name='post_search_gin'),
+            models.Index(fields=['updated_at'], name='post_updated_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
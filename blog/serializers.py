@@ -1,13 +1,21 @@
 
 from rest_framework import serializers
 from .models import Post
+from utils.sparse import DynamicFieldsMixin
+
+class PostListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # Highlighted body snippet, only present when listing with ?search=
+    headline = serializers.SerializerMethodField()
 
-class PostListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
-        fields = ['title', 'slug', 'excerpt', 'cover_image', 'published_at']
+        fields = ['title', 'slug', 'excerpt', 'cover_image', 'published_at', 'headline']
+
+    def get_headline(self, obj):
+        return getattr(obj, 'search_headline', None)
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Post
-        fields = ['title', 'slug', 'excerpt', 'body', 'cover_image', 'published_at']
+        fields = ['title', 'slug', 'excerpt', 'body', 'body_html', 'toc', 'reading_time',
+                  'cover_image', 'published_at']
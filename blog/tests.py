@@ -1 +1,66 @@
-# tests
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from utils.testing import NO_CACHE, stock_and_fast_list
+from .models import Post
+from .views import PostViewSet
+
+
+@override_settings(CACHES=NO_CACHE)
+class PostQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        for n in range(15):
+            Post.objects.create(title=f"Kitchen tips {n}", excerpt="Tips", body="## Tiles\nGrout.",
+                                published_at=now - timedelta(days=n))
+        Post.objects.create(title="Draft", body="Soon", published_at=now, is_published=False)
+
+    def test_list(self):
+        with self.assertNumQueries(3):  # ETag aggregate, count, rows
+            response = self.client.get(reverse("blog-list"))
+        self.assertEqual(response.json()["count"], 15)
+
+    def test_cursor_page(self):
+        with self.assertNumQueries(2):  # ETag aggregate, rows
+            self.assertEqual(self.client.get(reverse("blog-list") + "?cursor=").status_code, 200)
+
+    def test_search(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("blog-list") + "?search=kitchen")
+        self.assertEqual(response.json()["count"], 15)
+
+    def test_detail(self):
+        post = Post.objects.filter(is_published=True).first()
+        with self.assertNumQueries(2):  # ETag, row
+            self.assertEqual(self.client.get(reverse("blog-detail", args=[post.slug])).status_code, 200)
+
+
+@override_settings(CACHES=NO_CACHE, TIME_ZONE="Europe/Dublin")
+class PostFastListParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Post.objects.create(title="Kitchen tiling – a guide", excerpt="Grout, sealant & “quotes”",
+                            body="Kitchen walls\n\nTiles.", cover_image="blog/cover one.jpg",
+                            published_at=datetime(2025, 7, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc))
+        Post.objects.create(title="Bathroom kitchen refit", body="No cover image", cover_image=None,
+                            published_at=datetime(2025, 1, 15, 12, 0, tzinfo=dt_timezone.utc))
+
+    def assertParity(self, url):
+        stock, fast = stock_and_fast_list(self.client, PostViewSet, url)
+        self.assertEqual(stock, fast)
+        return fast
+
+    def test_list(self):
+        body = self.assertParity(reverse("blog-list"))
+        self.assertIn(b'"2025-07-01T10:30:15.123456+01:00"', body)
+        self.assertIn(b'"cover_image":null', body)
+
+    def test_cursor(self):
+        self.assertParity(reverse("blog-list") + "?cursor=&page_size=1")
+
+    def test_search_headlines(self):
+        self.assertIn(b"<mark>", self.assertParity(reverse("blog-list") + "?search=kitchen"))
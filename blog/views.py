@@ -1,14 +1,25 @@
 
 from rest_framework import viewsets, permissions
+from utils.cache import CachedResponseMixin
+from utils.conditional import ConditionalGetMixin
+from utils.fastlist import FastListMixin
+from utils.pagination import KeysetOrPageNumberPagination
+from utils.sparse import SparseFieldsMixin
 from .models import Post
 from .serializers import PostListSerializer, PostDetailSerializer
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Post.objects.all()
     lookup_field = 'slug'
     filterset_fields = ['published_at', 'is_published']
     search_fields = ['title', 'excerpt', 'body']
+    # ?search= uses the stored, weighted tsvector (utils.search.RankedSearchFilter)
+    search_vector_field = 'search_vector'
+    search_headline_field = 'body_html'
     ordering_fields = ['published_at', 'title']
+    pagination_class = KeysetOrPageNumberPagination
+    cursor_ordering = ('-published_at', '-id')
+    cache_models = (Post,)
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -17,6 +28,11 @@ class PostViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         qs = super().get_queryset()
+        if self.action == 'list':
+            # PostListSerializer never reads the body columns (search headlines are computed in SQL)
+            qs = qs.defer('body', 'body_html', 'toc', 'search_vector')
+        elif self.action == 'retrieve':
+            qs = qs.defer('search_vector')
         if self.request.user.is_staff:
             return qs
         return qs.filter(is_published=True)
@@ -1,6 +1,6 @@
 
 from django.contrib import admin
-from .models import ContactMessage
+from .models import ContactMessage, Notification
 
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
@@ -8,3 +8,12 @@ class ContactMessageAdmin(admin.ModelAdmin):
     list_filter = ("processed", "created_at")
     search_fields = ("name", "email", "subject", "message")
     readonly_fields = ("name", "email", "phone", "subject", "message", "source_page", "created_at")
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "sent_at", "created_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("subject", "source", "recipients")
+    readonly_fields = ("subject", "body", "from_email", "recipients", "reply_to", "source",
+                       "attempts", "last_error", "created_at", "started_at", "sent_at")
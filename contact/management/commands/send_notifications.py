@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from contact.notifications import requeue_stale, send_due
+from utils.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "Deliver queued staff notification emails (transactional outbox, no broker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Exit when nothing is due instead of polling.")
+        parser.add_argument("--sleep", type=float, default=5.0,
+                            help="Seconds between polls when idle (default: 5).")
+        parser.add_argument("--batch-size", type=int, default=50,
+                            help="Notifications sent per SMTP connection (default: 50).")
+
+    def handle(self, *args, **options):
+        def poll():
+            # Expired leases are checked on every poll, so a dead worker's notifications are
+            # picked up by whichever worker is still alive
+            stale = requeue_stale()
+            if stale:
+                self.stdout.write(f"[requeue] {stale} stale notification(s)")
+            sent, failed = send_due(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"[batch] sent {sent}, failed {failed}")
+            # A batch of only failures has been pushed into the future: go idle
+            return bool(sent)
+
+        run_worker(poll, once=options["once"], sleep=options["sleep"])
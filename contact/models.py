@@ -1,4 +1,7 @@
 from django.db import models
+from django.utils import timezone
+
+from utils.jobs import JOB_STATUS_CHOICES, QUEUED
 
 
 class ContactMessage(models.Model):
@@ -15,3 +18,30 @@ class ContactMessage(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.subject or 'No subject'}"
+
+
+class Notification(models.Model):
+    """
+    Outbox row for a staff email, written in the same transaction as the record
+    it announces and delivered by `manage.py send_notifications`.
+    """
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    reply_to = models.CharField(max_length=254, blank=True)
+    source = models.CharField(max_length=60, blank=True)  # e.g. "contact:12", "quote:7"
+    status = models.CharField(max_length=20, choices=JOB_STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"], name="notification_due_idx")]
+
+    def __str__(self):
+        return f"{self.subject} [{self.status}]"
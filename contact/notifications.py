@@ -0,0 +1,132 @@
+# contact/notifications.py
+"""
+Transactional outbox for staff notification emails.
+
+Views call `enqueue()` inside the transaction that creates the record, so a
+notification exists exactly when its enquiry does and the request never waits
+on SMTP. `manage.py send_notifications` delivers due rows in batches over one
+SMTP connection, retrying failures with exponential backoff.
+"""
+import datetime
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from utils.jobs import DONE, FAILED, QUEUED, claim_batch, requeue_expired
+from .models import Notification
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 60  # seconds; doubled after every failed attempt
+BACKOFF_MAX = 6 * 60 * 60
+STALE_AFTER = datetime.timedelta(minutes=15)  # RUNNING rows left behind by a dead worker
+
+
+def enqueue(subject, body, source="", reply_to=""):
+    """Queue a staff email; a no-op when CONTACT_NOTIFY_EMAIL is not configured."""
+    recipient = getattr(settings, "CONTACT_NOTIFY_EMAIL", None)
+    if not recipient:
+        return None
+    return Notification.objects.create(
+        subject=subject[:255],
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipients=[recipient],
+        reply_to=reply_to,
+        source=source,
+    )
+
+
+def notify_contact_message(message):
+    return enqueue(
+        subject=f"[ARConstruction] Contact: {message.subject or message.name}",
+        body=(
+            f"From: {message.name} ({message.email}, {message.phone or 'no phone'})\n"
+            f"Page: {message.source_page or '-'}\n\n{message.message}"
+        ),
+        source=f"contact:{message.pk}",
+        reply_to=message.email,
+    )
+
+
+def notify_quote(quote):
+    return enqueue(
+        subject=f"[ARConstruction] Quote request: {quote.service or quote.full_name}",
+        body=(
+            f"From: {quote.full_name} ({quote.email}, {quote.phone or 'no phone'})\n"
+            f"Service: {quote.service or '-'}\n"
+            f"Page: {quote.source_page or '-'}\n\n{quote.description}"
+        ),
+        source=f"quote:{quote.pk}",
+        reply_to=quote.email,
+    )
+
+
+# --- Delivery ---
+def backoff(attempts):
+    return datetime.timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def _email(notification, connection):
+    return EmailMessage(
+        subject=notification.subject,
+        body=notification.body,
+        from_email=notification.from_email,
+        to=notification.recipients,
+        reply_to=[notification.reply_to] if notification.reply_to else None,
+        connection=connection,
+    )
+
+
+def _failed(notification, error, now):
+    notification.attempts += 1
+    notification.last_error = str(error)[:2000] or error.__class__.__name__
+    if notification.attempts >= MAX_ATTEMPTS:
+        notification.status = FAILED
+    else:
+        notification.status = QUEUED
+        notification.next_attempt_at = now + backoff(notification.attempts)
+    notification.save(update_fields=["status", "attempts", "last_error", "next_attempt_at"])
+
+
+def requeue_stale():
+    """Hand rows claimed by a worker that died mid-batch back to the queue."""
+    return requeue_expired(Notification.objects.all(), STALE_AFTER)
+
+
+def send_due(batch_size=50):
+    """
+    Claim up to ``batch_size`` due notifications and send them over a single
+    SMTP connection. Returns (sent, failed) counts for this batch.
+    """
+    due = Notification.objects.filter(next_attempt_at__lte=timezone.now())
+    batch = claim_batch(due, batch_size, order_by="next_attempt_at")
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:  # server unreachable: the whole batch backs off
+        now = timezone.now()
+        for notification in batch:
+            _failed(notification, exc, now)
+        return 0, len(batch)
+
+    try:
+        for notification in batch:
+            try:
+                _email(notification, connection).send()
+            except Exception as exc:
+                _failed(notification, exc, timezone.now())
+                failed += 1
+            else:
+                notification.status, notification.sent_at = DONE, timezone.now()
+                notification.attempts += 1
+                notification.last_error = ""
+                notification.save(update_fields=["status", "sent_at", "attempts", "last_error"])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
@@ -1 +1,219 @@
-# tests
+import json
+import threading
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.models import ThrottleBucket
+from utils.cache import get_cache
+from utils.jobs import DONE, FAILED, QUEUED, RUNNING
+from utils.spam import MAX_LINKS, rejection_stats
+from utils.throttling import IPTokenBucketThrottle, TokenBucketThrottle
+from .models import ContactMessage, Notification
+from .notifications import MAX_ATTEMPTS, STALE_AFTER, enqueue, send_due
+
+OUTBOX = dict(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+              CONTACT_NOTIFY_EMAIL="staff@example.com")
+MESSAGE = {"name": "Ann", "email": "ann@example.com", "subject": "Loft", "message": "A loft conversion, please."}
+
+
+@override_settings(**OUTBOX)
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        get_cache().clear()  # throttle buckets and duplicate-submission hashes
+
+    def test_enquiry_queues_its_notification(self):
+        response = self.client.post(reverse("contact-messages"), MESSAGE)
+        self.assertEqual(response.status_code, 201)
+        message = ContactMessage.objects.get()
+        notification = Notification.objects.get()
+        self.assertEqual(notification.source, f"contact:{message.pk}")
+        self.assertEqual(notification.recipients, ["staff@example.com"])
+        self.assertEqual(notification.reply_to, "ann@example.com")
+        self.assertEqual(mail.outbox, [])  # sent by the worker, not the request
+
+    def test_enquiry_and_notification_roll_back_together(self):
+        with mock.patch.object(Notification.objects, "create", side_effect=RuntimeError("db")):
+            with self.assertRaises(RuntimeError):
+                self.client.post(reverse("contact-messages"), MESSAGE)
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+
+    def test_send_due_delivers_in_batches(self):
+        for n in range(5):
+            enqueue(f"Enquiry {n}", "body")
+        self.assertEqual(send_due(batch_size=2), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(send_due(batch_size=2), (2, 0))
+        self.assertEqual(send_due(batch_size=2), (1, 0))
+        self.assertEqual(send_due(batch_size=2), (0, 0))
+        self.assertEqual(sorted(m.subject for m in mail.outbox), [f"Enquiry {n}" for n in range(5)])
+        self.assertEqual(Notification.objects.filter(status=DONE, attempts=1).count(), 5)
+
+    def test_failed_send_backs_off_then_gives_up(self):
+        notification = enqueue("Enquiry", "body")
+        now = timezone.now()
+        with mock.patch("django.core.mail.EmailMessage.send", side_effect=SMTPException("refused")), \
+                mock.patch("django.utils.timezone.now", return_value=now):
+            self.assertEqual(send_due(), (0, 1))
+            self.assertEqual(send_due(), (0, 0))  # not due again until the backoff has passed
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts), (QUEUED, 1))
+        self.assertEqual(notification.last_error, "refused")
+        self.assertEqual(notification.next_attempt_at, now + timedelta(seconds=60))
+
+        with mock.patch("django.core.mail.EmailMessage.send", side_effect=SMTPException("refused")):
+            for attempt in range(2, MAX_ATTEMPTS + 1):
+                Notification.objects.filter(pk=notification.pk).update(next_attempt_at=timezone.now())
+                self.assertEqual(send_due(), (0, 1))
+                notification.refresh_from_db()
+                self.assertEqual(notification.attempts, attempt)
+        self.assertEqual(notification.status, FAILED)
+        self.assertEqual(mail.outbox, [])
+
+    def test_running_worker_requeues_a_dead_workers_rows(self):
+        notification = enqueue("Enquiry", "body")
+        Notification.objects.filter(pk=notification.pk).update(status=RUNNING, started_at=timezone.now())
+
+        def run_worker(poll, **options):
+            self.assertFalse(poll())  # claimed by another worker, lease still valid
+            Notification.objects.filter(pk=notification.pk).update(
+                started_at=timezone.now() - STALE_AFTER - timedelta(minutes=1))  # ... which then died
+            self.assertTrue(poll())
+
+        with mock.patch("contact.management.commands.send_notifications.run_worker", run_worker):
+            call_command("send_notifications", stdout=mock.Mock())
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, DONE)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_retry_after_backoff_is_delivered(self):
+        notification = enqueue("Enquiry", "body")
+        with mock.patch("django.core.mail.EmailMessage.send", side_effect=SMTPException("refused")):
+            send_due()
+        later = timezone.now() + timedelta(minutes=2)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            self.assertEqual(send_due(), (1, 0))
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts, notification.last_error), (DONE, 2, ""))
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class ContactExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+        for name in ("Cara", "Ann", "Bob"):
+            ContactMessage.objects.create(name=name, email=f"{name.lower()}@example.com", message="Hi")
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def export(self, **params):
+        response = self.client.get(reverse("contact-messages-export-ndjson"), params)
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines() if line]
+
+    def test_ordering(self):
+        self.assertEqual([row["name"] for row in self.export(ordering="name")], ["Ann", "Bob", "Cara"])
+
+    def test_unknown_ordering_is_ignored(self):
+        self.assertEqual(len(self.export(ordering="user_agent")), 3)
+
+
+@mock.patch.object(TokenBucketThrottle, "THROTTLE_RATES", {})
+class SpamCheckTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def post(self, **data):
+        return self.client.post(reverse("contact-messages"), {**MESSAGE, **data})
+
+    def assertRejected(self, response, reason):
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "Your submission could not be accepted.")
+        self.assertEqual(rejection_stats()[reason], 1)
+
+    def test_honeypot(self):
+        self.assertRejected(self.post(website="http://spam.example"), "honeypot")
+        self.assertFalse(ContactMessage.objects.exists())
+
+    def test_link_limit_counts_every_text_field(self):
+        links = ["http://a.example", "https://b.example", "www.c.example", "HTTP://d.example"]
+        self.assertEqual(self.post(subject=links[0], message=" ".join(links[1:MAX_LINKS])).status_code, 201)
+        self.assertRejected(self.post(subject=links[0], message=" ".join(links[1:MAX_LINKS + 1])), "links")
+
+    def test_duplicate_within_window(self):
+        self.assertEqual(self.post().status_code, 201)
+        # Case and whitespace do not make a resubmission new
+        self.assertRejected(self.post(email="ANN@example.com", message="A loft  conversion, please. "), "duplicate")
+        self.assertEqual(self.post(message="A garage conversion, please.").status_code, 201)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_staff_are_not_checked(self):
+        self.client.force_login(get_user_model().objects.create_user("staff", password="x", is_staff=True))
+        self.assertEqual(self.post(website="x").status_code, 201)
+        self.assertEqual(self.post(website="x").status_code, 201)
+        self.assertEqual(rejection_stats()["honeypot"], 0)
+
+
+@mock.patch.object(TokenBucketThrottle, "THROTTLE_RATES", {"contact_ip": "2/hour"})
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def post(self, n):
+        return self.client.post(reverse("contact-messages"), {**MESSAGE, "email": f"ann{n}@example.com"})
+
+    def test_burst_then_refill(self):
+        now = timezone.now().timestamp()
+        with mock.patch.object(TokenBucketThrottle, "timer", return_value=now):
+            self.assertEqual([self.post(n).status_code for n in range(3)], [201, 201, 429])
+        self.assertEqual(ThrottleBucket.objects.get().key, "throttle:contact_ip:127.0.0.1")
+        # "2/hour" refills one token every 30 minutes
+        with mock.patch.object(TokenBucketThrottle, "timer", return_value=now + 30 * 60):
+            self.assertEqual([self.post(n).status_code for n in range(3, 5)], [201, 429])
+
+    def test_email_bucket_spans_addresses(self):
+        with mock.patch.object(TokenBucketThrottle, "THROTTLE_RATES", {"contact_email": "2/hour"}):
+            statuses = [
+                self.client.post(reverse("contact-messages"), {**MESSAGE, "email": email, "message": f"Take {n}"},
+                                 REMOTE_ADDR=f"10.0.0.{n}").status_code
+                for n, email in enumerate(["ann@example.com", " Ann@Example.com", "ann@example.com"])
+            ]
+            self.assertEqual(statuses, [201, 201, 429])
+            self.assertEqual(rejection_stats()["throttle_email"], 1)
+            self.assertEqual(self.post(9).status_code, 201)  # another address has its own bucket
+
+
+@mock.patch.object(TokenBucketThrottle, "THROTTLE_RATES", {"contact_ip": "5/hour"})
+class TokenBucketConcurrencyTests(TransactionTestCase):
+    def test_concurrent_requests_cannot_overspend(self):
+        view = mock.Mock(throttle_scope="contact")
+        start, results = threading.Barrier(12), []
+
+        def attempt():
+            request = Request(APIRequestFactory().post("/", REMOTE_ADDR="10.0.0.1"))
+            request.user = mock.Mock(is_staff=False)
+            start.wait()
+            try:
+                results.append(IPTokenBucketThrottle().allow_request(request, view))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=attempt) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 5)
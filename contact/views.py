@@ -1,28 +1,49 @@
 
-from rest_framework import generics
-from django.core.mail import send_mail
-from django.conf import settings
+from rest_framework import generics, permissions
+from django.db import transaction
 from .models import ContactMessage
+from .notifications import notify_contact_message
 from .serializers import ContactMessageSerializer
+from utils.spam import SpamCheckMixin
+from utils.streaming import streaming_export
+from utils.throttling import EmailTokenBucketThrottle, IPTokenBucketThrottle, client_ip
 
 
-class ContactMessageCreateView(generics.CreateAPIView):
+class ContactMessageCreateView(SpamCheckMixin, generics.CreateAPIView):
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'contact'
+    spam_text_fields = ('subject', 'message')
 
     def perform_create(self, serializer):
-        instance = serializer.save()
-        if getattr(settings, 'CONTACT_NOTIFY_EMAIL', None):
-            try:
-                send_mail(
-                    subject=f"[ARConstruction] Contact: {instance.subject or instance.name}",
-                    message=(
-                        f"From: {instance.name} (" f"{instance.email}, {instance.phone})" f"{instance.message}"
-                    ),
-                    from_email=getattr(
-                        settings, 'DEFAULT_FROM_EMAIL', instance.email),
-                    recipient_list=[settings.CONTACT_NOTIFY_EMAIL],
-                    fail_silently=True,
-                )
-            except Exception:
-                pass
+        self.check_spam(serializer)
+        # The staff email is queued in the same transaction and sent by
+        # `manage.py send_notifications`, so the request never waits on SMTP.
+        with transaction.atomic():
+            instance = serializer.save(
+                ip_address=client_ip(self.request),
+                user_agent=self.request.META.get('HTTP_USER_AGENT', '')[:256],
+            )
+            notify_contact_message(instance)
+
+
+class ContactMessageExportView(generics.GenericAPIView):
+    """
+    Admin-only bulk export of contact messages, streamed as CSV or NDJSON.
+    Filters: ?processed=true|false, ?search=, ?ordering=; ?gzip=1 compresses on the fly.
+    """
+    queryset = ContactMessage.objects.order_by('-created_at')
+    permission_classes = [permissions.IsAdminUser]
+    filterset_fields = ['processed']
+    search_fields = ['name', 'email', 'subject', 'message']
+    ordering_fields = ['created_at', 'name', 'email', 'processed']
+    schema = None  # file download, not part of the JSON API schema
+    export_format = 'csv'
+    export_fields = ('id', 'created_at', 'name', 'email', 'phone', 'subject', 'message',
+                     'source_page', 'processed', 'ip_address', 'user_agent')
+
+    def get(self, request):
+        qs = self.filter_queryset(self.get_queryset())
+        return streaming_export(request, qs, self.export_fields, self.export_format,
+                                'arconstruction-contact-messages')
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from utils.cache import bump_on_change
+
+        # Any project model edit invalidates cached API responses built from it
+        post_save.connect(bump_on_change, dispatch_uid='api_cache_post_save')
+        post_delete.connect(bump_on_change, dispatch_uid='api_cache_post_delete')
+
+        from . import changes  # noqa: F401  (records /api/changes/ tombstones on delete)
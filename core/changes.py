@@ -0,0 +1,105 @@
+"""
+Delta sync for /api/changes/: which public content rows changed or disappeared
+in a time window, from the ``updated_at`` indexes and the Tombstone table.
+
+A row that is still present but no longer public (unpublished post, inactive
+service or gallery item) is reported as deleted, like a real deletion: the
+feed mirrors what anonymous API clients can see. Rows whose visibility hangs
+on a parent (FAQs of a service) are also re-reported when the parent changes.
+
+``updated_at`` is stamped before the writing transaction commits, so a row can
+appear with a timestamp older than the end of a window already served. Callers
+re-read an overlap of ``OVERLAP`` before the client's ``since``: entries may
+repeat across calls, but none are skipped. Tombstones are kept for
+``RETENTION`` (``manage.py prune_tombstones``); an older ``since`` gets a full
+listing instead.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import BooleanField, ExpressionWrapper, Q, Value
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from blog.models import Post
+from mediahub.models import GalleryItem
+from services.models import Service, ServiceFAQ
+from .models import SiteInfo, StaticPage, Tombstone
+
+OVERLAP = timedelta(seconds=settings.CHANGES_OVERLAP_SECONDS)
+RETENTION = timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+
+# key, model, public rows (None = all), slug field (None = id only), parent whose changes count too
+FEEDS = [
+    ('site', SiteInfo, None, None, None),
+    ('pages', StaticPage, None, 'slug', None),
+    ('services', Service, Q(is_active=True), 'slug', None),
+    ('service_faqs', ServiceFAQ, Q(service__is_active=True), None, 'service'),
+    ('gallery', GalleryItem, Q(is_active=True), None, None),
+    ('blog', Post, Q(is_published=True), 'slug', None),
+]
+TRACKED = {model._meta.label_lower: (key, slug_field) for key, model, _, slug_field, _ in FEEDS}
+
+
+@receiver(post_delete, dispatch_uid="changes_tombstone")
+def record_tombstone(sender, instance, **kwargs):
+    tracked = TRACKED.get(sender._meta.label_lower)
+    if tracked is None:
+        return
+    slug_field = tracked[1]
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk,
+                             slug=getattr(instance, slug_field, '') if slug_field else '')
+
+
+def _entry(row, slug_field):
+    entry = {'id': row['pk']}
+    if slug_field:
+        entry['slug'] = row[slug_field]
+    return entry
+
+
+def _window(field, since, until):
+    window = Q(**{f'{field}__lte': until})
+    if since is not None:
+        window &= Q(**{f'{field}__gt': since})
+    return window
+
+
+def window_start(since, now):
+    """Where to start reading for a client's ``since``: None means a full listing."""
+    if since is None or since < now - RETENTION:
+        return None  # tombstones from before the retention period may be gone
+    return since - OVERLAP
+
+
+def changes_between(since, until):
+    """
+    {key: {"updated": [...], "deleted": [...]}} for rows changed in (since, until];
+    ``since=None`` lists every public row (a full sync) and no deletions.
+    Updated entries carry id, slug (where the API looks rows up by slug) and updated_at.
+    """
+    changes = {}
+    for key, model, public, slug_field, parent in FEEDS:
+        window = _window('updated_at', since, until)
+        if parent is not None and since is not None:
+            window |= _window(f'{parent}__updated_at', since, until)
+        qs = model.objects.filter(window).order_by('updated_at', 'pk')
+        if since is None and public is not None:
+            qs = qs.filter(public)
+        visible = ExpressionWrapper(public if public is not None else Value(True), output_field=BooleanField())
+        fields = ['pk', 'updated_at'] + ([slug_field] if slug_field else [])
+        updated, deleted = [], []
+        for row in qs.annotate(visible=visible).values('visible', *fields):
+            if row['visible']:
+                updated.append({**_entry(row, slug_field), 'updated_at': row['updated_at']})
+            else:
+                deleted.append(_entry(row, slug_field))
+        changes[key] = {'updated': updated, 'deleted': deleted}
+
+    if since is not None:
+        tombstones = Tombstone.objects.filter(deleted_at__gt=since, deleted_at__lte=until).order_by('deleted_at', 'pk')
+        for model, object_id, slug in tombstones.values_list('model', 'object_id', 'slug'):
+            if model in TRACKED:
+                key, slug_field = TRACKED[model]
+                changes[key]['deleted'].append({'id': object_id, 'slug': slug} if slug_field else {'id': object_id})
+    return changes
@@ -0,0 +1,86 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Modules only admin exports / uploads / docs need; none should load at worker boot.
+HEAVY_MODULES = ["pandas", "numpy", "reportlab", "openpyxl", "PIL", "nh3", "drf_spectacular.views"]
+
+# Runs in a fresh interpreter, like a newly forked/spawned worker.
+PROBE = """
+import json, os, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+t1 = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+t2 = time.perf_counter()
+rss_kb = 0
+with open("/proc/self/status") as fh:
+    for line in fh:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+print(json.dumps({
+    "setup_ms": (t1 - t0) * 1000,
+    "urls_ms": (t2 - t1) * 1000,
+    "rss_mb": rss_kb / 1024,
+    "modules": len(sys.modules),
+    "loaded": [m for m in json.loads(os.environ["STARTUP_WATCH"]) if m in sys.modules],
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure worker boot cost: django.setup() + URLconf import time, RSS and heavy imports."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--max-ms", type=float,
+                            help="Fail if median setup + URLconf time exceeds this many milliseconds.")
+        parser.add_argument("--max-rss-mb", type=float, help="Fail if median RSS exceeds this.")
+        parser.add_argument("--fail-on", nargs="*", default=HEAVY_MODULES,
+                            help="Fail if any of these modules is imported at boot "
+                                 "(default: %(default)s; pass no names to disable).")
+        parser.add_argument("--json", action="store_true", help="Print the raw measurements as JSON.")
+
+    def handle(self, *args, **options):
+        env = {**os.environ,
+               "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE),
+               "STARTUP_WATCH": json.dumps(options["fail_on"]),
+               "PYTHONDONTWRITEBYTECODE": "0"}
+        results = []
+        for _ in range(max(options["runs"], 1)):
+            proc = subprocess.run([sys.executable, "-c", PROBE], env=env, cwd=settings.BASE_DIR,
+                                  capture_output=True, text=True)
+            if proc.returncode:
+                raise CommandError(f"Probe failed:\n{proc.stderr}")
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+        summary = {key: statistics.median(r[key] for r in results)
+                   for key in ("setup_ms", "urls_ms", "rss_mb", "modules")}
+        summary["total_ms"] = statistics.median(r["setup_ms"] + r["urls_ms"] for r in results)
+        loaded = sorted({m for r in results for m in r["loaded"]})
+
+        if options["json"]:
+            self.stdout.write(json.dumps({"runs": results, "median": summary, "heavy_loaded": loaded}))
+        else:
+            self.stdout.write(
+                f"median of {len(results)}: setup {summary['setup_ms']:.0f} ms + URLconf "
+                f"{summary['urls_ms']:.0f} ms = {summary['total_ms']:.0f} ms, "
+                f"RSS {summary['rss_mb']:.1f} MB, {summary['modules']:.0f} modules")
+
+        failures = []
+        if loaded:
+            failures.append(f"heavy modules imported at boot: {', '.join(loaded)}")
+        if options["max_ms"] is not None and summary["total_ms"] > options["max_ms"]:
+            failures.append(f"boot took {summary['total_ms']:.0f} ms (> {options['max_ms']:.0f} ms)")
+        if options["max_rss_mb"] is not None and summary["rss_mb"] > options["max_rss_mb"]:
+            failures.append(f"RSS {summary['rss_mb']:.1f} MB (> {options['max_rss_mb']:.1f} MB)")
+        if failures:
+            raise CommandError("; ".join(failures))
+        self.stdout.write(self.style.SUCCESS("Startup budget OK."))
@@ -0,0 +1,105 @@
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.models import Post
+from core.models import StaticPage
+from mediahub.models import IngestJob
+from quotes.models import Quote
+from services.models import Service, ServiceFAQ
+from utils.testing import NO_CACHE
+
+
+def _first(queryset, attr="pk"):
+    obj = queryset.first()
+    return getattr(obj, attr) if obj else None
+
+
+def _service_with_most_faqs():
+    from django.db.models import Count
+    return _first(Service.objects.filter(is_active=True).annotate(n=Count("faqs")).order_by("-n"), "slug")
+
+
+def _batch(*names):
+    return reverse("batch") + "?" + urlencode([("path", reverse(name)) for name in names])
+
+
+def _admin(model, view="changelist", obj=None):
+    name = f"admin:{model._meta.app_label}_{model._meta.model_name}_{view}"
+    return reverse(name, args=[obj] if obj is not None else [])
+
+
+# (label, lazy path (None = no data to check), max queries, as staff)
+# Staff budgets include the session + user lookups (2 queries). Detail and
+# list budgets must not depend on the number of related rows.
+BUDGETS = [
+    ("site-info-list", lambda: reverse("site-info-list"), 3, False),
+    ("pages-list", lambda: reverse("pages-list"), 3, False),
+    ("pages-detail", lambda: (slug := _first(StaticPage.objects, "slug")) and reverse("pages-detail", args=[slug]), 2, False),
+    ("services-list", lambda: reverse("services-list"), 3, False),
+    ("services-featured", lambda: reverse("services-featured"), 1, False),
+    ("services-detail", lambda: (slug := _service_with_most_faqs()) and reverse("services-detail", args=[slug]), 3, False),
+    ("gallery-list", lambda: reverse("gallery-list"), 3, False),
+    ("gallery-tags", lambda: reverse("gallery-tag-counts"), 1, False),
+    ("blog-list", lambda: reverse("blog-list"), 3, False),
+    ("blog-detail", lambda: (slug := _first(Post.objects.filter(is_published=True), "slug")) and reverse("blog-detail", args=[slug]), 2, False),
+    ("search", lambda: reverse("search") + "?q=kitchen", 3, False),
+    ("changes", lambda: reverse("changes") + "?since=2000-01-01T00:00:00Z", 7, False),
+    ("batch-homepage", lambda: _batch("site-info-list", "services-featured", "gallery-list", "blog-list"), 10, False),
+    ("quotes-list", lambda: reverse("quotes-list"), 5, True),
+    ("quotes-dashboard", lambda: reverse("quotes-dashboard"), 4, True),
+    ("gallery-job-status", lambda: (pk := _first(IngestJob.objects)) and reverse("gallery-job-status", args=[pk]), 4, True),
+    ("admin services", lambda: _admin(Service), 5, True),
+    ("admin service change", lambda: (pk := _first(Service.objects.order_by("pk"))) and _admin(Service, "change", pk), 5, True),
+    ("admin service FAQs", lambda: _admin(ServiceFAQ), 5, True),
+    ("admin ingest job change", lambda: (pk := _first(IngestJob.objects)) and _admin(IngestJob, "change", pk), 5, True),
+    ("admin quotes", lambda: _admin(Quote), 5, True),
+]
+
+
+class Command(BaseCommand):
+    help = ("Request every public/admin endpoint against the current database and fail "
+            "if any runs more SQL queries than its budget (API cache disabled).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--show-queries", action="store_true",
+                            help="Print the SQL of endpoints that exceed their budget.")
+
+    def handle(self, *args, **options):
+        failures = []
+        # Everything (including the temporary staff user and its session) is rolled back
+        with transaction.atomic(), override_settings(CACHES=NO_CACHE, ALLOWED_HOSTS=["*"]):
+            anon, staff = Client(), Client()
+            user = get_user_model().objects.create_user(
+                "query-budget-check", password=None, is_staff=True, is_superuser=True)
+            staff.force_login(user)
+
+            for label, make_path, budget, as_staff in BUDGETS:
+                path = make_path()
+                if not path:
+                    self.stdout.write(f"  skip  {label} (no data)")
+                    continue
+                client = staff if as_staff else anon
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.get(path)
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                used = len(ctx.captured_queries)
+                ok = used <= budget and response.status_code < 400
+                mark = "ok  " if ok else "FAIL"
+                self.stdout.write(f"  {mark}  {label}: {used}/{budget} queries ({response.status_code}) {path}")
+                if not ok:
+                    failures.append(label)
+                    if options["show_queries"]:
+                        for query in ctx.captured_queries:
+                            self.stdout.write(f"          {query['sql'][:200]}")
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"Query budget exceeded: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All endpoints within their query budgets."))
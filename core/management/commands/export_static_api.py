@@ -0,0 +1,212 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from urllib.parse import quote, urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Post
+from core.changes import changes_between, window_start
+from core.models import StaticPage
+from services.models import Service
+
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are only written when it is installed
+    brotli = None
+
+MANIFEST = "manifest.json"
+ALL_ENCODINGS = ("gz", "br")
+COMPRESSORS = {"gz": lambda data: gzip.compress(data, 9, mtime=0)}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda data: brotli.compress(data, quality=11)
+
+
+def file_for(url):
+    """/api/gallery/ -> api/gallery/index.json, /api/gallery/?page=2 -> api/gallery/index.page=2.json"""
+    parts = urlsplit(url)
+    name = f"index.{quote(parts.query, safe='=&,')}.json" if parts.query else "index.json"
+    return os.path.join(parts.path.strip("/"), name)
+
+
+def sources():
+    """(url, changes feed key, detail slug or None, paginated) for every public endpoint."""
+    yield reverse("site-info-list"), "site", None, True
+    yield reverse("pages-list"), "pages", None, True
+    for slug in StaticPage.objects.values_list("slug", flat=True):
+        yield reverse("pages-detail", kwargs={"slug": slug}), "pages", slug, False
+    yield reverse("services-list"), "services", None, True
+    yield reverse("services-featured"), "services", None, False
+    for slug in Service.objects.filter(is_active=True).values_list("slug", flat=True):
+        yield reverse("services-detail", kwargs={"slug": slug}), "services", slug, False
+    yield reverse("gallery-list"), "gallery", None, True
+    yield reverse("gallery-tag-counts"), "gallery", None, False
+    yield reverse("blog-list"), "blog", None, True
+    for slug in Post.objects.filter(is_published=True).values_list("slug", flat=True):
+        yield reverse("blog-detail", kwargs={"slug": slug}), "blog", slug, False
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class Command(BaseCommand):
+    help = ("Render every public API endpoint (and every list page) through the real views "
+            "into JSON files with .gz/.br siblings and a manifest of content hashes. "
+            "Incremental: only entries whose content changed since the last run are re-rendered.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--out", default=str(settings.STATIC_API_ROOT),
+                            help="Output directory (default: STATIC_API_ROOT).")
+        parser.add_argument("--host", help="Host the API is served under (absolute media/next URLs "
+                            "embed it). Default: first ALLOWED_HOSTS entry.")
+        parser.add_argument("--https", action="store_true", help="Render https:// URLs.")
+        parser.add_argument("--full", action="store_true",
+                            help="Re-render everything (e.g. after a deploy that changed serializers).")
+
+    def handle(self, *args, **options):
+        out = options["out"]
+        host = options["host"] or next(
+            (h.lstrip(".") for h in settings.ALLOWED_HOSTS if h != "*"), "localhost")
+        base_url = f"{'https' if options['https'] else 'http'}://{host}"
+        self.client, self.secure, self.out = Client(HTTP_HOST=host), options["https"], out
+        self.verbosity = options["verbosity"]
+
+        old = self.read_manifest()
+        last = parse_datetime(old.get("generated_at") or "")
+        started, until = time.monotonic(), timezone.now()
+        # Re-read an overlap before the last run: rows stamped earlier may have committed after it
+        start = window_start(last, until) if last is not None else None
+        full = options["full"] or start is None or old.get("base_url") != base_url
+        previous_entries = old.get("entries", {})
+        reusable = previous_entries if not full else {}
+
+        changed_keys, changed_slugs = set(), set()
+        if not full:
+            for key, delta in changes_between(start, until).items():
+                for entry in delta["updated"] + delta["deleted"]:
+                    changed_keys.add(key)
+                    if "slug" in entry:
+                        changed_slugs.add((key, entry["slug"]))
+
+        self.stats = dict.fromkeys(("written", "unchanged", "kept", "removed"), 0)
+        self.failed = []
+        entries = {}
+        for url, key, slug, paginated in sources():
+            if slug is not None:
+                stale = (key, slug) in changed_slugs or url not in reusable
+            else:
+                stale = key in changed_keys or url not in reusable
+            if not stale:
+                # Unaffected: keep this entry (and, for lists, every page rendered from it)
+                kept = {u: e for u, e in reusable.items() if e["source"] == url}
+                entries.update(kept)
+                self.stats["kept"] += len(kept)
+                continue
+            for page_url, content in self.render(url, paginated):
+                if content is None:  # failed: keep serving the previous files of this source
+                    entries.update({u: e for u, e in previous_entries.items()
+                                    if e["source"] == url and u not in entries})
+                    continue
+                entries[page_url] = self.write(page_url, url, content, previous_entries.get(page_url))
+
+        for url, entry in previous_entries.items():
+            if url not in entries:
+                self.remove(entry)
+
+        if self.failed:
+            until = last  # retry everything changed since the previous run (or all, if none)
+        manifest = {
+            "generated_at": until.isoformat() if until else None,
+            "base_url": base_url,
+            "encodings": list(COMPRESSORS),
+            "entries": entries,
+        }
+        _write_atomic(os.path.join(out, MANIFEST), json.dumps(manifest, indent=1, sort_keys=True).encode())
+
+        elapsed = time.monotonic() - started
+        summary = ", ".join(f"{n} {label}" for label, n in self.stats.items())
+        mode = "full" if full else f"changes since {last.isoformat()}"
+        if brotli is None:
+            mode += "; brotli not installed, no .br files"
+        if self.failed:
+            raise CommandError(f"{len(self.failed)} URL(s) failed ({', '.join(self.failed)}); {summary}.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {len(entries)} entries to {out} in {elapsed:.1f}s ({mode}): {summary}."))
+
+    def read_manifest(self):
+        try:
+            with open(os.path.join(self.out, MANIFEST), "rb") as fh:
+                return json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def render(self, url, paginated):
+        """(url, bytes or None on failure) for ``url`` and, if paginated, each following page."""
+        seen = set()
+        while url and url not in seen:
+            seen.add(url)
+            response = self.client.get(url, secure=self.secure)
+            if self.verbosity > 1:
+                self.stdout.write(f"[{response.status_code}] {url}")
+            if response.status_code != 200:
+                self.failed.append(url)
+                self.stderr.write(f"[{response.status_code}] {url}")
+                yield url, None
+                return
+            yield url, response.content
+            if not paginated:
+                return
+            nxt = json.loads(response.content).get("next")
+            url = None
+            if nxt:
+                parts = urlsplit(nxt)
+                url = f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+    def write(self, url, source, content, previous):
+        entry = {
+            "file": file_for(url),
+            "source": source,
+            "sha256": hashlib.sha256(content).hexdigest(),
+            "bytes": len(content),
+            "encodings": list(COMPRESSORS),
+        }
+        path = os.path.join(self.out, entry["file"])
+        if previous == entry and os.path.exists(path):
+            self.stats["unchanged"] += 1  # same bytes: leave the files (and their mtimes) alone
+            return entry
+        _write_atomic(path, content)
+        for name, compress in COMPRESSORS.items():
+            _write_atomic(f"{path}.{name}", compress(content))
+        for name in set(ALL_ENCODINGS) - set(entry["encodings"]):
+            _remove(f"{path}.{name}")  # e.g. a .br left over from a run with brotli installed
+        self.stats["written"] += 1
+        return entry
+
+    def remove(self, entry):
+        path = os.path.join(self.out, entry["file"])
+        for name in ("",) + tuple(f".{enc}" for enc in ALL_ENCODINGS):
+            _remove(path + name)
+        try:
+            os.rmdir(os.path.dirname(path))  # e.g. api/blog/<deleted slug>/
+        except OSError:
+            pass
+        self.stats["removed"] += 1
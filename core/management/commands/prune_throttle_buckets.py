@@ -0,0 +1,14 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import ThrottleBucket
+
+
+class Command(BaseCommand):
+    help = ("Delete throttle token buckets that have refilled completely (a full bucket "
+            "behaves exactly like a missing one). Run daily from cron.")
+
+    def handle(self, *args, **options):
+        deleted, _ = ThrottleBucket.objects.filter(full_at__lt=time.time()).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} full throttle buckets."))
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.changes import RETENTION
+from core.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = ("Delete /api/changes/ deletion tombstones older than TOMBSTONE_RETENTION_DAYS "
+            "(clients with an older ?since= get a full listing instead). Run daily from cron.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int,
+                            help="Retention in days (default: TOMBSTONE_RETENTION_DAYS; never use less).")
+
+    def handle(self, *args, **options):
+        retention = timedelta(days=options["days"]) if options["days"] is not None else RETENTION
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - retention).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones older than {retention.days} days."))
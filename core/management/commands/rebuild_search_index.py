@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from core.models import StaticPage
+from services.models import Service
+from utils.cache import bump_version
+
+
+class Command(BaseCommand):
+    help = "Recompute stored full-text search vectors (e.g. after loaddata or bulk imports)."
+
+    def handle(self, *args, **options):
+        for model in (Post, StaticPage, Service):
+            updated = model.refresh_search_vectors()
+            bump_version(model)
+            self.stdout.write(f"{model._meta.label}: {updated} rows")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from core.models import StaticPage
+from services.models import Service
+from utils.cache import bump_version
+from utils.rendering import RENDERER_VERSION
+
+
+class Command(BaseCommand):
+    help = "Re-render stored body_html/toc/reading_time produced by an older renderer version."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true",
+                            help="Re-render every row, not just outdated ones.")
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        for model in (Post, StaticPage, Service):
+            qs = model.objects.only("id", "body").order_by("id")
+            if not options["all"]:
+                qs = qs.exclude(body_renderer_version=RENDERER_VERSION)
+
+            batch, total = [], 0
+            for row in qs.iterator(chunk_size=options["batch_size"]):
+                row.render_body()
+                batch.append(row)
+                if len(batch) >= options["batch_size"]:
+                    total += self._flush(model, batch)
+                    batch = []
+            total += self._flush(model, batch)
+            self.stdout.write(f"{model._meta.label}: {total} re-rendered")
+        self.stdout.write(self.style.SUCCESS(f"Bodies at renderer v{RENDERER_VERSION}."))
+
+    def _flush(self, model, rows):
+        if rows:
+            # bulk_update leaves updated_at alone: re-rendering isn't a content edit
+            model.objects.bulk_update(rows, model.rendered_fields)
+            bump_version(model)
+        return len(rows)
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from blog.models import Post
+from core.models import StaticPage
+from services.models import Service
+from utils.cache import cache_stats
+
+
+class Command(BaseCommand):
+    help = "Pre-populate the API response cache (run after deploy, before taking traffic)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", help="Host header the site is served under "
+                            "(absolute media URLs are cached per host). Default: first ALLOWED_HOSTS entry.")
+        parser.add_argument("--https", action="store_true", help="Warm https:// URLs.")
+        parser.add_argument("--gallery-pages", type=int, default=3,
+                            help="Number of gallery list pages to warm.")
+
+    def handle(self, *args, **options):
+        host = options["host"] or next(
+            (h.lstrip(".") for h in settings.ALLOWED_HOSTS if h != "*"), "localhost")
+        client = Client(HTTP_HOST=host)
+
+        started, warmed, failed = time.monotonic(), 0, 0
+        for url in self.urls(options["gallery_pages"]):
+            response = client.get(url, secure=options["https"])
+            if response.status_code == 200:
+                warmed += 1
+            else:
+                failed += 1
+                self.stderr.write(f"[{response.status_code}] {url}")
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{response.get('X-Cache', '-'):4} {url}")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {warmed} URLs for {host} in {elapsed:.1f}s ({failed} failed). Stats: {cache_stats()}"))
+
+    def urls(self, gallery_pages):
+        yield reverse("site-info-list")
+        yield reverse("pages-list")
+        for slug in StaticPage.objects.values_list("slug", flat=True):
+            yield reverse("pages-detail", kwargs={"slug": slug})
+        yield reverse("services-list")
+        yield reverse("services-featured")
+        for slug in Service.objects.filter(is_active=True).values_list("slug", flat=True):
+            yield reverse("services-detail", kwargs={"slug": slug})
+        gallery = reverse("gallery-list")
+        yield gallery
+        for page in range(2, gallery_pages + 1):
+            yield f"{gallery}?page={page}"
+        yield reverse("gallery-tag-counts")
+        yield reverse("blog-list")
+        for slug in Post.objects.filter(is_published=True).values_list("slug", flat=True):
+            yield reverse("blog-detail", kwargs={"slug": slug})
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:31
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from utils.search import build_search_vector
+
+
+def backfill_search_vector(apps, schema_editor):
+    apps.get_model('core', 'StaticPage').objects.update(
+        search_vector=build_search_vector((('title', 'A'), ('body', 'C'))))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='staticpage',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='staticpage',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='staticpage_search_gin'),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,11 @@
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from utils.rendering import RenderedBodyMixin
+from utils.search import SearchVectorMixin
+
 class SiteInfo(models.Model):
     company_name = models.CharField(max_length=200, default="AR Construction")
     address = models.TextField(blank=True)
@@ -15,11 +20,50 @@ class SiteInfo(models.Model):
     def __str__(self):
         return self.company_name
 
-class StaticPage(models.Model):
+class StaticPage(SearchVectorMixin, RenderedBodyMixin, models.Model):
     slug = models.SlugField(unique=True)
     title = models.CharField(max_length=200)
     body = models.TextField()
+    # Pre-rendered from body on save (utils.rendering)
+    body_html = models.TextField(blank=True, editable=False)
+    toc = models.JSONField(default=list, blank=True, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)  # minutes
+    body_renderer_version = models.PositiveSmallIntegerField(default=0, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    search_vector_fields = (('title', 'A'), ('body', 'C'))
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='staticpage_search_gin'),
+            models.Index(fields=['updated_at'], name='staticpage_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class Tombstone(models.Model):
+    """A deleted content row, reported by /api/changes/ (written by core.changes on post_delete)."""
+    model = models.CharField(max_length=100)  # "app_label.modelname"
+    object_id = models.BigIntegerField()
+    slug = models.CharField(max_length=255, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['deleted_at'], name='tombstone_deleted_idx')]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id}"
+
+
+class ThrottleBucket(models.Model):
+    """Token-bucket state for utils.throttling, row-locked for each throttled request."""
+    key = models.CharField(max_length=120, primary_key=True)  # "throttle:<scope>:<ident>"
+    tokens = models.FloatField()
+    updated = models.FloatField()  # timer() of the last refill
+    full_at = models.FloatField(db_index=True)  # once past, the row is the same as no row
+
+    def __str__(self):
+        return f"{self.key}: {self.tokens:.2f}"
@@ -1,13 +1,14 @@
 
 from rest_framework import serializers
 from .models import SiteInfo, StaticPage
+from utils.sparse import DynamicFieldsMixin
 
-class SiteInfoSerializer(serializers.ModelSerializer):
+class SiteInfoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SiteInfo
         fields = '__all__'
 
-class StaticPageSerializer(serializers.ModelSerializer):
+class StaticPageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = StaticPage
-        fields = ['slug', 'title', 'body', 'updated_at']
+        fields = ['slug', 'title', 'body', 'body_html', 'toc', 'reading_time', 'updated_at']
@@ -1 +1,213 @@
-# tests
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.throttling import BaseThrottle
+
+from blog.models import Post
+from mediahub.models import GalleryItem
+from services.models import Service, ServiceFAQ
+from services.views import ServiceViewSet
+from utils.cache import HIT, cache_stats, cached_labels, get_cache
+from utils.testing import NO_CACHE
+from .changes import OVERLAP, RETENTION
+from .models import ThrottleBucket, Tombstone
+
+
+class ApiCacheInvalidationTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_version_is_bumped_on_commit_only(self):
+        url = reverse("services-list")
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        with self.captureOnCommitCallbacks() as callbacks:
+            Service.objects.create(name="Roofing", slug="roofing")
+            # Not committed yet: a request now must not cache under a new version
+            self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        self.assertTrue(callbacks)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+
+    def test_uncached_models_do_not_bump(self):
+        self.assertIn("services.service", cached_labels())
+        with self.captureOnCommitCallbacks() as callbacks:
+            ThrottleBucket.objects.create(key="throttle:x:y", tokens=1, updated=0, full_at=0)
+            Tombstone.objects.create(model="blog.post", object_id=1)
+        self.assertEqual(callbacks, [])
+
+    def test_hits_and_misses_are_counted_in_process(self):
+        before = cache_stats()
+        self.client.get(reverse("services-list"))
+        self.client.get(reverse("services-list"))
+        after = cache_stats()
+        self.assertEqual((after["hits"] - before["hits"], after["misses"] - before["misses"]), (1, 1))
+        self.assertIsNone(get_cache().get(f"apistats:{HIT}"))
+
+
+@override_settings(CACHES=NO_CACHE)
+class SearchViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Post.objects.create(title="Kitchen guide", is_published=True, published_at=timezone.now(),
+                            body='**Kitchen** tiling <script>alert("x")</script> and <a href="/x">grout</a>.')
+
+    def search(self, **params):
+        return self.client.get(reverse("search"), {"q": "kitchen", **params})
+
+    def test_limit_must_be_a_positive_number(self):
+        for limit in ("-1", "0", "ten", ""):
+            with self.subTest(limit=limit):
+                response = self.search(limit=limit)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("limit", response.json())
+        self.assertEqual(len(self.search(limit="500").json()["results"]), 1)  # capped, not rejected
+
+    def test_snippet_is_built_from_sanitised_text(self):
+        snippet = self.search().json()["results"][0]["snippet"]
+        self.assertIn("<mark>Kitchen</mark>", snippet)
+        for raw in ("**", "<script", "alert", "<a ", "<strong>"):
+            self.assertNotIn(raw, snippet)
+
+
+class ChangesFeedTests(TestCase):
+    def changes(self, since):
+        response = self.client.get(reverse("changes"), {"since": since.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_late_commit_inside_the_overlap_is_not_skipped(self):
+        since = timezone.now()
+        # Stamped before ``since`` but committed (visible) only after the client's last call
+        with mock.patch("django.utils.timezone.now", return_value=since - OVERLAP / 2):
+            item = GalleryItem.objects.create(title="Late", image="images/late.jpg")
+        data = self.changes(since)
+        self.assertFalse(data["full"])
+        self.assertIn(item.pk, [entry["id"] for entry in data["changes"]["gallery"]["updated"]])
+
+    def test_deactivating_a_service_deletes_its_faqs(self):
+        service = Service.objects.create(name="Kitchens")
+        faqs = [ServiceFAQ.objects.create(service=service, question=f"Q{n}?", answer="A") for n in range(2)]
+        since = timezone.now() + OVERLAP  # past the FAQs' own timestamps, overlap included
+        with mock.patch("django.utils.timezone.now", return_value=since + timedelta(seconds=1)):
+            service.is_active = False
+            service.save()
+        with mock.patch("django.utils.timezone.now", return_value=since + timedelta(seconds=2)):
+            data = self.changes(since)
+        self.assertEqual(data["changes"]["services"]["deleted"], [{"id": service.pk, "slug": service.slug}])
+        self.assertCountEqual([entry["id"] for entry in data["changes"]["service_faqs"]["deleted"]],
+                              [faq.pk for faq in faqs])
+
+    def test_deletion_tombstone(self):
+        since = timezone.now()
+        item = GalleryItem.objects.create(title="Gone", image="images/gone.jpg")
+        pk = item.pk
+        item.delete()
+        self.assertIn({"id": pk}, self.changes(since)["changes"]["gallery"]["deleted"])
+
+    def test_since_older_than_retention_gets_full_listing(self):
+        GalleryItem.objects.create(title="Kept", image="images/kept.jpg")
+        data = self.changes(timezone.now() - RETENTION - timedelta(days=1))
+        self.assertTrue(data["full"])
+        self.assertEqual(len(data["changes"]["gallery"]["updated"]), 1)
+
+    def test_prune_tombstones(self):
+        old = Tombstone.objects.create(model="mediahub.galleryitem", object_id=1)
+        Tombstone.objects.filter(pk=old.pk).update(deleted_at=timezone.now() - RETENTION - timedelta(days=1))
+        recent = Tombstone.objects.create(model="mediahub.galleryitem", object_id=2)
+        call_command("prune_tombstones", stdout=mock.Mock())
+        self.assertEqual(list(Tombstone.objects.values_list("pk", flat=True)), [recent.pk])
+
+
+
+class ExportStaticApiTests(TestCase):
+    def setUp(self):
+        self.out = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.out, True)
+
+    def export(self, **options):
+        call_command("export_static_api", out=self.out, host="testserver", stdout=mock.Mock(), **options)
+        with open(f"{self.out}/manifest.json") as fh:
+            return json.load(fh)
+
+    def read(self, manifest, url):
+        with open(f"{self.out}/{manifest['entries'][url]['file']}", "rb") as fh:
+            return fh.read()
+
+    def test_incremental_run_picks_up_late_commits(self):
+        gallery = reverse("gallery-list")
+        manifest = self.export()
+        self.assertIn(gallery, manifest["entries"])
+        # Stamped before the previous run, committed after it
+        last = parse_datetime(manifest["generated_at"])
+        with mock.patch("django.utils.timezone.now", return_value=last - OVERLAP / 2), \
+                self.captureOnCommitCallbacks(execute=True):  # the commit invalidates cached lists
+            GalleryItem.objects.create(title="Late upload", image="images/late.jpg")
+        manifest = self.export()
+        self.assertIn(b"Late upload", self.read(manifest, gallery))
+
+    def test_unchanged_entries_are_kept(self):
+        first = self.export()
+        second = self.export()
+        self.assertEqual(first["entries"], second["entries"])
+
+
+class DenyThrottle(BaseThrottle):
+    def allow_request(self, request, view):
+        return False
+
+    def wait(self):
+        return 60
+
+
+@override_settings(CACHES=NO_CACHE)
+class BatchViewTests(TestCase):
+    def batch(self, *paths):
+        response = self.client.post(reverse("batch"), {"paths": list(paths)}, content_type="application/json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return [(result["status"], result["body"]) for result in response.json()["results"]]
+
+    def test_results_in_request_order(self):
+        Service.objects.create(name="Roofing", slug="roofing")
+        (services, _), (one, body) = self.batch("/api/services/", "/api/services/roofing/")
+        self.assertEqual((services, one, body["name"]), (200, 200, "Roofing"))
+        get = self.client.get(reverse("batch"), {"path": ["/api/services/roofing/", "/api/services/none/"]})
+        self.assertEqual([r["status"] for r in get.json()["results"]], [200, 404])
+
+    def test_permissions_follow_the_caller(self):
+        paths = ("/api/quotes/dashboard/?granularity=month", "/api/_metrics")
+        self.assertEqual([status for status, _ in self.batch(*paths)], [403, 403])
+        self.client.force_login(get_user_model().objects.create_user("staff", password="x", is_staff=True))
+        (dashboard, body), (metrics, _) = self.batch(*paths)
+        self.assertEqual((dashboard, body["granularity"]), (200, "month"))
+        self.assertEqual(metrics, 406)  # Prometheus text, not JSON
+
+    def test_throttles_apply_to_subrequests(self):
+        with mock.patch.object(ServiceViewSet, "throttle_classes", [DenyThrottle]):
+            [(status, body)] = self.batch("/api/services/")
+        self.assertEqual(status, 429)
+        self.assertIn("60 seconds", body["detail"])
+
+    def test_rejected_paths(self):
+        self.assertEqual([status for status, _ in self.batch(
+            "/api/batch/?path=/api/services/",  # no recursion
+            "/admin/",
+            "https://example.com/api/services/",
+            "/api/nowhere/",
+            42,
+        )], [400, 400, 400, 404, 400])
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_path_count_is_capped(self):
+        response = self.client.get(reverse("batch"), {"path": ["/api/services/"] * 3})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(reverse("batch")).status_code, 400)
@@ -1,13 +1,171 @@
 
-from rest_framework import viewsets, mixins
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db.models import F
+from django.utils import timezone
+from django.utils._os import safe_join
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition
+from django.views.static import serve
+from django.http import HttpResponse
+from rest_framework import viewsets, mixins, permissions, views
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from blog.models import Post
+from services.models import Service
+from utils.batch import dispatch_get
+from utils.cache import CachedResponseMixin, cache_stats
+from utils.conditional import ConditionalGetMixin
+from utils.metrics import render_prometheus
+from utils.search import ranked_search
+from utils.sparse import SparseFieldsMixin
+from utils.spam import rejection_stats
+from .changes import changes_between, window_start
 from .models import SiteInfo, StaticPage
 from .serializers import SiteInfoSerializer, StaticPageSerializer
 
-class SiteInfoViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+class SiteInfoViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsMixin, mixins.ListModelMixin,
+                      viewsets.GenericViewSet):
+    cache_models = (SiteInfo,)
     queryset = SiteInfo.objects.all().order_by('-updated_at')[:1]
     serializer_class = SiteInfoSerializer
 
-class StaticPageViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = StaticPage.objects.all()
+class StaticPageViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = (StaticPage,)
+    queryset = StaticPage.objects.order_by('title')  # stable pagination
     serializer_class = StaticPageSerializer
     lookup_field = 'slug'
+
+
+class SearchView(views.APIView):
+    """
+    Unified site search: GET /api/search/?q=...&limit=10
+    Ranked full-text matches across published posts, static pages and active services.
+    """
+    SOURCES = [
+        # type, queryset, title field, headline field, url prefix
+        ('post', lambda: Post.objects.filter(is_published=True), 'title', 'body_html', '/blog/'),
+        ('page', lambda: StaticPage.objects.all(), 'title', 'body_html', '/pages/'),
+        ('service', lambda: Service.objects.filter(is_active=True), 'name', 'body_html', '/services/'),
+    ]
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        term = request.query_params.get('q', '').strip()
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            raise ValidationError({'limit': f'Expected a whole number from 1 to {self.MAX_LIMIT}.'})
+        limit = min(limit, self.MAX_LIMIT)
+        if not term:
+            return Response({'query': term, 'results': []})
+
+        results = []
+        for kind, queryset, title_field, headline_field, prefix in self.SOURCES:
+            rows = ranked_search(queryset(), term, headline_field=headline_field).values(
+                'slug', 'search_rank', 'search_headline', hit_title=F(title_field))[:limit]
+            results.extend({
+                'type': kind,
+                'title': row['hit_title'],
+                'slug': row['slug'],
+                'path': f"{prefix}{row['slug']}/",
+                'snippet': row['search_headline'],
+                'rank': row['search_rank'],
+            } for row in rows)
+        results.sort(key=lambda r: r['rank'], reverse=True)
+        return Response({'query': term, 'results': results[:limit]})
+
+
+def _media_etag(request, path):
+    try:
+        st = os.stat(safe_join(settings.MEDIA_ROOT, path))
+    except (OSError, ValueError, SuspiciousFileOperation):
+        return None  # let serve() answer 404/400
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+@condition(etag_func=_media_etag)
+def serve_media(request, path):
+    """Development media server (DEBUG only) with ETag + Last-Modified revalidation."""
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+
+class MetricsView(views.APIView):
+    """
+    Staff-only Prometheus text metrics for this worker process:
+    per-route latency / DB time / query count / size histograms (utils/metrics.py),
+    API cache hits and misses, and rejected form submissions by reason.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    schema = None
+
+    def get(self, request):
+        stats = cache_stats()
+        extra = [
+            ('api_cache_requests_total', 'Cached API responses served (hit) or rebuilt (miss).', 'counter',
+             [({'outcome': 'hit'}, stats['hits']), ({'outcome': 'miss'}, stats['misses'])]),
+            ('form_rejections_total', 'Rejected contact/quote submissions by reason.', 'counter',
+             [({'reason': reason}, count) for reason, count in rejection_stats().items()]),
+        ]
+        return HttpResponse(render_prometheus(extra), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+
+class ChangesView(views.APIView):
+    """
+    Delta sync for static-site builds and the app: GET /api/changes/?since=<ISO 8601>
+    lists ids (and slugs) of public content updated or deleted after ``since``
+    (core/changes.py). Pass the response's ``until`` as the next ``since``;
+    entries near the boundary may repeat. Without ``since``, or with one older
+    than the tombstone retention, every public row is listed and ``full`` is true.
+    """
+
+    def get(self, request):
+        until = timezone.now()
+        since = None
+        raw = request.query_params.get('since')
+        if raw:
+            # An unencoded "+00:00" offset arrives as " 00:00"
+            since = parse_datetime(raw.strip().replace(' ', '+'))
+            if since is None:
+                raise ValidationError({'since': 'Expected an ISO 8601 timestamp, e.g. 2026-01-31T12:00:00Z.'})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        start = window_start(since, until)
+        return Response({'since': since, 'until': until, 'full': start is None,
+                         'changes': changes_between(start, until)})
+
+
+class BatchView(views.APIView):
+    """
+    Several read-only API calls in one round trip (e.g. the homepage):
+    GET /api/batch/?path=/api/site/&path=/api/services/featured/ (query strings
+    URL-encoded) or POST {"paths": [...]}. Each path is dispatched in-process
+    with the caller's credentials (utils/batch.py); the response lists
+    {"path", "status", "body"} in request order.
+    """
+    schema = None
+
+    def get(self, request):
+        return self.batch(request, request.query_params.getlist('path'))
+
+    def post(self, request):
+        paths = request.data.get('paths') if isinstance(request.data, dict) else None
+        if not isinstance(paths, list):
+            raise ValidationError({'paths': 'Expected a list of API paths.'})
+        return self.batch(request, paths)
+
+    def batch(self, request, paths):
+        if not paths:
+            raise ValidationError({'paths': 'At least one path is required.'})
+        if len(paths) > settings.BATCH_MAX_REQUESTS:
+            raise ValidationError({'paths': f'At most {settings.BATCH_MAX_REQUESTS} paths per batch.'})
+        results = []
+        for path in paths:
+            status, body = dispatch_get(request._request, path, exclude=('batch',))
+            results.append({'path': path, 'status': status, 'body': body})
+        return Response({'results': results})
@@ -1,9 +1,26 @@
-
 from django.contrib import admin
-from .models import GalleryItem
+from .models import GalleryItem, IngestJob, IngestJobFile
 
 @admin.register(GalleryItem)
 class GalleryItemAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "is_active", "created_at")
     list_filter = ("is_active",)
     search_fields = ("title", "caption", "tags")
+
+
+class IngestJobFileInline(admin.TabularInline):
+    model = IngestJobFile
+    extra = 0
+    readonly_fields = ("original_name", "status", "gallery_item", "errors", "duration_ms")
+    fields = readonly_fields
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("gallery_item")
+
+
+@admin.register(IngestJob)
+class IngestJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "created_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = ("stats", "error", "created_at", "started_at", "finished_at")
+    inlines = [IngestJobFileInline]
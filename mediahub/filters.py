@@ -1,26 +1,53 @@
 import django_filters
-from django.db.models import Q
+from django.db import connections
 from .models import GalleryItem
 
+
+def _split_tags(value):
+    return [t.strip().lower() for t in (value or "").split(',') if t.strip()]
+
+
 class GalleryFilterSet(django_filters.FilterSet):
     # Comma-separated list: ?tags=renovation,shopfitting
-    tags = django_filters.CharFilter(method='filter_tags', help_text="Comma-separated list of tags")
+    tags = django_filters.CharFilter(method='filter_tags', help_text="Comma-separated list of tags (match any)")
+    # Comma-separated list: ?tags_all=kitchen,tiling
+    tags_all = django_filters.CharFilter(method='filter_tags_all', help_text="Comma-separated list of tags (match all)")
 
     def filter_tags(self, qs, name, value):
         """
         'Any' semantics: return items containing at least one requested tag.
-        Uses Postgres JSON containment on arrays: tags__contains=[tag]
+        A single jsonb `tags ?| array[...]` test, served by the GIN index on tags.
         """
-        if not value:
+        requested = _split_tags(value)
+        if not requested:
             return qs
-        requested = [t.strip() for t in value.split(',') if t.strip()]
+        return qs.filter(tags__has_any_keys=requested)
+
+    def filter_tags_all(self, qs, name, value):
+        """'All' semantics: `tags ?& array[...]`, also GIN-indexed."""
+        requested = _split_tags(value)
         if not requested:
             return qs
-        q = Q()
-        for tag in requested:
-            q |= Q(tags__contains=[tag])
-        return qs.filter(q)
+        return qs.filter(tags__has_keys=requested)
 
     class Meta:
         model = GalleryItem
-        fields = []
\ No newline at end of file
+        fields = []
+
+
+def tag_facets(qs):
+    """
+    Tag -> item count over ``qs`` (already filtered), in one aggregate query:
+    the filtered rows are expanded with jsonb_array_elements_text and grouped.
+    Returns [{"tag": ..., "count": ...}] ordered by count desc, tag asc.
+    """
+    inner_sql, params = qs.order_by().values("tags").query.sql_with_params()
+    sql = (
+        "SELECT t.tag, COUNT(*) FROM (" + inner_sql + ") AS items "
+        "CROSS JOIN LATERAL jsonb_array_elements_text(items.tags) AS t(tag) "
+        "WHERE jsonb_typeof(items.tags) = 'array' "
+        "GROUP BY t.tag ORDER BY COUNT(*) DESC, t.tag"
+    )
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        return [{"tag": tag, "count": count} for tag, count in cursor.fetchall()]
@@ -0,0 +1,294 @@
+# mediahub/ingest.py
+"""
+Bulk gallery ingestion engine.
+
+Image decoding/verification and rendition rendering fan out to a process
+pool; originals and renditions are then stored from the parent process and
+all rows are written with a single bulk_create.
+"""
+import datetime
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.utils import timezone
+
+from utils.cache import bump_version
+from utils.jobs import DONE, FAILED, keep_lease, requeue_expired
+from utils.tags import derive_tags_many
+from .models import GalleryItem, IngestJob, IngestJobFile
+from .renditions import render_to_files, rendition_name
+from .serializers import GalleryItemSerializer
+
+STALE_AFTER = datetime.timedelta(minutes=10)  # RUNNING jobs whose lease stopped being refreshed
+LEASE_HEARTBEAT = 60  # seconds between lease refreshes while a job runs
+
+_executor = None
+
+
+def pool_size() -> int:
+    workers = getattr(settings, "GALLERY_INGEST_WORKERS", None)
+    if workers is None:
+        return os.cpu_count() or 1
+    return workers
+
+
+def get_executor():
+    """
+    Lazily start one shared pool per Django process. 'spawn' keeps workers free of
+    inherited DB connections/threads; they only ever import Pillow.
+    Returns None when GALLERY_INGEST_WORKERS is 0 (process inline, e.g. in tests).
+    """
+    global _executor
+    if pool_size() == 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def build_items(files, title="", caption="", tags=None):
+    """
+    Serializer payloads for uploaded files, sharing bulk-upload's metadata rules:
+    explicit tags win, otherwise tags are derived from the title (or filename)
+    in one vectorised pass over the whole batch.
+    """
+    titles = [title or f.name for f in files]
+    derived = [tags] * len(files) if tags else derive_tags_many(titles)
+    return [
+        {"image": f, "title": base_title, "caption": caption,
+         "tags": item_tags, "is_active": True}
+        for f, base_title, item_tags in zip(files, titles, derived)
+    ]
+
+
+def _local_path(f):
+    """
+    Return (path, is_temp) for an uploaded/stored file without reading it into RAM.
+    TemporaryUploadedFile already lives on disk; anything else is spooled to a temp file.
+    """
+    if hasattr(f, "temporary_file_path"):
+        return f.temporary_file_path(), False
+    name = getattr(getattr(f, "file", None), "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return name, False
+    fd, path = tempfile.mkstemp(prefix="ingest-", dir=settings.FILE_UPLOAD_TEMP_DIR)
+    with os.fdopen(fd, "wb") as out:
+        for chunk in f.chunks():
+            out.write(chunk)
+    return path, True
+
+
+def _store(item_data, rendered, stored_names):
+    """
+    Save the original and its pre-rendered variants; return an unsaved GalleryItem.
+    Every file name is appended to ``stored_names`` as soon as it is written, so
+    the caller can clean up after a failure part-way through.
+    """
+    upload = item_data.pop("image")
+    instance = GalleryItem(**item_data)
+    instance.image.save(os.path.basename(upload.name), upload, save=False)
+    stored_names.append(instance.image.name)
+
+    storage = instance.image.storage
+    renditions = {}
+    for key, width, ext, tmp_path in rendered["variants"]:
+        with open(tmp_path, "rb") as fh:
+            stored = storage.save(rendition_name(instance.image.name, width, ext), File(fh))
+        stored_names.append(stored)
+        renditions.setdefault(key, {})[str(width)] = stored
+    instance.renditions = renditions
+    return instance
+
+
+def ingest_items(items, context=None, on_created=None):
+    """
+    Validate, render and create gallery items.
+
+    ``items`` is a list of serializer payload dicts, each with an "image" file.
+    Returns (outcomes, stats): one outcome per input item, in input order, shaped
+    {"name", "id"} on success or {"name", "errors"} on failure, each with "ms".
+    ``on_created([(input index, item), ...])`` runs in the transaction that
+    inserts the items, e.g. to record them as done in that same commit.
+    """
+    started = time.perf_counter()
+    executor = get_executor()
+    max_in_flight = max(1, pool_size() * 2)
+
+    outcomes = [None] * len(items)
+    ready = {}      # input index -> (validated data, rendered result, started_at)
+    temp_paths = []
+    pending = {}    # future -> (index, started_at, validated data)
+
+    def elapsed_ms(t0):
+        return round((time.perf_counter() - t0) * 1000, 1)
+
+    def fail(index, t0, errors):
+        outcomes[index] = {"name": names[index], "errors": errors, "ms": elapsed_ms(t0)}
+
+    def collect(future):
+        index, t0, data = pending.pop(future)
+        try:
+            ready[index] = (data, future.result(), t0)
+        except Exception as exc:
+            fail(index, t0, {"image": [f"Invalid image: {exc}"]})
+
+    names = [getattr(item["image"], "name", f"file-{i}") for i, item in enumerate(items)]
+    created = []
+    try:
+        for index, item in enumerate(items):
+            t0 = time.perf_counter()
+            serializer = GalleryItemSerializer(data=item, context=context or {})
+            if not serializer.is_valid():
+                fail(index, t0, serializer.errors)
+                continue
+            data = dict(serializer.validated_data)
+            path, is_temp = _local_path(data["image"])
+            if is_temp:
+                temp_paths.append(path)
+
+            if executor is None:
+                try:
+                    ready[index] = (data, render_to_files(path), t0)
+                except Exception as exc:
+                    fail(index, t0, {"image": [f"Invalid image: {exc}"]})
+                continue
+
+            # Bound the number of decoded images held by workers at once.
+            while len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+            pending[executor.submit(render_to_files, path)] = (index, t0, data)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+
+        indexes, instances, stored_names = sorted(ready), [], []
+        try:
+            for index in indexes:
+                data, rendered, t0 = ready[index]
+                instances.append(_store(data, rendered, stored_names))
+            with transaction.atomic():
+                created = GalleryItem.objects.bulk_create(instances)
+                if on_created is not None:
+                    on_created(list(zip(indexes, created)))
+        except Exception:
+            # Don't leave orphaned files behind when storing or the insert fails.
+            storage = GalleryItem._meta.get_field("image").storage
+            for stored in stored_names:
+                storage.delete(stored)
+            raise
+        bump_version(GalleryItem)  # bulk_create sends no post_save
+
+        for index, obj in zip(indexes, created):
+            data, rendered, t0 = ready[index]
+            outcomes[index] = {"name": names[index], "id": obj.pk, "ms": elapsed_ms(t0),
+                               "render_ms": round(rendered["elapsed_ms"], 1)}
+    finally:
+        for path in temp_paths:
+            os.unlink(path)
+        for _, rendered, _ in ready.values():
+            shutil.rmtree(rendered["tmp_dir"], ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "files": len(items),
+        "created": len(created),
+        "seconds": round(elapsed, 3),
+        "images_per_second": round(len(created) / elapsed, 2) if elapsed else None,
+    }
+    return outcomes, stats
+
+
+def ingest(items, context=None):
+    """
+    Bulk-upload response shape: {"created": [ids], "errors": [{name: errors}],
+    "timings": [{"file", "ms", ...}], "stats": {...}}.
+    """
+    outcomes, stats = ingest_items(items, context=context)
+    timings = []
+    for outcome in outcomes:
+        timing = {"file": outcome["name"], "ms": outcome["ms"]}
+        if "render_ms" in outcome:
+            timing["render_ms"] = outcome["render_ms"]
+        timings.append(timing)
+    return {
+        "created": [o["id"] for o in outcomes if "id" in o],
+        "errors": [{o["name"]: o["errors"]} for o in outcomes if "errors" in o],
+        "timings": timings,
+        "stats": stats,
+    }
+
+
+# --- Asynchronous jobs ---
+def enqueue_job(files, title="", caption="", tags=None):
+    """Persist the raw uploads and queue them for `run_ingest_worker`."""
+    with transaction.atomic():
+        job = IngestJob.objects.create(title=title, caption=caption, tags=tags or [])
+        for f in files:
+            job_file = IngestJobFile(job=job, original_name=f.name,
+                                     content_type=getattr(f, "content_type", "") or "")
+            job_file.upload.save(os.path.basename(f.name), f, save=False)
+            job_file.save()
+    return job
+
+
+def requeue_stale():
+    """Hand jobs claimed by a worker that died mid-job back to the queue."""
+    return requeue_expired(IngestJob.objects.all(), STALE_AFTER)
+
+
+def process_job(job):
+    """Ingest every pending file of a claimed job and record per-file results."""
+    job_files = list(job.files.filter(status=IngestJobFile.PENDING))
+    uploads = []
+    for job_file in job_files:
+        job_file.upload.open("rb")
+        uploads.append(UploadedFile(file=job_file.upload.file, name=job_file.original_name,
+                                    content_type=job_file.content_type, size=job_file.upload.size))
+    items = build_items(uploads, job.title, job.caption, job.tags)
+
+    def mark_done(created):
+        # Same commit as the inserts: a re-run after a crash skips these files
+        for index, obj in created:
+            job_files[index].status, job_files[index].gallery_item = IngestJobFile.DONE, obj
+        IngestJobFile.objects.bulk_update([job_files[index] for index, _ in created], ["status", "gallery_item"])
+
+    try:
+        with keep_lease(job, LEASE_HEARTBEAT):
+            outcomes, stats = ingest_items(items, on_created=mark_done)
+    except Exception as exc:
+        job.status, job.error = FAILED, str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at"])
+        raise
+    finally:
+        for job_file in job_files:
+            job_file.upload.close()
+
+    for job_file, outcome in zip(job_files, outcomes):
+        job_file.duration_ms = outcome["ms"]
+        if "id" in outcome:
+            job_file.upload.delete(save=False)
+        else:
+            job_file.status = IngestJobFile.FAILED
+            job_file.errors = outcome["errors"]
+    IngestJobFile.objects.bulk_update(job_files, ["status", "errors", "duration_ms", "upload"])
+
+    job.status, job.stats = DONE, stats
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "stats", "finished_at"])
+    return job
@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from mediahub.models import GalleryItem
+from mediahub.serializers import GalleryItemSerializer
+from utils.fastlist import build_plan
+from utils.renderers import ORJSONRenderer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Seed synthetic gallery items inside a rolled-back transaction and compare "
+            "GalleryItemSerializer(many=True) + JSONRenderer against the values() fast path "
+            "+ ORJSONRenderer; fails if the rendered bytes differ.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Synthetic rows rolled back.")
+
+    def _run(self, options):
+        self.stdout.write(f"Seeding {options['rows']:,} items...")
+        widths = ("320", "640", "1024")
+        GalleryItem.objects.bulk_create(
+            (GalleryItem(
+                title=f"Bench {n} – café", image=f"images/bench-{n}.jpg", caption="Before/after shots",
+                tags=["kitchen", "renovation"],
+                renditions={fmt: {w: f"images/renditions/bench-{n}-{w}.{fmt}" for w in widths}
+                            for fmt in ("webp", "jpeg")},
+            ) for n in range(options["rows"])),
+            batch_size=5000,
+        )
+        qs = GalleryItem.objects.order_by("-created_at", "-id")
+        request = Request(RequestFactory().get("/api/gallery/", HTTP_HOST="www.example.com"))
+        context = {"request": request}
+
+        def stock():
+            data = GalleryItemSerializer(qs, many=True, context=context).data
+            return JSONRenderer().render(data)
+
+        def fast():
+            plan = build_plan(GalleryItemSerializer(context=context), qs, ("renditions",))
+            if plan is None:
+                raise CommandError("GalleryItemSerializer is not eligible for the fast path.")
+            return ORJSONRenderer().render(plan.render(qs.values(*plan.columns)))
+
+        if stock() != fast():
+            raise CommandError("Parity check failed: fast path output differs from the serializer's.")
+        self.stdout.write(self.style.SUCCESS("Parity: rendered bytes identical."))
+
+        timings = {}
+        for name, fn in (("serializer + JSONRenderer", stock), ("values() + ORJSONRenderer", fast)):
+            runs = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                fn()
+                runs.append(time.perf_counter() - start)
+            timings[name] = statistics.median(runs)
+            self.stdout.write(f"{name:>28}: median {timings[name] * 1000:8.1f} ms "
+                              f"({options['rows'] / timings[name]:,.0f} rows/s)")
+        slow, quick = timings.values()
+        self.stdout.write(f"Speed-up: {slow / quick:.1f}x")
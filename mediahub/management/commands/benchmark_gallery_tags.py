@@ -0,0 +1,93 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from mediahub.filters import tag_facets
+from mediahub.models import GalleryItem
+from utils.tags import TAG_RULES
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Seed synthetic gallery items inside a rolled-back transaction and compare "
+            "tag-filter latency: legacy OR-of-contains without the GIN index vs ?| with it.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=15)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Synthetic rows rolled back.")
+
+    def _run(self, options):
+        rng = random.Random(options["seed"])
+        vocabulary = sorted(set(TAG_RULES.values()) | {f"site-{n}" for n in range(40)})
+
+        self.stdout.write(f"Seeding {options['items']:,} items...")
+        batch = []
+        for n in range(options["items"]):
+            batch.append(GalleryItem(
+                title=f"Bench {n}", image=f"images/bench-{n}.jpg",
+                tags=rng.sample(vocabulary, rng.randint(1, 3)), is_active=rng.random() > 0.1))
+            if len(batch) == 5000:
+                GalleryItem.objects.bulk_create(batch)
+                batch = []
+        GalleryItem.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {GalleryItem._meta.db_table}")
+
+        base = GalleryItem.objects.filter(is_active=True)
+        cases = {
+            "1 tag": ["kitchen"],
+            "3 tags": ["kitchen", "plumbing", "site-7"],
+            "rare tag": ["site-39"],
+        }
+
+        def legacy(tags):
+            q = Q()
+            for tag in tags:
+                q |= Q(tags__contains=[tag])
+            return base.filter(q)
+
+        def timed(qs):
+            samples = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                list(qs.values_list("id", flat=True)[:12])
+                qs.count()
+                samples.append((time.perf_counter() - started) * 1000)
+            return statistics.median(samples)
+
+        results = {name: {"any (?|), GIN": timed(base.filter(tags__has_any_keys=tags)),
+                          "all (?&), GIN": timed(base.filter(tags__has_keys=tags))}
+                   for name, tags in cases.items()}
+
+        started = time.perf_counter()
+        tag_facets(base)
+        facets_ms = (time.perf_counter() - started) * 1000
+
+        # "Before": drop the index inside the transaction (restored by the rollback).
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX gallery_tags_gin")
+        for name, tags in cases.items():
+            results[name]["legacy OR contains, no index"] = timed(legacy(tags))
+
+        self.stdout.write("\nmedian ms for first page + count:")
+        for name, timings in results.items():
+            self.stdout.write(f"  {name}:")
+            for label, ms in timings.items():
+                self.stdout.write(f"    {label:<30} {ms:8.2f}")
+        self.stdout.write(f"  tag facets (one aggregate query): {facets_ms:.2f} ms")
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from mediahub.models import GalleryItem
+
+
+class Command(BaseCommand):
+    help = "Generate responsive JPEG/WebP renditions for gallery items (backfill)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", nargs="+", type=int,
+                            help="Only process these GalleryItem ids.")
+        parser.add_argument("--force", action="store_true",
+                            help="Re-render items that already have renditions.")
+
+    def handle(self, *args, **options):
+        qs = GalleryItem.objects.order_by("id")
+        if options["ids"]:
+            qs = qs.filter(id__in=options["ids"])
+        if not options["force"]:
+            qs = qs.filter(renditions={})
+
+        done = skipped = failed = 0
+        for item in qs.iterator(chunk_size=100):
+            if not item.image or not item.image.storage.exists(item.image.name):
+                self.stderr.write(f"[skip] #{item.pk}: file not found ({item.image.name})")
+                skipped += 1
+                continue
+            try:
+                item.build_renditions()
+            except Exception as exc:  # corrupt/unsupported file: report and continue
+                self.stderr.write(f"[fail] #{item.pk} {item.image.name}: {exc}")
+                failed += 1
+                continue
+            done += 1
+            self.stdout.write(f"[ok] #{item.pk} {item.image.name}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Renditions built: {done}, skipped: {skipped}, failed: {failed}"))
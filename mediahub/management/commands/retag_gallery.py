@@ -0,0 +1,61 @@
+import os
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from mediahub.models import GalleryItem
+from utils.cache import bump_version
+from utils.tags import DEFAULT_TAG, derive_tags_many
+
+
+class Command(BaseCommand):
+    help = "Re-derive gallery tags from titles/filenames using the shared tag rules."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true",
+                            help="Retag every item (default: only items tagged [] or ['general']).")
+        parser.add_argument("--include-caption", action="store_true",
+                            help="Match keywords in the caption as well as the title.")
+        parser.add_argument("--whole-words", action="store_true",
+                            help="Only match keywords on word boundaries.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        qs = GalleryItem.objects.order_by("id").only("id", "title", "caption", "image", "tags")
+        if not options["all"]:
+            qs = qs.filter(tags__in=[[], [DEFAULT_TAG]])
+
+        scanned = changed = 0
+        batch = []
+        for item in qs.iterator(chunk_size=options["batch_size"]):
+            batch.append(item)
+            if len(batch) >= options["batch_size"]:
+                scanned, changed = self._retag(batch, options, scanned, changed)
+                batch = []
+        if batch:
+            scanned, changed = self._retag(batch, options, scanned, changed)
+
+        verb = "Would update" if options["dry_run"] else "Updated"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {changed} of {scanned} items."))
+
+    def _retag(self, items, options, scanned, changed):
+        texts = []
+        for item in items:
+            text = item.title or os.path.basename(item.image.name or "")
+            if options["include_caption"] and item.caption:
+                text = f"{text} {item.caption}"
+            texts.append(text)
+
+        dirty = []
+        for item, tags in zip(items, derive_tags_many(texts, whole_words=options["whole_words"])):
+            if tags != item.tags:
+                item.tags = tags
+                dirty.append(item)
+        if dirty and not options["dry_run"]:
+            now = timezone.now()
+            for item in dirty:
+                item.updated_at = now  # bulk_update skips auto_now
+            GalleryItem.objects.bulk_update(dirty, ["tags", "updated_at"])
+            bump_version(GalleryItem)
+        return scanned + len(items), changed + len(dirty)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from mediahub.ingest import process_job, requeue_stale
+from mediahub.models import IngestJob
+from utils.jobs import claim_next, run_worker
+
+
+class Command(BaseCommand):
+    help = "Process queued gallery bulk-upload jobs (DB-backed queue, no broker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Exit when the queue is empty instead of polling.")
+        parser.add_argument("--sleep", type=float, default=2.0,
+                            help="Seconds between polls when idle (default: 2).")
+
+    def handle(self, *args, **options):
+        def poll():
+            # Expired leases are checked on every poll, so a dead worker's jobs are
+            # picked up by whichever worker is still alive
+            stale = requeue_stale()
+            if stale:
+                self.stdout.write(f"[requeue] {stale} stale job(s)")
+            job = claim_next(IngestJob.objects.all())
+            if job is None:
+                return False
+            self.stdout.write(f"[run] job #{job.pk}")
+            try:
+                process_job(job)
+            except Exception as exc:  # recorded on the job; keep the worker alive
+                self.stderr.write(f"[fail] job #{job.pk}: {exc}")
+            else:
+                self.stdout.write(f"[done] job #{job.pk} {job.stats}")
+            return True
+
+        run_worker(poll, once=options["once"], sleep=options["sleep"])
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:29
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mediahub', '0004_ingest_jobs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='gallery_tags_gin'),
+        ),
+    ]
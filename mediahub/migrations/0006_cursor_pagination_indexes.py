@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mediahub', '0005_tags_gin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='gallery_active_created_idx'),
+        ),
+    ]
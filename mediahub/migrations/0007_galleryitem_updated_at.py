@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Existing items were last changed no later than their upload as far as we know
+    GalleryItem = apps.get_model('mediahub', 'GalleryItem')
+    GalleryItem.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mediahub', '0006_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryitem',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(fields=['updated_at'], name='gallery_updated_idx'),
+        ),
+    ]
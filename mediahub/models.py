@@ -1,16 +1,84 @@
-
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.utils import timezone
+
+from utils.cache import bump_version
+from utils.jobs import JOB_STATUS_CHOICES, QUEUED
 
 class GalleryItem(models.Model):
     title = models.CharField(max_length=160, blank=True)
     image = models.ImageField(upload_to='images/')
     caption = models.TextField(blank=True)
     tags = models.JSONField(default=list, blank=True)
+    # {"jpeg": {"320": "images/renditions/x-320w.jpg", ...}, "webp": {...}}
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Default jsonb_ops: supports ?| / ?& (tag filters) as well as @>
+            GinIndex(fields=['tags'], name='gallery_tags_gin'),
+            # Keyset (cursor) pagination of the public gallery
+            models.Index(fields=['is_active', '-created_at', '-id'], name='gallery_active_created_idx'),
+            # /api/changes/ delta sync
+            models.Index(fields=['updated_at'], name='gallery_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title or f"Image {self.pk}"
+
+    def build_renditions(self, save=True):
+        """(Re)generate the sized JPEG/WebP variants for the current image."""
+        from .renditions import delete_renditions, generate_renditions
+
+        # Render first: the old files stay in place if rendering fails
+        old = self.renditions
+        self.renditions = generate_renditions(self.image) if self.image else {}
+        kept = {name for variants in self.renditions.values() for name in variants.values()}
+        delete_renditions(old, self.image.storage, keep=kept)
+        if save:
+            GalleryItem.objects.filter(pk=self.pk).update(renditions=self.renditions, updated_at=timezone.now())
+            bump_version(GalleryItem)
+
+
+class IngestJob(models.Model):
+    """A queued bulk upload, processed by `manage.py run_ingest_worker`."""
+    status = models.CharField(max_length=20, choices=JOB_STATUS_CHOICES, default=QUEUED, db_index=True)
+    # Shared metadata applied to every file (same fields as bulk-upload)
+    title = models.CharField(max_length=160, blank=True)
+    caption = models.TextField(blank=True)
+    tags = models.JSONField(default=list, blank=True)
+    stats = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Ingest job {self.pk} [{self.status}]"
+
+
+class IngestJobFile(models.Model):
+    PENDING, DONE, FAILED = "pending", "done", "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (DONE, "Done"), (FAILED, "Failed")]
+
+    job = models.ForeignKey(IngestJob, related_name='files', on_delete=models.CASCADE)
+    upload = models.FileField(upload_to='ingest/', blank=True)  # raw file, removed once ingested
+    original_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    gallery_item = models.ForeignKey(GalleryItem, null=True, blank=True, on_delete=models.SET_NULL)
+    errors = models.JSONField(default=dict, blank=True)
+    duration_ms = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.original_name} [{self.status}]"
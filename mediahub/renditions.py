@@ -0,0 +1,116 @@
+# mediahub/renditions.py
+import os
+import shutil
+import tempfile
+import time
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+
+# --- Rendition policy ---
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITION_FORMATS = {
+    # format key -> (Pillow format, file extension, save options)
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+}
+RENDITION_DIR = "renditions"
+
+
+def rendition_name(original_name: str, width: int, ext: str) -> str:
+    """
+    'images/kitchen.jpg' -> 'images/renditions/kitchen-jpg-640w.webp'
+    Renditions live next to the original, in a sibling folder. The whole stored
+    filename (extension included) goes into the name, so kitchen.jpg and
+    kitchen.png never share one; storage.save() still picks a free name.
+    """
+    folder, filename = os.path.split(original_name)
+    stem, original_ext = os.path.splitext(filename)
+    if original_ext:
+        stem = f"{stem}-{original_ext.lstrip('.').lower()}"
+    return os.path.join(folder, RENDITION_DIR, f"{stem}-{width}w.{ext}")
+
+
+def render_variants(source):
+    """
+    Decode ``source`` (path or file object) once and yield
+    (format key, width, extension, encoded bytes) for every configured rendition.
+    Widths larger than the original are skipped (no upscaling); an image narrower
+    than the smallest width still gets one rendition at its own width.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        widths = [w for w in RENDITION_WIDTHS if w < img.width] or [img.width]
+        for width in widths:
+            height = max(1, round(img.height * width / img.width))
+            resized = img.resize((width, height), Image.Resampling.LANCZOS)
+            for key, (pil_format, ext, options) in RENDITION_FORMATS.items():
+                frame = resized
+                if pil_format == "JPEG" and frame.mode != "RGB":
+                    frame = frame.convert("RGB")
+                buf = BytesIO()
+                frame.save(buf, pil_format, **options)
+                yield key, width, ext, buf.getvalue()
+
+
+def generate_renditions(image) -> dict:
+    """
+    Render and store every rendition for an ImageField file.
+    Returns {"jpeg": {"320": "images/renditions/x-320w.jpg", ...}, "webp": {...}},
+    which is what GalleryItem.renditions stores.
+    """
+    storage = image.storage
+    renditions = {}
+    with image.open("rb") as fp:
+        for key, width, ext, data in render_variants(fp):
+            # Never delete or overwrite whatever holds this name: it may be another item's
+            stored = storage.save(rendition_name(image.name, width, ext), ContentFile(data))
+            renditions.setdefault(key, {})[str(width)] = stored
+    return renditions
+
+
+def delete_renditions(renditions: dict, storage, keep=()) -> None:
+    """
+    Remove previously generated rendition files (e.g. when the image is replaced):
+    only the paths recorded in ``renditions``, minus any in ``keep``.
+    """
+    for variants in (renditions or {}).values():
+        for name in variants.values():
+            if name not in keep and storage.exists(name):
+                storage.delete(name)
+
+
+def render_to_files(path: str) -> dict:
+    """
+    Process-pool entry point for bulk ingestion: verify the image at ``path``
+    and write its renditions to a private temp dir, so only small file paths
+    (not image bytes) travel back to the parent process.
+    Pure Pillow work - no Django settings or DB access happens here.
+    """
+    from PIL import Image
+
+    started = time.perf_counter()
+    with Image.open(path) as img:
+        img.verify()  # cheap integrity check; the file must be reopened afterwards
+
+    out_dir = tempfile.mkdtemp(prefix="renditions-")
+    variants = []
+    try:
+        for key, width, ext, data in render_variants(path):
+            out_path = os.path.join(out_dir, f"{key}-{width}.{ext}")
+            with open(out_path, "wb") as fh:
+                fh.write(data)
+            variants.append((key, width, ext, out_path))
+    except Exception:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        raise
+    return {
+        "tmp_dir": out_dir,
+        "variants": variants,
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
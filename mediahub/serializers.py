@@ -1,45 +1,72 @@
 # mediahub/serializers.py
+from functools import lru_cache
+
+from django.core.files.storage import default_storage
 from rest_framework import serializers
-from .models import GalleryItem
+from utils.fastlist import storage_url_builder
+from utils.sparse import DynamicFieldsMixin
+from utils.tags import DEFAULT_TAG, TAG_RULES, derive_tags
+from .models import GalleryItem, IngestJob, IngestJobFile
 
 # --- Image validation policy ---
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp"}
 MAX_UPLOAD_MB = 10  # adjust as needed
 
-# --- Tag derivation policy ---
-DEFAULT_TAG = "general"
-TAG_RULES = {
-    "kitchen": "kitchen",
-    "bathroom": "bathroom",
-    "bath": "bathroom",
-    "tile": "tiling",
-    "floor": "flooring",
-    "shop": "shopfitting",
-    "fitout": "shopfitting",
-    "carpentry": "carpentry",
-    "paint": "painting",
-    "plaster": "plastering",
-    "plumb": "plumbing",
-    "ceiling": "ceiling",
-    "reno": "renovation",
-    "refurb": "renovation",
-}
-
-
+# --- Tag derivation policy (shared rules/engine in utils.tags) ---
 def derive_tags_from_text(text: str) -> list[str]:
     """Return sorted, unique tags based on TAG_RULES; guarantee at least DEFAULT_TAG."""
-    lowered = (text or "").lower()
-    tags = {rule_tag for key, rule_tag in TAG_RULES.items() if key in lowered}
-    return sorted(tags or {DEFAULT_TAG})
+    return derive_tags(text, TAG_RULES)
 
 
-class GalleryItemSerializer(serializers.ModelSerializer):
+class GalleryItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    renditions = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
+    sparse_field_columns = {"renditions": ("renditions",), "srcset": ("renditions",)}
+
     class Meta:
         model = GalleryItem
         fields = ["id", "title", "image", "caption",
-                  "tags", "is_active", "created_at"]
+                  "tags", "is_active", "created_at", "renditions", "srcset"]
         read_only_fields = ["created_at"]
 
+    # --- Responsive image variants ---
+    def _rendition_url(self, name):
+        # One builder per serializer (the media prefix is resolved once per list);
+        # memoised because renditions and srcset ask for the same names
+        builder = self.__dict__.get("_url_builder")
+        if builder is None:
+            builder = self._url_builder = lru_cache(maxsize=64)(
+                storage_url_builder(default_storage, self.context.get("request")))
+        return builder(name)
+
+    def get_renditions(self, obj):
+        """{"webp": {"320": url, ...}, "jpeg": {...}} built from the stored names."""
+        return {
+            fmt: {width: self._rendition_url(name) for width, name in variants.items()}
+            for fmt, variants in (obj.renditions or {}).items()
+        }
+
+    def get_srcset(self, obj):
+        """Ready-to-use srcset strings per format, e.g. {"webp": "u1 320w, u2 640w"}."""
+        return {
+            fmt: ", ".join(f"{self._rendition_url(name)} {width}w"
+                           for width, name in sorted(variants.items(), key=lambda kv: int(kv[0])))
+            for fmt, variants in (obj.renditions or {}).items()
+        }
+
+    # --- Render variants whenever a new image is stored ---
+    def create(self, validated_data):
+        instance = super().create(validated_data)
+        instance.build_renditions()
+        return instance
+
+    def update(self, instance, validated_data):
+        image_changed = "image" in validated_data
+        instance = super().update(instance, validated_data)
+        if image_changed:
+            instance.build_renditions()
+        return instance
+
     # --- Field-level validation for the image ---
     def validate_image(self, file):
         """
@@ -83,3 +110,22 @@ class GalleryItemSerializer(serializers.ModelSerializer):
             attrs["tags"] = normalized or [DEFAULT_TAG]
 
         return attrs
+
+
+class IngestJobFileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = IngestJobFile
+        fields = ["original_name", "status", "gallery_item", "errors", "duration_ms"]
+
+
+class IngestJobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    files = IngestJobFileSerializer(many=True, read_only=True)
+    created = serializers.SerializerMethodField()
+
+    class Meta:
+        model = IngestJob
+        fields = ["id", "status", "created_at", "started_at", "finished_at",
+                  "stats", "error", "created", "files"]
+
+    def get_created(self, obj):
+        return [f.gallery_item_id for f in obj.files.all() if f.gallery_item_id]
@@ -1 +1,290 @@
-# tests
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from utils.jobs import DONE, FAILED, QUEUED, RUNNING, claim_next, keep_lease
+from utils.tags import DEFAULT_TAG, TAG_RULES, TagMatcher
+from utils.testing import NO_CACHE, stock_and_fast_list
+from .ingest import STALE_AFTER, build_items, enqueue_job, ingest_items, process_job, requeue_stale
+from .models import GalleryItem, IngestJob, IngestJobFile
+from .serializers import GalleryItemSerializer
+from .views import GalleryViewSet
+
+
+class ConditionalGetTests(TestCase):
+    def test_malformed_pk_is_404_not_500(self):
+        response = self.client.get(reverse("gallery-detail", args=["abc"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_detail_revalidates_with_etag(self):
+        item = GalleryItem.objects.create(title="Kitchen", image="images/kitchen.jpg")
+        url = reverse("gallery-detail", args=[item.pk])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+
+@override_settings(CACHES=NO_CACHE)
+class GalleryQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        GalleryItem.objects.bulk_create(
+            GalleryItem(title=f"Item {n}", image=f"images/item-{n}.jpg",
+                        tags=["kitchen", "tiling"] if n % 2 else ["bathroom"],
+                        renditions={"webp": {"320": f"images/renditions/item-{n}-320w.webp"}})
+            for n in range(30))
+
+    def test_list(self):
+        with self.assertNumQueries(3):  # ETag aggregate, count, rows
+            response = self.client.get(reverse("gallery-list"))
+        self.assertEqual(response.json()["count"], 30)
+
+    def test_cursor_page(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(reverse("gallery-list") + "?cursor=").status_code, 200)
+
+    def test_tag_filter(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("gallery-list") + "?tags=kitchen")
+        self.assertEqual(response.json()["count"], 15)
+
+    def test_sparse_srcset_loads_renditions(self):
+        # srcset is computed from the renditions column: ?fields=srcset must not defer it
+        url = reverse("gallery-list") + "?fields=id,srcset"
+        with mock.patch.object(GalleryViewSet, "fast_plan", return_value=None):
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+        self.assertIn("item-", response.json()["results"][0]["srcset"]["webp"])
+        url = reverse("gallery-detail", args=[GalleryItem.objects.first().pk]) + "?fields=srcset"
+        with self.assertNumQueries(2):  # ETag, row
+            self.assertTrue(self.client.get(url).json()["srcset"])
+
+    def test_sparse_fields_defer_renditions_unless_needed(self):
+        request = Request(APIRequestFactory().get("/", {"fields": "id,title"}))
+        deferred = GalleryItemSerializer(context={"request": request}).sparse_deferred_columns(GalleryItem)
+        self.assertIn("renditions", deferred)
+        request = Request(APIRequestFactory().get("/", {"fields": "id,srcset"}))
+        deferred = GalleryItemSerializer(context={"request": request}).sparse_deferred_columns(GalleryItem)
+        self.assertNotIn("renditions", deferred)
+
+    def test_tag_counts(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("gallery-tag-counts"))
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHES=NO_CACHE, TIME_ZONE="Europe/Dublin")
+class GalleryFastListParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        items = GalleryItem.objects.bulk_create([
+            GalleryItem(title="Kitchen – café", image="images/kitchen one.jpg", caption="Before/after",
+                        tags=["kitchen", "tiling"],
+                        renditions={"webp": {"640": "images/renditions/k-640w.webp", "320": "images/renditions/k-320w.webp"},
+                                    "jpeg": {"320": "images/renditions/k-320w.jpg"}}),
+            GalleryItem(title="", image="", tags=[], renditions={}),  # no image, no tags
+            GalleryItem(title="Hidden", image="images/hidden.jpg", is_active=False),
+        ])
+        # Summer (+01:00 in Dublin, with microseconds) and winter (UTC) timestamps
+        GalleryItem.objects.filter(pk=items[0].pk).update(
+            created_at=datetime(2025, 7, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc))
+        GalleryItem.objects.filter(pk=items[1].pk).update(
+            created_at=datetime(2025, 1, 15, 12, 0, tzinfo=dt_timezone.utc))
+
+    def assertParity(self, url):
+        stock, fast = stock_and_fast_list(self.client, GalleryViewSet, url)
+        self.assertEqual(stock, fast)
+        return fast
+
+    def test_list(self):
+        body = self.assertParity(reverse("gallery-list"))
+        self.assertIn(b'"2025-07-01T10:30:15.123456+01:00"', body)
+        self.assertIn(b'"image":null', body)
+
+    def test_cursor_and_filters(self):
+        self.assertParity(reverse("gallery-list") + "?cursor=")
+        self.assertParity(reverse("gallery-list") + "?tags=kitchen&ordering=title")
+
+    def test_staff_sees_inactive_items(self):
+        self.client.force_login(get_user_model().objects.create_user("staff", is_staff=True))
+        self.assertIn(b"Hidden", self.assertParity(reverse("gallery-list")))
+
+
+class MediaRootTestCase(TestCase):
+    """Stores files under a throwaway MEDIA_ROOT; renders inline."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media_root, GALLERY_INGEST_WORKERS=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.media_root = media_root
+
+    def upload(self, name):
+        from PIL import Image
+
+        buf = BytesIO()
+        Image.new("RGB", (400, 300), "white").save(buf, "JPEG")
+        return SimpleUploadedFile(name, buf.getvalue(), content_type="image/jpeg")
+
+    def stored_files(self):
+        return [name for _, _, names in os.walk(self.media_root) for name in names]
+
+
+class RenditionStorageTests(MediaRootTestCase):
+    def item(self, name):
+        item = GalleryItem(title=name)
+        item.image.save(name, self.upload(name), save=False)
+        item.save()
+        item.build_renditions()
+        return item
+
+    def test_same_stem_different_extension_keeps_separate_files(self):
+        jpg, png = self.item("kitchen.jpg"), self.item("kitchen.png")
+        jpg_files = set(jpg.renditions["webp"].values()) | set(jpg.renditions["jpeg"].values())
+        png_files = set(png.renditions["webp"].values()) | set(png.renditions["jpeg"].values())
+        self.assertFalse(jpg_files & png_files)
+        self.assertIn("images/renditions/kitchen-jpg-320w.webp", jpg_files)
+
+        png.build_renditions()  # rebuilding one item leaves the other's files alone
+        storage = jpg.image.storage
+        self.assertTrue(all(storage.exists(name) for name in jpg_files))
+        self.assertTrue(all(storage.exists(name) for v in png.renditions.values() for name in v.values()))
+        self.assertEqual(len(self.stored_files()), 6)  # 2 originals + 2 x (320w jpeg, webp)
+
+
+class IngestCleanupTests(MediaRootTestCase):
+    def test_files_stored_before_a_failure_are_deleted(self):
+        items = build_items([self.upload("one.jpg"), self.upload("two.jpg")], tags=["kitchen"])
+        # one.jpg and its two renditions are stored, then two.jpg's first rendition fails
+        failing = [mock.DEFAULT, mock.DEFAULT, OSError("disk full")]
+        with mock.patch("mediahub.ingest.File", side_effect=failing, wraps=File):
+            with self.assertRaises(OSError):
+                ingest_items(items)
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(GalleryItem.objects.exists())
+
+    def test_successful_ingest_keeps_its_files(self):
+        outcomes, stats = ingest_items(build_items([self.upload("one.jpg")], tags=["kitchen"]))
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(len(self.stored_files()), 3)  # original, 320w jpeg and webp
+
+
+class IngestJobLeaseTests(TestCase):
+    def test_job_of_a_dead_worker_is_claimed_again(self):
+        job = IngestJob.objects.create()
+        self.assertEqual(claim_next(IngestJob.objects.all()), job)
+        self.assertEqual(requeue_stale(), 0)  # still within its lease
+        self.assertIsNone(claim_next(IngestJob.objects.all()))
+
+        IngestJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - STALE_AFTER - timedelta(minutes=1))
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(IngestJob.objects.get().status, QUEUED)
+        self.assertEqual(claim_next(IngestJob.objects.all()).status, RUNNING)
+
+
+class IngestJobRetryTests(MediaRootTestCase):
+    def test_crash_after_insert_does_not_ingest_twice(self):
+        job = enqueue_job([self.upload("one.jpg"), self.upload("two.jpg")], tags=["kitchen"])
+        IngestJob.objects.filter(pk=job.pk).update(status=RUNNING, started_at=timezone.now())
+        job.refresh_from_db()
+        with mock.patch("mediahub.ingest.bump_version", side_effect=RuntimeError("worker killed")):
+            with self.assertRaises(RuntimeError):
+                process_job(job)
+        self.assertEqual(GalleryItem.objects.count(), 2)
+        self.assertEqual(set(job.files.values_list("status", flat=True)), {IngestJobFile.DONE})
+        self.assertFalse(job.files.filter(gallery_item=None).exists())
+
+        # The job is requeued and claimed again: nothing is left to ingest
+        job.status = RUNNING
+        process_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.stats["files"]), (DONE, 0))
+        self.assertEqual(GalleryItem.objects.count(), 2)
+
+
+class KeepLeaseTests(TransactionTestCase):
+    def test_lease_is_refreshed_while_the_job_runs(self):
+        stale = timezone.now() - STALE_AFTER - timedelta(minutes=1)
+        job = IngestJob.objects.create(status=RUNNING, started_at=stale)
+        with keep_lease(job, every=0.01):
+            deadline = timezone.now() + timedelta(seconds=5)
+            while IngestJob.objects.get().started_at == stale and timezone.now() < deadline:
+                time.sleep(0.01)
+        self.assertGreater(IngestJob.objects.get().started_at, stale)
+        self.assertEqual(requeue_stale(), 0)
+
+    def test_finished_job_is_left_alone(self):
+        finished = timezone.now() - timedelta(hours=1)
+        job = IngestJob.objects.create(status=FAILED, started_at=finished)
+        with keep_lease(job, every=0.01):
+            time.sleep(0.05)
+        self.assertEqual(IngestJob.objects.get().started_at, finished)
+
+
+def substring_tags(text, rules, whole_words=False):
+    """The original rule loop: every keyword tested against the text on its own."""
+    lowered = (text or "").lower()
+    if whole_words:
+        tags = {tag for key, tag in rules.items() if re.search(rf"\b{re.escape(key)}\b", lowered)}
+    else:
+        tags = {tag for key, tag in rules.items() if key in lowered}
+    return sorted(tags or {DEFAULT_TAG})
+
+
+class TagMatcherTests(SimpleTestCase):
+    # Keywords that are prefixes, suffixes and overlaps of one another
+    OVERLAPPING = {"a": "one", "ab": "two", "abc": "three", "bc": "four", "c": "five", "cab": "six"}
+    FRAGMENTS = ["kitchen", "kit", "chen", "bath", "bathroom", "room", "tile", "plumb", "plaster", "pl",
+                 "reno", "refurb", "Bath", "SHOP", "a", "b", "c", "ab", "ca", " ", "_", "-", ".", "x"]
+
+    def random_texts(self, count):
+        rng = random.Random(4)
+        return ["".join(rng.choices(self.FRAGMENTS, k=rng.randint(0, 8))) for _ in range(count)]
+
+    def test_same_tags_as_the_substring_rules(self):
+        for rules in (TAG_RULES, self.OVERLAPPING):
+            for whole_words in (False, True):
+                matcher = TagMatcher(rules, whole_words=whole_words)
+                for text in self.random_texts(500) + [None, "", "abc", "cabc", "bathroom", "Bathroom_Tile.JPG"]:
+                    with self.subTest(rules=len(rules), whole_words=whole_words, text=text):
+                        self.assertEqual(matcher.derive(text), substring_tags(text, rules, whole_words))
+
+    def test_prefixes_of_the_longest_match_are_folded_in(self):
+        matcher = TagMatcher(self.OVERLAPPING)
+        self.assertEqual(matcher.derive("abc"), ["five", "four", "one", "three", "two"])
+        self.assertEqual(TagMatcher(TAG_RULES).derive("bathroom"), ["bathroom"])
+        self.assertEqual(TagMatcher({"bath": "bath", "bathroom": "room"}, whole_words=True).derive("bathroom"),
+                         ["room"])
+
+    def test_many_matches_one_at_a_time(self):
+        for whole_words in (False, True):
+            matcher = TagMatcher(TAG_RULES, whole_words=whole_words)
+            texts = self.random_texts(300)
+            self.assertEqual(matcher.derive_many(texts), [matcher.derive(text) for text in texts])
+
+    def test_many_does_not_match_across_texts(self):
+        matcher = TagMatcher(self.OVERLAPPING)
+        self.assertEqual(matcher.derive_many(["a", "bc", "", None, "c"]),
+                         [["one"], ["five", "four"], [DEFAULT_TAG], [DEFAULT_TAG], ["five"]])
+        self.assertEqual(TagMatcher(TAG_RULES).derive_many(["kit", "chen", "bath", "room"]),
+                         [[DEFAULT_TAG], [DEFAULT_TAG], ["bathroom"], [DEFAULT_TAG]])
+        self.assertEqual(TagMatcher(TAG_RULES, whole_words=True).derive_many(["old tile", "tile"]),
+                         [["tiling"], ["tiling"]])
+        self.assertEqual(TagMatcher({}).derive_many(["kitchen"]), [[DEFAULT_TAG]])
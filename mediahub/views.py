@@ -1,13 +1,19 @@
-from .models import GalleryItem
-from .serializers import GalleryItemSerializer
-from .filters import GalleryFilterSet  # if you added the JSONField filter fix
+from django.shortcuts import get_object_or_404
+from .models import GalleryItem, IngestJob
+from .serializers import GalleryItemSerializer, IngestJobSerializer
+from .filters import GalleryFilterSet, tag_facets
 from rest_framework import viewsets, permissions, parsers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
 import json
-from utils.tags import derive_tags
-from .serializers import TAG_RULES
+from utils.cache import CachedResponseMixin
+from utils.conditional import ConditionalGetMixin
+from utils.fastlist import FastListMixin
+from utils.pagination import KeysetOrPageNumberPagination
+from utils.sparse import SparseFieldsMixin
+from .ingest import build_items, enqueue_job, ingest
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -21,7 +27,8 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return bool(request.user and request.user.is_staff)
 
 
-class GalleryViewSet(viewsets.ModelViewSet):
+class GalleryViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsMixin, FastListMixin,
+                     viewsets.ModelViewSet):
     queryset = GalleryItem.objects.filter(
         is_active=True).order_by("-created_at")
     serializer_class = GalleryItemSerializer
@@ -30,6 +37,11 @@ class GalleryViewSet(viewsets.ModelViewSet):
     filterset_class = GalleryFilterSet
     search_fields = ["title", "caption"]
     ordering_fields = ["created_at", "title"]
+    pagination_class = KeysetOrPageNumberPagination
+    cursor_ordering = ("-created_at", "-id")  # ?cursor= infinite scroll
+    cache_actions = ("list", "tag_counts")
+    cache_models = (GalleryItem,)
+    fast_list_columns = ("renditions",)  # read by the renditions/srcset method fields
 
     # Enable multipart/form-data for image uploads
     parser_classes = [parsers.MultiPartParser,
@@ -42,49 +54,59 @@ class GalleryViewSet(viewsets.ModelViewSet):
             return qs.order_by("-created_at")
         return qs.filter(is_active=True).order_by("-created_at")
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Bulk uploads stream every file to disk (TemporaryUploadedFile) instead of
+        # holding the whole batch in RAM; the ingest workers read them by path.
+        if self.action_map.get(request.method.lower()) == "bulk_upload":
+            request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     @action(detail=False, methods=["post"], permission_classes=[IsAdminOrReadOnly], url_path="bulk-upload")
     def bulk_upload(self, request):
         """
         Accepts multiple images under the same key 'images',
         plus optional shared fields, e.g., tags (JSON list), is_active, caption prefix, etc.
+        Images are verified and rendered in parallel (see mediahub.ingest);
+        the response adds per-file timings and throughput stats.
         """
         files = request.FILES.getlist("images")
-        created = []
-        errors = []
 
         # Optional shared metadata
-        tags = request.data.get("tags")
+        provided_tags_raw = request.data.get("tags")  # if client passed JSON string
         try:
-            tags = json.loads(tags) if tags else []
+            provided_tags = json.loads(
+                provided_tags_raw) if provided_tags_raw else []
         except Exception:
-            tags = []
+            provided_tags = []
+        title = request.data.get("title") or ""
+        caption = request.data.get("caption", "")
+
+        # ?async=1 (or async=true in the form): persist and queue, respond immediately
+        run_async = (request.query_params.get("async") or request.data.get("async") or "").lower()
+        if run_async in ("1", "true", "yes"):
+            job = enqueue_job(files, title=title, caption=caption, tags=provided_tags)
+            return Response(
+                IngestJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
-        # ...
-        for f in files:
-            base_title = request.data.get("title") or f.name
-            provided_tags_raw = request.data.get(
-                "tags")  # if client passed JSON string
-            try:
-                provided_tags = json.loads(
-                    provided_tags_raw) if provided_tags_raw else []
-            except Exception:
-                provided_tags = []
+        items = build_items(files, title, caption, provided_tags)
+        result = ingest(items, context=self.get_serializer_context())
+        if result["errors"]:
+            return Response(result, status=status.HTTP_207_MULTI_STATUS)
+        result.pop("errors")
+        return Response(result, status=status.HTTP_201_CREATED)
 
-            item = {
-                "image": f,
-                "title": base_title,
-                "caption": request.data.get("caption", ""),
-                "tags": provided_tags or derive_tags(base_title, TAG_RULES),
-                "is_active": True,
-            }
-            # ...
-            serializer = self.get_serializer(data=item)
-            if serializer.is_valid():
-                instance = serializer.save()
-                created.append(instance.id)
-            else:
-                errors.append({f.name: serializer.errors})
+    @action(detail=False, methods=["get"], url_path="tags")
+    def tag_counts(self, request):
+        """
+        Tag facets: tag -> number of (active) items, honouring the current
+        filters/search so the counts match what the gallery would show.
+        """
+        qs = self.filter_queryset(self.get_queryset())
+        return Response(tag_facets(qs))
 
-        if errors:
-            return Response({"created": created, "errors": errors}, status=status.HTTP_207_MULTI_STATUS)
-        return Response({"created": created}, status=status.HTTP_201_CREATED)
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser],
+            url_path=r"jobs/(?P<job_id>[0-9]+)")
+    def job_status(self, request, job_id=None):
+        """Progress of an asynchronous bulk upload: per-file status, created ids and errors."""
+        job = get_object_or_404(IngestJob.objects.prefetch_related("files"), pk=job_id)
+        return Response(IngestJobSerializer(job).data)
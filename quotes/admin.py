@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Quote
+from .models import Quote, QuoteDailyRollup, QuoteReport
 
 
 @admin.register(Quote)
@@ -10,3 +10,27 @@ class QuoteAdmin(admin.ModelAdmin):
     search_fields = ("full_name", "email", "phone",
                      "service", "description", "notes")
     readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(QuoteDailyRollup)
+class QuoteDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("date", "status", "service", "count", "sum_estimated", "sum_contracted")
+    list_filter = ("status",)
+    date_hierarchy = "date"
+
+    def has_add_permission(self, request):
+        return False  # maintained by quotes/rollups.py
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False  # a deleted bucket silently drops out of the KPI totals
+
+
+@admin.register(QuoteReport)
+class QuoteReportAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "row_count", "pages", "created_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = ("filters", "filters_hash", "cache_key", "file", "row_count", "pages", "error",
+                       "created_at", "started_at", "finished_at")
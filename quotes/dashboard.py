@@ -0,0 +1,240 @@
+# quotes/dashboard.py
+"""
+Quote dashboard KPIs and time series.
+
+Everything is computed with conditional aggregates: one query for the KPI
+block and one GROUP BY for the chart buckets. When only ?granularity=,
+date-only ?from=/?to= and ?status= are given, both read the per-day
+QuoteDailyRollup table, so their cost depends on the date range rather than
+the number of quotes; any other filter falls back to the Quote table
+(served by the (status, created_at) index).
+"""
+import datetime
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import Quote, QuoteDailyRollup
+
+STATUSES = [value for value, _ in Quote.STATUS_CHOICES]
+WON_STATUSES = ("contracted", "won")  # counted as conversions
+GRANULARITIES = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+# Series window when ?from= is omitted, counted back from ?to= (default today)
+DEFAULT_BUCKETS = {"day": 30, "week": 12, "month": 12}
+MAX_BUCKETS = 400
+# Query params the rollup table can answer (status is matched like QuoteFilter: iexact)
+ROLLUP_PARAMS = {"granularity", "from", "to", "status", "ordering", "source"}
+
+
+# --- Sources ---
+class LiveSource:
+    """Aggregates straight over Quote rows."""
+    name = "live"
+    estimated, contracted = "estimated_value", "contracted_value"
+
+    def count(self, condition=None):
+        return Count("id", filter=condition)
+
+    def since(self, start):
+        return Q(created_at__gte=start)
+
+    def before(self, end):
+        return Q(created_at__lt=end)
+
+    def period(self, granularity):
+        return GRANULARITIES[granularity]("created_at", tzinfo=timezone.get_current_timezone())
+
+    def period_date(self, value):
+        return timezone.localtime(value).date()
+
+
+class RollupSource:
+    """Aggregates over QuoteDailyRollup rows (bounds are local midnights)."""
+    name = "rollup"
+    estimated, contracted = "sum_estimated", "sum_contracted"
+
+    def count(self, condition=None):
+        return Sum("count", filter=condition)
+
+    def since(self, start):
+        return Q(date__gte=timezone.localdate(start))
+
+    def before(self, end):
+        return Q(date__lt=timezone.localdate(end))
+
+    def period(self, granularity):
+        return GRANULARITIES[granularity]("date")
+
+    def period_date(self, value):
+        return value
+
+
+# --- Parameters ---
+def _parse_bound(value, name, end=False):
+    if not value:
+        return None
+    try:
+        # Checked first: parse_datetime() also accepts bare dates (as midnight)
+        day = parse_date(value)
+        dt = None if day else parse_datetime(value)
+    except ValueError:
+        day = dt = None
+    if day:
+        # Dates are inclusive calendar days in the site's timezone
+        dt = datetime.datetime.combine(day + datetime.timedelta(days=1) if end else day, datetime.time.min)
+    elif dt is None:
+        raise ValidationError({name: "Use YYYY-MM-DD or an ISO 8601 datetime."})
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def _bucket_start(day, granularity):
+    if granularity == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(day, granularity):
+    if granularity == "week":
+        return day + datetime.timedelta(weeks=1)
+    if granularity == "month":
+        return (day.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return day + datetime.timedelta(days=1)
+
+
+def _is_date(value):
+    try:
+        return not value or parse_date(value) is not None
+    except ValueError:
+        return False
+
+
+def use_rollups(params):
+    """Can the rollup table answer this request exactly?"""
+    if params.get("source") in ("live", "rollup"):
+        return params["source"] == "rollup"
+    return set(params) <= ROLLUP_PARAMS and _is_date(params.get("from")) and _is_date(params.get("to"))
+
+
+def parse_params(params):
+    """
+    ?granularity=day|week|month&from=&to= -> (granularity, start, end, explicit).
+    ``explicit`` holds the bounds the caller actually gave: (start or None, end or None).
+    """
+    granularity = params.get("granularity", "day")
+    if granularity not in GRANULARITIES:
+        raise ValidationError({"granularity": f"One of: {', '.join(GRANULARITIES)}."})
+    start = _parse_bound(params.get("from"), "from")
+    end = _parse_bound(params.get("to"), "to", end=True)
+    explicit = (start, end)
+    if end is None:
+        end = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+    if start is None:
+        day = _bucket_start(timezone.localtime(end - datetime.timedelta(microseconds=1)).date(), granularity)
+        for _ in range(DEFAULT_BUCKETS[granularity] - 1):
+            day = _bucket_start(day - datetime.timedelta(days=1), granularity)
+        start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    if start >= end:
+        raise ValidationError({"from": "Must be before 'to'."})
+    return granularity, start, end, explicit
+
+
+# --- Queries ---
+def kpis(qs, source):
+    """Totals, per-status counts/pipeline, sums, recent activity and conversion in one query."""
+    today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    aggregates = {
+        "total": source.count(),
+        # (aliases must not shadow the rollup table's sum_* columns)
+        "estimated_total": Sum(source.estimated),
+        "contracted_total": Sum(source.contracted),
+        # Calendar days, today included
+        "last_7_days": source.count(source.since(today - datetime.timedelta(days=6))),
+        "last_30_days": source.count(source.since(today - datetime.timedelta(days=29))),
+        "won": source.count(Q(status__in=WON_STATUSES)),
+    }
+    for status in STATUSES:
+        aggregates[f"count_{status}"] = source.count(Q(status=status))
+        aggregates[f"pipeline_{status}"] = Sum(source.estimated, filter=Q(status=status))
+    row = {key: value or 0 for key, value in qs.order_by().aggregate(**aggregates).items()}
+
+    return {
+        "total": row["total"],
+        "by_status": {status: row[f"count_{status}"] for status in STATUSES},
+        "pipeline": {status: row[f"pipeline_{status}"] for status in STATUSES},
+        "sum_estimated": row["estimated_total"],
+        "sum_contracted": row["contracted_total"],
+        "last_7_days": row["last_7_days"],
+        "last_30_days": row["last_30_days"],
+        "conversion_rate": round(row["won"] / row["total"], 4) if row["total"] else None,
+    }
+
+
+def series(qs, source, granularity, start, end):
+    """Per-bucket counts and sums between ``start`` and ``end``, empty buckets zero-filled."""
+    rows = (
+        qs.filter(source.since(start) & source.before(end))
+        .order_by()
+        .annotate(period=source.period(granularity))
+        .values("period")
+        .annotate(
+            total=source.count(),
+            won=source.count(Q(status__in=WON_STATUSES)),
+            estimated=Sum(source.estimated),
+            contracted=Sum(source.contracted),
+        )
+    )
+    found = {source.period_date(row["period"]): row for row in rows}
+
+    buckets = []
+    day = _bucket_start(timezone.localtime(start).date(), granularity)
+    last = timezone.localtime(end - datetime.timedelta(microseconds=1)).date()
+    while day <= last:
+        if len(buckets) >= MAX_BUCKETS:
+            raise ValidationError({"granularity": f"Range spans more than {MAX_BUCKETS} buckets; "
+                                                  "use a coarser granularity."})
+        row = found.get(day, {})
+        buckets.append({
+            "period": day.isoformat(),
+            "total": row.get("total") or 0,
+            "won": row.get("won") or 0,
+            "estimated": row.get("estimated") or 0,
+            "contracted": row.get("contracted") or 0,
+        })
+        day = _next_bucket(day, granularity)
+    return buckets
+
+
+def build_dashboard(qs, params):
+    """
+    KPI block + chart series for the (already filtered) quote queryset, or for the
+    rollup table when the parameters allow it (``?source=live|rollup`` overrides).
+    KPIs cover all matching quotes unless ?from/?to narrow them; the series always
+    covers the requested (or default) window.
+    """
+    granularity, start, end, (given_start, given_end) = parse_params(params)
+    if use_rollups(params):
+        source = RollupSource()
+        qs = QuoteDailyRollup.objects.all()
+        if params.get("status"):
+            qs = qs.filter(status__iexact=params["status"])
+    else:
+        source = LiveSource()
+    if given_start:
+        qs = qs.filter(source.since(given_start))
+    if given_end:
+        qs = qs.filter(source.before(given_end))
+
+    data = kpis(qs, source)
+    data["source"] = source.name
+    data["granularity"] = granularity
+    data["from"] = timezone.localtime(start).isoformat()
+    data["to"] = timezone.localtime(end).isoformat()
+    data["series"] = series(qs, source, granularity, start, end)
+    return data
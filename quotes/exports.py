@@ -0,0 +1,81 @@
+# quotes/exports.py
+"""
+Constant-memory quote exports.
+
+Rows are read with a server-side cursor (``.iterator(chunk_size=...)``) and
+written straight to an openpyxl write-only worksheet, which spools the sheet
+XML to disk. Column widths come from the header plus a small sample of leading
+rows, so nothing is revisited after it has been written.
+"""
+import tempfile
+from itertools import islice
+
+from django.http import FileResponse
+from django.utils import timezone
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_FIELDS = (
+    "id", "created_at", "full_name", "email", "phone",
+    "service", "description", "status", "estimated_value", "contracted_value",
+    "assigned_to", "tags", "source_page", "notes", "updated_at",
+)
+CHUNK_SIZE = 2000
+WIDTH_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 60
+
+
+def _cell(value):
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    if hasattr(value, "tzinfo") and value.tzinfo is not None:
+        # Excel has no timezone support: export local wall-clock time
+        return timezone.localtime(value).replace(tzinfo=None)
+    return value
+
+
+def export_rows(qs, fields=EXPORT_FIELDS, chunk_size=CHUNK_SIZE):
+    """Yield export-ready tuples without loading the queryset into memory."""
+    for row in qs.values_list(*fields).iterator(chunk_size=chunk_size):
+        yield tuple(_cell(v) for v in row)
+
+
+def write_xlsx(rows, fileobj, headers=EXPORT_FIELDS, sheet_name="Enquiries"):
+    """Write ``rows`` (an iterable of tuples) as a single-sheet workbook to ``fileobj``."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.freeze_panes = "A2"
+
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    for index, header in enumerate(headers, start=1):
+        longest = max((len(str(r[index - 1])) for r in sample if r[index - 1] is not None), default=0)
+        width = min(max(longest, len(header)) + 2, MAX_COLUMN_WIDTH)
+        ws.column_dimensions[get_column_letter(index)].width = width
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill("solid", fgColor="1F4E78")
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font, cell.fill = header_font, header_fill
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for row in sample:
+        ws.append(row)
+    for row in rows:
+        ws.append(row)
+    wb.save(fileobj)
+
+
+def xlsx_response(qs, filename):
+    """Stream the export of ``qs`` from a temporary file (freed when the response closes)."""
+    tmp = tempfile.TemporaryFile()
+    write_xlsx(export_rows(qs), tmp)
+    tmp.seek(0)
+    return FileResponse(tmp, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from quotes.rollups import aggregate_from_quotes, rebuild, stored_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the QuoteDailyRollup KPI table from quotes (or --verify it against them)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true",
+                            help="Only compare rollups with the quote table; exit non-zero on drift.")
+
+    def handle(self, *args, **options):
+        if not options["verify"]:
+            rows = rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup rows."))
+            return
+
+        expected, stored = aggregate_from_quotes(), stored_rollups()
+        drift = sorted(k for k in expected.keys() | stored.keys() if expected.get(k) != stored.get(k))
+        for key in drift[:50]:
+            day, status, service = key
+            self.stderr.write(f"{day} {status} {service or '-'}: "
+                              f"expected {expected.get(key)}, stored {stored.get(key)}")
+        if drift:
+            raise CommandError(f"{len(drift)} rollup buckets out of sync; run without --verify to rebuild.")
+        self.stdout.write(self.style.SUCCESS(f"Rollups match quotes ({len(expected)} buckets)."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from quotes.models import QuoteReport
+from quotes.reports import process_report, requeue_stale
+from utils.jobs import claim_next, run_worker
+
+
+class Command(BaseCommand):
+    help = "Render queued quote PDF reports (DB-backed queue, no broker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Exit when the queue is empty instead of polling.")
+        parser.add_argument("--sleep", type=float, default=2.0,
+                            help="Seconds between polls when idle (default: 2).")
+
+    def handle(self, *args, **options):
+        def poll():
+            # Expired leases are checked on every poll, so a dead worker's reports are
+            # picked up by whichever worker is still alive
+            stale = requeue_stale()
+            if stale:
+                self.stdout.write(f"[requeue] {stale} stale report(s)")
+            report = claim_next(QuoteReport.objects.all())
+            if report is None:
+                return False
+            self.stdout.write(f"[run] report #{report.pk}")
+            try:
+                process_report(report)
+            except Exception as exc:  # recorded on the report; keep the worker alive
+                self.stderr.write(f"[fail] report #{report.pk}: {exc}")
+            else:
+                self.stdout.write(f"[done] report #{report.pk}: {report.row_count} rows, {report.pages} pages")
+            return True
+
+        run_worker(poll, once=options["once"], sleep=options["sleep"])
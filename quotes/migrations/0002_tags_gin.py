@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:29
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quote',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='quote_tags_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
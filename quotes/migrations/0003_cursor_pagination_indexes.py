@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0002_tags_gin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['-created_at', '-id'], name='quote_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0003_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['status', 'created_at'], name='quote_status_created_idx'),
+        ),
+    ]
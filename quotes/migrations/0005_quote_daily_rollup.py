@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:39
+
+from django.db import migrations, models
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+
+def backfill_rollups(apps, schema_editor):
+    Quote = apps.get_model('quotes', 'Quote')
+    QuoteDailyRollup = apps.get_model('quotes', 'QuoteDailyRollup')
+    rows = (
+        Quote.objects.order_by()
+        .annotate(day=TruncDate('created_at', tzinfo=timezone.get_current_timezone()))
+        .values('day', 'status', 'service')
+        .annotate(n=Count('id'),
+                  est=Coalesce(Sum('estimated_value'), Value(0), output_field=models.DecimalField()),
+                  con=Coalesce(Sum('contracted_value'), Value(0), output_field=models.DecimalField()))
+    )
+    QuoteDailyRollup.objects.bulk_create(
+        QuoteDailyRollup(date=r['day'], status=r['status'], service=r['service'], count=r['n'],
+                         sum_estimated=r['est'], sum_contracted=r['con'])
+        for r in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0004_dashboard_status_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuoteDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('service', models.CharField(blank=True, max_length=120)),
+                ('count', models.IntegerField(default=0)),
+                ('sum_estimated', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sum_contracted', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'ordering': ['date', 'status', 'service'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'status', 'service'), name='quote_rollup_key')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0005_quote_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuoteReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('filters', models.JSONField(blank=True, default=dict)),
+                ('filters_hash', models.CharField(db_index=True, max_length=64)),
+                ('cache_key', models.CharField(db_index=True, max_length=64)),
+                ('file', models.FileField(blank=True, upload_to='reports/quotes/')),
+                ('row_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('pages', models.PositiveIntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
+
+from utils.jobs import JOB_STATUS_CHOICES, QUEUED
 
 
 class Quote(models.Model):
@@ -47,6 +50,73 @@ class Quote(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # QuoteFilter.tag only uses containment (@>), so the smaller path_ops GIN suffices
+            GinIndex(fields=["tags"], opclasses=["jsonb_path_ops"], name="quote_tags_gin"),
+            # Keyset (cursor) pagination
+            models.Index(fields=["-created_at", "-id"], name="quote_created_id_idx"),
+            # Dashboard: per-status conditional aggregates over created_at ranges
+            models.Index(fields=["status", "created_at"], name="quote_status_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.full_name} [{self.status}]"
+
+    # --- KPI rollups (quotes/rollups.py) ---
+    ROLLUP_FIELDS = ("created_at", "status", "service", "estimated_value", "contracted_value")
+
+    def rollup_state(self):
+        return tuple(getattr(self, f) for f in self.ROLLUP_FIELDS)
+
+    def save(self, *args, **kwargs):
+        # One transaction around pre_save and post_save: the rollup handlers lock the
+        # stored row before the write and move its buckets in the same commit
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+
+class QuoteDailyRollup(models.Model):
+    """
+    Per-day KPI totals (local calendar day x status x service), kept up to date
+    incrementally by quotes/rollups.py and rebuilt by `manage.py rebuild_quote_rollups`.
+    """
+    date = models.DateField()
+    status = models.CharField(max_length=20)
+    service = models.CharField(max_length=120, blank=True)
+    count = models.IntegerField(default=0)
+    sum_estimated = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sum_contracted = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["date", "status", "service"]
+        constraints = [
+            models.UniqueConstraint(fields=["date", "status", "service"], name="quote_rollup_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.status} {self.service or '-'}: {self.count}"
+
+
+class QuoteReport(models.Model):
+    """
+    A PDF report over a filtered set of quotes, rendered by `manage.py run_report_worker`.
+    Reports are reused while both the filters and the underlying data are unchanged.
+    """
+    status = models.CharField(max_length=20, choices=JOB_STATUS_CHOICES, default=QUEUED, db_index=True)
+    filters = models.JSONField(default=dict, blank=True)
+    # sha256 of the normalised filters, and of filters + data fingerprint (cache key)
+    filters_hash = models.CharField(max_length=64, db_index=True)
+    cache_key = models.CharField(max_length=64, db_index=True)
+    file = models.FileField(upload_to="reports/quotes/", blank=True)
+    row_count = models.PositiveIntegerField(null=True, blank=True)
+    pages = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Quote report {self.pk} [{self.status}]"
@@ -0,0 +1,301 @@
+# quotes/reports.py
+"""
+PDF report engine for quotes.
+
+Reports are drawn straight onto a reportlab canvas while rows stream from a
+server-side cursor: a KPI summary page, then as many table pages as needed,
+each with its own header and footer. Nothing caps the row count and no
+flowables are accumulated. Rendering runs in `manage.py run_report_worker`;
+finished files are reused for identical filters over unchanged data.
+"""
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+from django.core.files import File
+from django.db.models import Count, Max
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from utils.jobs import DONE, FAILED, QUEUED, RUNNING, keep_lease, requeue_expired
+from utils.search import RankedSearchFilter
+from .dashboard import STATUSES, LiveSource, kpis
+from .filters import QuoteFilter
+from .models import Quote, QuoteReport
+
+REPORT_VERSION = 1  # bump when the layout changes so cached files are not reused
+TITLE = "AR Construction – Enquiries report"
+CHUNK_SIZE = 2000
+INLINE_MAX_ROWS = 500  # export_pdf renders at most this many rows in-request; more are queued
+STALE_AFTER = datetime.timedelta(minutes=10)  # RUNNING reports whose lease stopped being refreshed
+LEASE_HEARTBEAT = 60  # seconds between lease refreshes while a report renders
+# ?search= over these, as on the quotes list (QuoteViewSet.search_fields)
+SEARCH_FIELDS = ("full_name", "email", "phone", "service", "description", "notes")
+SEARCH_PARAM = RankedSearchFilter.search_param
+REPORT_PARAMS = frozenset(QuoteFilter.base_filters) | {SEARCH_PARAM}  # what selects the rows
+
+# (header, values_list field, width in points, right-aligned)
+COLUMNS = [
+    ("ID", "id", 40, True),
+    ("Created", "created_at", 62, False),
+    ("Name", "full_name", 120, False),
+    ("Email", "email", 150, False),
+    ("Phone", "phone", 80, False),
+    ("Service", "service", 110, False),
+    ("Status", "status", 64, False),
+    ("Est.", "estimated_value", 72, True),
+    ("Contracted", "contracted_value", 72, True),
+]
+FONT, FONT_BOLD, FONT_SIZE = "Helvetica", "Helvetica-Bold", 8
+ROW_HEIGHT = 13
+MARGIN = 36
+HEADER_COLOR = "#1f4e78"
+ZEBRA_COLOR = "#f2f2f2"
+
+
+# --- Filters & cache keys ---
+def normalise_filters(data):
+    """
+    Validate QuoteFilter parameters (plus ``search``); returns a sorted
+    {name: value} of the non-empty ones.
+    """
+    unknown = sorted(set(data) - REPORT_PARAMS)
+    if unknown:
+        raise ValidationError({"filters": f"Unknown filter(s): {', '.join(unknown)}. "
+                                          f"Allowed: {', '.join(sorted(REPORT_PARAMS))}."})
+    filters = {key: str(value) for key, value in sorted(data.items()) if value not in (None, "")}
+    filterset = QuoteFilter(data={k: v for k, v in filters.items() if k != SEARCH_PARAM},
+                            queryset=Quote.objects.all())
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    return filters
+
+
+def filtered_quotes(filters):
+    """The quotes ``filters`` select, exactly as the quotes list filters and searches them."""
+    filters = dict(filters)
+    term = filters.pop(SEARCH_PARAM, "")
+    qs = QuoteFilter(data=filters, queryset=Quote.objects.all()).qs
+    if term:
+        qs = RankedSearchFilter().filter_queryset(
+            SimpleNamespace(query_params={SEARCH_PARAM: term}), qs, SimpleNamespace(search_fields=SEARCH_FIELDS))
+    return qs
+
+
+def _sha(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def report_keys(filters):
+    """
+    (filters_hash, cache_key); the cache key changes whenever matching quotes change,
+    and daily: the "last 7 / 30 days" KPIs are relative to the render date.
+    """
+    state = filtered_quotes(filters).order_by().aggregate(
+        last=Max("updated_at"), count=Count("id"), max_id=Max("id"))
+    filters_hash = _sha([REPORT_VERSION, filters])
+    return filters_hash, _sha([filters_hash, state, timezone.localdate()])
+
+
+def request_report(filters):
+    """Reuse a queued/running/finished report for the same filters and data, else queue one."""
+    filters_hash, cache_key = report_keys(filters)
+    existing = (QuoteReport.objects.filter(cache_key=cache_key, status__in=[QUEUED, RUNNING, DONE])
+                .order_by("-created_at").first())
+    if existing and (existing.status != DONE or existing.file.storage.exists(existing.file.name)):
+        return existing, False
+    return QuoteReport.objects.create(filters=filters, filters_hash=filters_hash, cache_key=cache_key), True
+
+
+# --- Rendering ---
+class _ReportCanvas:
+    """Page bookkeeping around a reportlab canvas: header, footer, table rows."""
+
+    def __init__(self, fileobj, subtitle, generated):
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from reportlab.pdfgen.canvas import Canvas
+
+        self.width, self.height = landscape(A4)
+        self.canvas = Canvas(fileobj, pagesize=(self.width, self.height), pageCompression=1)
+        self.canvas.setTitle(TITLE)
+        self.string_width = stringWidth
+        self.subtitle, self.generated = subtitle, generated
+        self.page = 0
+        self.y = None
+
+    def fit(self, text, width, font=FONT):
+        """Truncate ``text`` with an ellipsis to fit ``width`` points."""
+        text = " ".join(str(text).split())
+        if self.string_width(text, font, FONT_SIZE) <= width:
+            return text
+        while text and self.string_width(text + "…", font, FONT_SIZE) > width:
+            text = text[:-1]
+        return text + "…"
+
+    def start_page(self):
+        from reportlab.lib import colors
+
+        if self.page:
+            self.canvas.showPage()
+        self.page += 1
+        c = self.canvas
+        top = self.height - MARGIN
+        c.setFont(FONT_BOLD, 14)
+        c.drawString(MARGIN, top - 12, TITLE)
+        c.setFont(FONT, 8)
+        c.setFillColor(colors.grey)
+        c.drawString(MARGIN, top - 26, self.fit(self.subtitle, self.width / 2))
+        c.drawRightString(self.width - MARGIN, top - 12, f"Generated {self.generated:%Y-%m-%d %H:%M}")
+        c.drawString(MARGIN, MARGIN - 14, "AR Construction · confidential")
+        c.drawRightString(self.width - MARGIN, MARGIN - 14, f"Page {self.page}")
+        c.setFillColor(colors.black)
+        self.y = top - 44
+
+    def table_header(self):
+        from reportlab.lib import colors
+
+        c = self.canvas
+        c.setFillColor(colors.HexColor(HEADER_COLOR))
+        c.rect(MARGIN, self.y - 4, self.width - 2 * MARGIN, ROW_HEIGHT, stroke=0, fill=1)
+        c.setFillColor(colors.white)
+        c.setFont(FONT_BOLD, FONT_SIZE)
+        self._cells([h for h, _, _, _ in COLUMNS], bold=True)
+        c.setFillColor(colors.black)
+        c.setFont(FONT, FONT_SIZE)
+        self.y -= ROW_HEIGHT
+
+    def _cells(self, values, bold=False):
+        x = MARGIN
+        for value, (_, _, width, right) in zip(values, COLUMNS):
+            text = self.fit(value, width - 6, FONT_BOLD if bold else FONT)
+            if right:
+                self.canvas.drawRightString(x + width - 3, self.y, text)
+            else:
+                self.canvas.drawString(x + 3, self.y, text)
+            x += width
+
+    def row(self, values, index):
+        from reportlab.lib import colors
+
+        if self.y < MARGIN + ROW_HEIGHT:
+            self.start_page()
+            self.table_header()
+        if index % 2:
+            self.canvas.setFillColor(colors.HexColor(ZEBRA_COLOR))
+            self.canvas.rect(MARGIN, self.y - 4, self.width - 2 * MARGIN, ROW_HEIGHT, stroke=0, fill=1)
+            self.canvas.setFillColor(colors.black)
+        self._cells(values)
+        self.y -= ROW_HEIGHT
+
+    def kpi_page(self, summary):
+        c = self.canvas
+        self.start_page()
+        c.setFont(FONT_BOLD, 11)
+        c.drawString(MARGIN, self.y, "Summary")
+        self.y -= 20
+        conversion = summary["conversion_rate"]
+        lines = [
+            ("Enquiries", f"{summary['total']:,}"),
+            ("Last 7 / 30 days", f"{summary['last_7_days']:,} / {summary['last_30_days']:,}"),
+            ("Estimated value", _money(summary["sum_estimated"])),
+            ("Contracted value", _money(summary["sum_contracted"])),
+            ("Conversion rate", f"{conversion:.1%}" if conversion is not None else "–"),
+        ]
+        for label, value in lines:
+            c.setFont(FONT, 10)
+            c.drawString(MARGIN, self.y, label)
+            c.setFont(FONT_BOLD, 10)
+            c.drawString(MARGIN + 160, self.y, value)
+            self.y -= 16
+
+        self.y -= 12
+        c.setFont(FONT_BOLD, 11)
+        c.drawString(MARGIN, self.y, "By status")
+        self.y -= 18
+        c.setFont(FONT_BOLD, 9)
+        for x, label in ((MARGIN, "Status"), (MARGIN + 160, "Count"), (MARGIN + 240, "Pipeline (est.)")):
+            c.drawString(x, self.y, label)
+        self.y -= 14
+        c.setFont(FONT, 9)
+        for status in STATUSES:
+            c.drawString(MARGIN, self.y, dict(Quote.STATUS_CHOICES)[status])
+            c.drawString(MARGIN + 160, self.y, f"{summary['by_status'][status]:,}")
+            c.drawString(MARGIN + 240, self.y, _money(summary["pipeline"][status]))
+            self.y -= 13
+
+    def save(self):
+        self.canvas.save()
+
+
+def _money(value):
+    return f"{value or 0:,.2f}"
+
+
+def _describe(filters):
+    if not filters:
+        return "All enquiries"
+    return "Filters: " + ", ".join(f"{k}={v}" for k, v in filters.items())
+
+
+def render_pdf(qs, fileobj, filters=None):
+    """Render the KPI page and every row of ``qs``; returns (row_count, page_count)."""
+    doc = _ReportCanvas(fileobj, _describe(filters or {}), timezone.localtime())
+    doc.kpi_page(kpis(qs, LiveSource()))
+    doc.start_page()
+    doc.table_header()
+
+    count = 0
+    fields = [field for _, field, _, _ in COLUMNS]
+    for row in qs.order_by("-created_at", "-id").values_list(*fields).iterator(chunk_size=CHUNK_SIZE):
+        record = dict(zip(fields, row))
+        record["created_at"] = f"{timezone.localtime(record['created_at']):%Y-%m-%d}"
+        record["estimated_value"] = _money(record["estimated_value"]) if record["estimated_value"] is not None else ""
+        record["contracted_value"] = _money(record["contracted_value"]) if record["contracted_value"] is not None else ""
+        doc.row([record[f] for f in fields], count)
+        count += 1
+    if not count:
+        doc.canvas.drawString(MARGIN + 3, doc.y, "No enquiries match these filters.")
+    doc.save()
+    return count, doc.page
+
+
+def requeue_stale():
+    """Hand reports claimed by a worker that died mid-render back to the queue."""
+    return requeue_expired(QuoteReport.objects.all(), STALE_AFTER)
+
+
+def process_report(report):
+    """Render a claimed (RUNNING) report to storage and record the outcome."""
+    try:
+        with keep_lease(report, LEASE_HEARTBEAT), tempfile.TemporaryFile() as tmp:
+            rows, pages = render_pdf(filtered_quotes(report.filters), tmp, report.filters)
+            tmp.seek(0)
+            stamp = timezone.localtime().strftime("%Y%m%d-%H%M%S")
+            report.file.save(f"enquiries-{stamp}-{report.pk}.pdf", File(tmp), save=False)
+    except Exception as exc:
+        report.status, report.error, report.finished_at = FAILED, str(exc), timezone.now()
+        report.save(update_fields=["status", "error", "finished_at"])
+        raise
+
+    report.status, report.row_count, report.pages = DONE, rows, pages
+    report.finished_at = timezone.now()
+    report.save(update_fields=["status", "file", "row_count", "pages", "finished_at"])
+    prune_superseded(report)
+
+
+def prune_superseded(report):
+    """Drop older finished reports for the same filters (their data has since changed)."""
+    older = QuoteReport.objects.filter(
+        filters_hash=report.filters_hash, status__in=[DONE, FAILED], created_at__lt=report.created_at)
+    for old in older:
+        if old.file:
+            old.file.delete(save=False)
+        old.delete()
+
+
+def report_filename(report):
+    return os.path.basename(report.file.name) if report.file else f"enquiries-{report.pk}.pdf"
@@ -0,0 +1,140 @@
+# quotes/rollups.py
+"""
+Incremental maintenance of QuoteDailyRollup.
+
+Every Quote save/delete turns into signed deltas on (day, status, service)
+buckets: a status change moves the row out of its old bucket and into the new
+one. The bucket a row is leaving is read from the stored row under SELECT ...
+FOR UPDATE in the save's (or delete's) own transaction, so concurrent edits of
+one quote are serialised and each moves it from where the previous one left
+it. Deltas are applied with INSERT ... ON CONFLICT upserts, so concurrent
+writers never lose increments. Queryset.update()/bulk_create() bypass signals;
+run `manage.py rebuild_quote_rollups` after such bulk edits.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Quote, QuoteDailyRollup
+
+ZERO = Decimal("0")
+
+
+def bucket_key(state):
+    """Quote.rollup_state() -> ((date, status, service), (count, estimated, contracted))."""
+    created_at, status, service, estimated, contracted = state
+    day = timezone.localdate(created_at)
+    return (day, status, service or ""), (1, estimated or ZERO, contracted or ZERO)
+
+
+def apply_deltas(deltas):
+    """deltas: {(date, status, service): [count, estimated, contracted]} added atomically."""
+    rows = [(key, d) for key, d in deltas.items() if any(d)]
+    if not rows:
+        return
+    table = connection.ops.quote_name(QuoteDailyRollup._meta.db_table)
+    sql = (
+        f"INSERT INTO {table} (date, status, service, count, sum_estimated, sum_contracted) "
+        "VALUES (%s, %s, %s, %s, %s, %s) "
+        "ON CONFLICT (date, status, service) DO UPDATE SET "
+        f"count = {table}.count + EXCLUDED.count, "
+        f"sum_estimated = {table}.sum_estimated + EXCLUDED.sum_estimated, "
+        f"sum_contracted = {table}.sum_contracted + EXCLUDED.sum_contracted"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [(*key, *d) for key, d in rows])
+
+
+def _moves(old_state, new_state):
+    deltas = defaultdict(lambda: [0, ZERO, ZERO])
+    for state, sign in ((old_state, -1), (new_state, 1)):
+        if state is None:
+            continue
+        key, values = bucket_key(state)
+        for i, value in enumerate(values):
+            deltas[key][i] += sign * value
+    return deltas
+
+
+def _lock_stored_state(sender, instance, using):
+    """
+    What the rollups count this row as: its stored values, locked until the
+    surrounding transaction (Quote.save() or the delete's) commits.
+    """
+    if instance.pk is None:
+        return None
+    stored = (sender._default_manager.db_manager(using).select_for_update()
+              .filter(pk=instance.pk).values_list(*sender.ROLLUP_FIELDS).first())
+    return tuple(stored) if stored else None
+
+
+@receiver(pre_save, sender=Quote, dispatch_uid="quote_rollup_pre_save")
+def _remember_old_state(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    instance._rollup_state = _lock_stored_state(sender, instance, using)
+
+
+@receiver(post_save, sender=Quote, dispatch_uid="quote_rollup_post_save")
+def _quote_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = None if created else instance.__dict__.pop("_rollup_state", None)
+    new = instance.rollup_state()
+    if old != new:
+        with transaction.atomic():
+            apply_deltas(_moves(old, new))
+
+
+@receiver(pre_delete, sender=Quote, dispatch_uid="quote_rollup_pre_delete")
+def _remember_deleted_state(sender, instance, using=None, **kwargs):
+    # Deletes (single or bulk) run their signals inside the collector's transaction
+    instance._rollup_state = _lock_stored_state(sender, instance, using)
+
+
+@receiver(post_delete, sender=Quote, dispatch_uid="quote_rollup_post_delete")
+def _quote_deleted(sender, instance, **kwargs):
+    state = instance.__dict__.pop("_rollup_state", None)
+    if state is not None:
+        apply_deltas(_moves(state, None))
+
+
+# --- Backfill / verification ---
+def aggregate_from_quotes():
+    """The rollup rows recomputed from the Quote table: {(date, status, service): (count, est, con)}."""
+    rows = (
+        Quote.objects.order_by()
+        .annotate(day=TruncDate("created_at", tzinfo=timezone.get_current_timezone()))
+        .values("day", "status", "service")
+        .annotate(
+            n=Count("id"),
+            est=Coalesce(Sum("estimated_value"), Value(ZERO)),
+            con=Coalesce(Sum("contracted_value"), Value(ZERO)),
+        )
+    )
+    return {(r["day"], r["status"], r["service"]): (r["n"], r["est"], r["con"]) for r in rows}
+
+
+def stored_rollups():
+    return {
+        (r.date, r.status, r.service): (r.count, r.sum_estimated, r.sum_contracted)
+        for r in QuoteDailyRollup.objects.all() if r.count or r.sum_estimated or r.sum_contracted
+    }
+
+
+@transaction.atomic
+def rebuild():
+    """Replace every rollup row with freshly aggregated totals. Returns the row count."""
+    expected = aggregate_from_quotes()
+    QuoteDailyRollup.objects.all().delete()
+    QuoteDailyRollup.objects.bulk_create(
+        QuoteDailyRollup(date=d, status=s, service=svc, count=n, sum_estimated=est, sum_contracted=con)
+        for (d, s, svc), (n, est, con) in expected.items()
+    )
+    return len(expected)
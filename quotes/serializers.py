@@ -1,8 +1,11 @@
 from rest_framework import serializers
-from .models import Quote
+from django.urls import reverse
+from utils.jobs import DONE
+from utils.sparse import DynamicFieldsMixin
+from .models import Quote, QuoteReport
 
 
-class QuoteSerializer(serializers.ModelSerializer):
+class QuoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Quote
         fields = [
@@ -18,3 +21,20 @@ class QuoteSerializer(serializers.ModelSerializer):
         # If setting status to 'won' but contracted_value missing, it’s fine for now,
         # but you can enforce rules here if you want stricter workflows.
         return attrs
+
+
+class QuoteReportSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+    sparse_field_columns = {"download_url": ("status",)}
+
+    class Meta:
+        model = QuoteReport
+        fields = ["id", "status", "filters", "row_count", "pages", "error",
+                  "created_at", "started_at", "finished_at", "download_url"]
+
+    def get_download_url(self, obj):
+        if obj.status != DONE:
+            return None
+        url = reverse("quotes-report-download", kwargs={"report_id": obj.pk})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
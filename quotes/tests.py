@@ -1,3 +1,234 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from utils.jobs import QUEUED, RUNNING
+from utils.testing import NO_CACHE
+from .models import Quote, QuoteDailyRollup, QuoteReport
+from .reports import STALE_AFTER, filtered_quotes, report_keys, requeue_stale
+from .rollups import aggregate_from_quotes, stored_rollups
+
+
+class QuoteDetailTests(TestCase):
+    def setUp(self):
+        self.staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+        self.client.force_login(self.staff)
+
+    def test_malformed_pk_is_404_not_500(self):
+        response = self.client.get(reverse("quotes-detail", args=["abc"]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CACHES=NO_CACHE)
+class QuoteQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+        for n in range(20):
+            Quote.objects.create(full_name=f"Client {n}", email=f"c{n}@example.com", service="Kitchens")
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def test_list(self):
+        with self.assertNumQueries(5):  # session, user, ETag aggregate, count, rows
+            response = self.client.get(reverse("quotes-list"))
+        self.assertEqual(response.json()["count"], 20)
+
+
+@override_settings(CACHES=NO_CACHE)
+class QuoteReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+        Quote.objects.bulk_create(
+            Quote(full_name=f"Client {n}", email=f"c{n}@example.com", service="Kitchens") for n in range(4))
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def test_report_body_must_be_an_object(self):
+        response = self.client.post(reverse("quotes-create-report"), ["status", "new"], content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(QuoteReport.objects.exists())
+
+    def test_report_cache_key_changes_daily(self):
+        today = report_keys({"service": "kitchens"})
+        with mock.patch("django.utils.timezone.now", return_value=timezone.now() + timedelta(days=1)):
+            tomorrow = report_keys({"service": "kitchens"})
+        self.assertEqual(today[0], tomorrow[0])  # same filters
+        self.assertNotEqual(today[1], tomorrow[1])  # KPIs relative to a different day
+
+    def test_small_export_pdf_renders_in_request(self):
+        response = self.client.get(reverse("quotes-export-pdf"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+
+    @mock.patch("quotes.views.INLINE_MAX_ROWS", 3)
+    def test_large_export_pdf_is_queued(self):
+        response = self.client.get(reverse("quotes-export-pdf"), {"service": "kitchens"})
+        self.assertEqual(response.status_code, 202)
+        report = QuoteReport.objects.get()
+        self.assertEqual(report.filters, {"service": "kitchens"})
+        self.assertEqual(response["Location"], reverse("quotes-report-status", args=[report.pk]))
+
+    @mock.patch("quotes.views.INLINE_MAX_ROWS", 0)
+    def test_queued_export_pdf_keeps_search_and_drops_list_params(self):
+        params = {"service": "kitchens", "search": "c1@example", "ordering": "-estimated_value", "page": "2"}
+        response = self.client.get(reverse("quotes-export-pdf"), params)
+        self.assertEqual(response.status_code, 202)
+        report = QuoteReport.objects.get()
+        self.assertEqual(report.filters, {"search": "c1@example", "service": "kitchens"})
+        # The queued report selects the same rows as the list does
+        listed = self.client.get(reverse("quotes-list"), {"service": "kitchens", "search": "c1@example"})
+        self.assertEqual(filtered_quotes(report.filters).count(), listed.json()["count"])
+        self.assertEqual(filtered_quotes(report.filters).get().email, "c1@example.com")
+
+    def test_stale_running_report_is_requeued(self):
+        now = timezone.now()
+        stale = QuoteReport.objects.create(status=RUNNING, started_at=now - STALE_AFTER - timedelta(minutes=1))
+        live = QuoteReport.objects.create(status=RUNNING, started_at=now - timedelta(minutes=1))
+        self.assertEqual(requeue_stale(), 1)
+        stale.refresh_from_db()
+        live.refresh_from_db()
+        self.assertEqual((stale.status, live.status), (QUEUED, RUNNING))
+
+
+class QuoteRollupTests(TestCase):
+    def setUp(self):
+        self.quote = Quote.objects.create(full_name="Ann", email="ann@example.com", service="Kitchens",
+                                          estimated_value=100)
+        Quote.objects.create(full_name="Bob", email="bob@example.com", service="Kitchens", estimated_value=50)
+
+    def assertInSync(self):
+        self.assertEqual(stored_rollups(), aggregate_from_quotes())
+        call_command("rebuild_quote_rollups", verify=True, stdout=mock.Mock())
+
+    def bucket(self, status, day=None):
+        return stored_rollups().get((day or timezone.localdate(), status, "Kitchens"))
+
+    def test_status_moves(self):
+        self.quote.status, self.quote.contracted_value = "won", 90
+        self.quote.save()
+        self.assertEqual(self.bucket("new")[:2], (1, 50))
+        self.assertEqual(self.bucket("won"), (1, 100, 90))
+        self.assertInSync()
+
+    def test_date_moves(self):
+        last_week = timezone.now() - timedelta(days=7)
+        self.quote.created_at = last_week
+        self.quote.save()
+        self.assertEqual(self.bucket("new")[:2], (1, 50))
+        self.assertEqual(self.bucket("new", timezone.localdate(last_week))[:2], (1, 100))
+        self.assertInSync()
+
+    def test_stale_copies_move_from_the_stored_bucket(self):
+        # Two editors loaded the same row; the second save must not subtract from "new" again
+        first, second = Quote.objects.get(pk=self.quote.pk), Quote.objects.get(pk=self.quote.pk)
+        first.status = "contacted"
+        first.save()
+        second.status = "lost"
+        second.save()
+        self.assertIsNone(self.bucket("contacted"))
+        self.assertEqual(self.bucket("lost")[:2], (1, 100))
+        self.assertInSync()
+
+    def test_delete(self):
+        self.quote.delete()
+        Quote.objects.filter(full_name="Bob").delete()  # queryset deletes send the signals too
+        self.assertEqual(stored_rollups(), {})
+        self.assertInSync()
+
+    def test_verify_reports_drift_and_rebuild_repairs_it(self):
+        QuoteDailyRollup.objects.update(count=5)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_quote_rollups", verify=True, stdout=mock.Mock(), stderr=mock.Mock())
+        call_command("rebuild_quote_rollups", stdout=mock.Mock())
+        self.assertInSync()
+
+    def test_admin_cannot_delete_rollup_rows(self):
+        admin = get_user_model().objects.create_superuser("admin", password="x")
+        self.client.force_login(admin)
+        row = QuoteDailyRollup.objects.first()
+        response = self.client.post(reverse("admin:quotes_quotedailyrollup_delete", args=[row.pk]), {"post": "yes"})
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(QuoteDailyRollup.objects.filter(pk=row.pk).exists())
+
+
+@override_settings(CACHES=NO_CACHE)
+class QuoteDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+        quotes = [
+            ("2025-03-03 10:00", "new", 100, None),
+            ("2025-03-05 09:00", "won", 200, 180),
+            ("2025-03-12 16:00", "lost", 50, None),
+            ("2025-04-01 12:00", "contracted", 300, 250),
+            ("2025-06-01 00:30", "new", 10, None),  # 31 May in UTC: must land in June locally
+        ]
+        for n, (created, status, estimated, contracted) in enumerate(quotes):
+            quote = Quote.objects.create(full_name=f"Client {n}", email=f"c{n}@example.com", service="Kitchens",
+                                         status=status, estimated_value=estimated, contracted_value=contracted)
+            quote.created_at = timezone.make_aware(datetime.fromisoformat(created))
+            quote.save()  # moves the quote's rollup bucket too
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def dashboard(self, **params):
+        response = self.client.get(reverse("quotes-dashboard"), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def buckets(self, **params):
+        return [(bucket["period"], bucket["total"]) for bucket in self.dashboard(**params)["series"]]
+
+    def test_day_buckets_are_zero_filled(self):
+        self.assertEqual(self.buckets(granularity="day", **{"from": "2025-03-03", "to": "2025-03-06"}),
+                         [("2025-03-03", 1), ("2025-03-04", 0), ("2025-03-05", 1), ("2025-03-06", 0)])
+
+    def test_week_buckets_start_on_monday(self):
+        self.assertEqual(self.buckets(granularity="week", **{"from": "2025-03-05", "to": "2025-03-16"}),
+                         [("2025-03-03", 1), ("2025-03-10", 1)])
+
+    def test_month_buckets_use_local_time(self):
+        self.assertEqual(self.buckets(granularity="month", **{"from": "2025-03-01", "to": "2025-06-30"}),
+                         [("2025-03-01", 3), ("2025-04-01", 1), ("2025-05-01", 0), ("2025-06-01", 1)])
+
+    def test_kpis(self):
+        data = self.dashboard(**{"from": "2025-03-01", "to": "2025-04-30"})
+        self.assertEqual(data["source"], "rollup")
+        self.assertEqual(data["total"], 4)
+        self.assertEqual(data["by_status"], {"new": 1, "contacted": 0, "contracted": 1, "won": 1, "lost": 1})
+        self.assertEqual(data["conversion_rate"], 0.5)  # contracted + won
+        self.assertEqual(float(data["sum_estimated"]), 650)
+        self.assertEqual(float(data["sum_contracted"]), 430)
+        self.assertEqual(float(data["pipeline"]["won"]), 200)
+
+    def test_rollups_match_live_quotes(self):
+        for params in ({"granularity": "day", "from": "2025-03-01", "to": "2025-03-31"},
+                       {"granularity": "week", "from": "2025-02-20", "to": "2025-04-10", "status": "WON"},
+                       {"granularity": "month", "from": "2025-01-01", "to": "2025-12-31"},
+                       {"granularity": "month", "to": "2025-06-30"}):
+            with self.subTest(**params):
+                rollup, live = self.dashboard(**params, source="rollup"), self.dashboard(**params, source="live")
+                self.assertEqual((rollup.pop("source"), live.pop("source")), ("rollup", "live"))
+                self.assertEqual(rollup, live)
+
+    def test_finer_filters_fall_back_to_live_quotes(self):
+        self.assertEqual(self.dashboard(service="Kitchens")["source"], "live")
+        self.assertEqual(self.dashboard(granularity="month", **{"from": "2025-03-01T12:00:00"})["source"], "live")
+
+    def test_two_queries(self):
+        with self.assertNumQueries(4):  # session, user, KPIs, series
+            self.client.get(reverse("quotes-dashboard"), {"granularity": "week"})
+
+    def test_staff_only(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("quotes-dashboard")).status_code, 403)
@@ -1,11 +1,27 @@
-from io import BytesIO
-from django.http import HttpResponse
+import tempfile
+from collections.abc import Mapping
+
+from django.db import transaction
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from rest_framework import viewsets, permissions, decorators, response, status, parsers
-from django.db.models import Count, Sum
-import pandas as pd
-from .models import Quote
-from .serializers import QuoteSerializer
+from rest_framework.exceptions import ValidationError
+from .dashboard import build_dashboard
+from .exports import EXPORT_FIELDS, xlsx_response
+from .models import Quote, QuoteReport
+from .reports import (INLINE_MAX_ROWS, REPORT_PARAMS, SEARCH_FIELDS, normalise_filters, render_pdf,
+                      report_filename, request_report)
+from .serializers import QuoteReportSerializer, QuoteSerializer
 from .filters import QuoteFilter
+from contact.notifications import notify_quote
+from utils.conditional import ConditionalGetMixin
+from utils.jobs import DONE
+from utils.pagination import KeysetOrPageNumberPagination
+from utils.spam import SpamCheckMixin
+from utils.sparse import SparseFieldsMixin
+from utils.streaming import streaming_export
+from utils.throttling import EmailTokenBucketThrottle, IPTokenBucketThrottle
 
 
 class IsAdminOrCreateOnly(permissions.BasePermission):
@@ -17,17 +33,22 @@ class IsAdminOrCreateOnly(permissions.BasePermission):
         return bool(request.user and request.user.is_staff)
 
 
-class QuoteViewSet(viewsets.ModelViewSet):
+class QuoteViewSet(SpamCheckMixin, ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Quote.objects.all()
     serializer_class = QuoteSerializer
     permission_classes = [IsAdminOrCreateOnly]
     filterset_class = QuoteFilter
-    search_fields = ["full_name", "email",
-                     "phone", "service", "description", "notes"]
+    search_fields = SEARCH_FIELDS
     ordering_fields = ["created_at", "updated_at",
                        "estimated_value", "contracted_value"]
     parser_classes = [parsers.JSONParser, parsers.FormParser,
                       parsers.MultiPartParser]  # allow attachment uploads
+    pagination_class = KeysetOrPageNumberPagination
+    cursor_ordering = ("-created_at", "-id")
+    # Anonymous POSTs only; staff and reads are exempt (utils/throttling.py)
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = "quote"
+    spam_text_fields = ("service", "description")
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -38,103 +59,95 @@ class QuoteViewSet(viewsets.ModelViewSet):
             return Quote.objects.none()  # block listing to anonymous
         return qs
 
+    def perform_create(self, serializer):
+        self.check_spam(serializer)
+        with transaction.atomic():
+            quote = serializer.save()
+            notify_quote(quote)
+
     @decorators.action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser])
     def dashboard(self, request):
         """
-        Quick KPIs:
-        - total, by status
-        - sum estimated_value, sum contracted_value
+        KPIs + chart series in two queries (see quotes/dashboard.py):
+        - total, by status, pipeline (estimated value) per status
+        - sum estimated_value, sum contracted_value, conversion rate
         - last 7/30 days counts
+        - ?granularity=day|week|month buckets between ?from= and ?to=
         """
         qs = self.filter_queryset(self.get_queryset())
-        kpi = {
-            "total": qs.count(),
-            "by_status": dict(qs.values_list("status").annotate(c=Count("id"))),
-            "sum_estimated": qs.aggregate(s=Sum("estimated_value"))["s"] or 0,
-            "sum_contracted": qs.aggregate(s=Sum("contracted_value"))["s"] or 0,
-        }
-        return response.Response(kpi)
+        return response.Response(build_dashboard(qs, request.query_params))
 
     @decorators.action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser])
     def export_excel(self, request):
         """
-        Exports filtered queryset to a styled Excel (XLSX).
+        Exports filtered queryset to a styled Excel (XLSX), streamed with constant memory.
         """
         qs = self.filter_queryset(self.get_queryset()).order_by("-created_at")
-        rows = list(qs.values(
-            "id", "created_at", "full_name", "email", "phone",
-            "service", "description", "status", "estimated_value", "contracted_value",
-            "assigned_to", "tags", "source_page", "notes", "updated_at"
-        ))
-        df = pd.DataFrame(rows)
-
-        # Create Excel in-memory
-        with BytesIO() as bio:
-            with pd.ExcelWriter(bio, engine="openpyxl") as writer:
-                df.to_excel(writer, index=False, sheet_name="Enquiries")
-                ws = writer.book["Enquiries"]
-                # Freeze header & adjust column widths
-                ws.freeze_panes = "A2"
-                for col in ws.columns:
-                    max_len = max(
-                        (len(str(c.value)) if c.value is not None else 0 for c in col), default=10)
-                    ws.column_dimensions[col[0].column_letter].width = min(
-                        max_len + 2, 60)
-            data = bio.getvalue()
-
-        resp = HttpResponse(
-            data,
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        resp["Content-Disposition"] = 'attachment; filename="arconstruction-enquiries.xlsx"'
-        return resp
+        return xlsx_response(qs, "arconstruction-enquiries.xlsx")
+
+    @decorators.action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def export_csv(self, request):
+        """Streams the filtered queryset as CSV (?gzip=1 to compress)."""
+        qs = self.filter_queryset(self.get_queryset()).order_by("-created_at")
+        return streaming_export(request, qs, EXPORT_FIELDS, "csv", "arconstruction-enquiries")
+
+    @decorators.action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def export_ndjson(self, request):
+        """Streams the filtered queryset as newline-delimited JSON (?gzip=1 to compress)."""
+        qs = self.filter_queryset(self.get_queryset()).order_by("-created_at")
+        return streaming_export(request, qs, EXPORT_FIELDS, "ndjson", "arconstruction-enquiries")
 
     @decorators.action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser])
     def export_pdf(self, request):
         """
-        Minimal PDF export (summary table) using reportlab.
+        PDF export (KPI summary + every matching row). Up to INLINE_MAX_ROWS rows are
+        rendered in-request; larger selections are queued as a background report
+        (202 with its status, as POST reports/ would) so no web worker renders them.
+        """
+        qs = self.filter_queryset(self.get_queryset())
+        # Rows are always ordered by date and never paginated: only filters and search matter
+        filters = {k: v for k, v in request.query_params.items() if k in REPORT_PARAMS and v}
+        if qs.count() > INLINE_MAX_ROWS:
+            return self._queue_report(request, filters)
+        tmp = tempfile.TemporaryFile()
+        render_pdf(qs, tmp, filters)
+        tmp.seek(0)
+        return FileResponse(tmp, as_attachment=True, filename="arconstruction-enquiries.pdf",
+                            content_type="application/pdf")
+
+    # --- Background reports ---
+    @decorators.action(detail=False, methods=["post"], permission_classes=[permissions.IsAdminUser],
+                       url_path="reports")
+    def create_report(self, request):
+        """
+        Queue a PDF report for QuoteFilter params and ?search= (JSON body or query string).
+        Same filters over unchanged data return the existing report (200) instead of a new one (202).
         """
-        from reportlab.lib.pagesizes import A4, landscape
-        from reportlab.lib import colors
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet
-
-        qs = self.filter_queryset(self.get_queryset()).order_by(
-            "-created_at")[:200]  # cap for brevity
-        rows = [["ID", "Created", "Name", "Email", "Phone",
-                 "Service", "Status", "Est.", "Contracted"]]
-        for q in qs:
-            rows.append([
-                q.id, q.created_at.strftime(
-                    "%Y-%m-%d"), q.full_name, q.email, q.phone,
-                q.service, q.status, str(q.estimated_value or ""), str(
-                    q.contracted_value or "")
-            ])
-
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=landscape(
-            A4), title="ARConstruction Enquiries")
-        styles = getSampleStyleSheet()
-        elements = [
-            Paragraph("AR Construction – Enquiries Export", styles["Title"]),
-            Spacer(1, 12)
-        ]
-        table = Table(rows, repeatRows=1)
-        table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f4e78")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1),
-             [colors.whitesmoke, colors.lightgrey]),
-        ]))
-        elements.append(table)
-        doc.build(elements)
-
-        pdf = buffer.getvalue()
-        buffer.close()
-
-        resp = HttpResponse(pdf, content_type="application/pdf")
-        resp["Content-Disposition"] = 'attachment; filename="arconstruction-enquiries.pdf"'
+        if not isinstance(request.data, Mapping):
+            raise ValidationError({"filters": "Expected an object of QuoteFilter parameters."})
+        data = request.query_params.dict()
+        data.update(request.data.dict() if hasattr(request.data, "dict") else request.data)
+        return self._queue_report(request, data)
+
+    def _queue_report(self, request, data):
+        report, created = request_report(normalise_filters(data))
+        return response.Response(QuoteReportSerializer(report, context={"request": request}).data,
+                                 status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+                                 headers={"Location": reverse("quotes-report-status", args=[report.pk])})
+
+    @decorators.action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser],
+                       url_path=r"reports/(?P<report_id>[0-9]+)")
+    def report_status(self, request, report_id=None):
+        report = get_object_or_404(QuoteReport, pk=report_id)
+        return response.Response(QuoteReportSerializer(report, context={"request": request}).data)
+
+    @decorators.action(detail=False, methods=["get"], permission_classes=[permissions.IsAdminUser],
+                       url_path=r"reports/(?P<report_id>[0-9]+)/download", url_name="report-download")
+    def report_download(self, request, report_id=None):
+        report = get_object_or_404(QuoteReport, pk=report_id)
+        if report.status != DONE or not report.file:
+            return response.Response({"detail": f"Report is {report.status}."}, status=status.HTTP_409_CONFLICT)
+        resp = FileResponse(report.file.open("rb"), as_attachment=True,
+                            filename=report_filename(report), content_type="application/pdf")
+        resp["Cache-Control"] = "private, max-age=86400"  # a report's file never changes
         return resp
@@ -6,6 +6,10 @@ class ServiceFAQInline(admin.TabularInline):
     model = ServiceFAQ
     extra = 1
 
+    def get_queryset(self, request):
+        # Each row's label (ServiceFAQ.__str__) reads service.name
+        return super().get_queryset(request).select_related('service')
+
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
     list_display = ("name", "is_active", "order")
@@ -17,4 +21,5 @@ class ServiceAdmin(admin.ModelAdmin):
 @admin.register(ServiceFAQ)
 class ServiceFAQAdmin(admin.ModelAdmin):
     list_display = ("service", "question", "order")
+    list_select_related = ("service",)
     search_fields = ("question", "answer")
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0003_rendered_body'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='servicefaq',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['updated_at'], name='service_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicefaq',
+            index=models.Index(fields=['updated_at'], name='servicefaq_updated_idx'),
+        ),
+    ]
@@ -1,18 +1,36 @@
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 
-class Service(models.Model):
+from utils.rendering import RenderedBodyMixin
+from utils.search import SearchVectorMixin
+
+class Service(SearchVectorMixin, RenderedBodyMixin, models.Model):
     name = models.CharField(max_length=120, unique=True)
     slug = models.SlugField(unique=True, blank=True)
     short_description = models.TextField(blank=True)
     body = models.TextField(blank=True)
+    # Pre-rendered from body on save (utils.rendering)
+    body_html = models.TextField(blank=True, editable=False)
+    toc = models.JSONField(default=list, blank=True, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)  # minutes
+    body_renderer_version = models.PositiveSmallIntegerField(default=0, editable=False)
     hero_image = models.ImageField(upload_to='services/', blank=True, null=True)
     is_active = models.BooleanField(default=True)
     order = models.PositiveIntegerField(default=0)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    search_vector_fields = (('name', 'A'), ('short_description', 'B'), ('body', 'C'))
 
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='service_search_gin'),
+            models.Index(fields=['updated_at'], name='service_updated_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -27,9 +45,11 @@ class ServiceFAQ(models.Model):
     question = models.CharField(max_length=200)
     answer = models.TextField()
     order = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['updated_at'], name='servicefaq_updated_idx')]
 
     def __str__(self):
         return f"{self.service.name} – {self.question}"
@@ -1,19 +1,21 @@
 
 from rest_framework import serializers
 from .models import Service, ServiceFAQ
+from utils.sparse import DynamicFieldsMixin
 
-class ServiceFAQSerializer(serializers.ModelSerializer):
+class ServiceFAQSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ServiceFAQ
         fields = ['question', 'answer', 'order']
 
-class ServiceListSerializer(serializers.ModelSerializer):
+class ServiceListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Service
         fields = ['name', 'slug', 'short_description', 'hero_image', 'order']
 
-class ServiceDetailSerializer(serializers.ModelSerializer):
+class ServiceDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     faqs = ServiceFAQSerializer(many=True, read_only=True)
     class Meta:
         model = Service
-        fields = ['name', 'slug', 'short_description', 'body', 'hero_image', 'faqs']
+        fields = ['name', 'slug', 'short_description', 'body', 'body_html', 'toc', 'reading_time',
+                  'hero_image', 'faqs']
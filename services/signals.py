@@ -0,0 +1,19 @@
+"""
+FAQs are part of their service's representation: adding, editing or deleting
+one touches the service's ``updated_at`` so its ETag / Last-Modified and the
+/api/changes/ feed pick the edit up.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Service, ServiceFAQ
+
+
+@receiver(post_save, sender=ServiceFAQ, dispatch_uid="servicefaq_touch_service_save")
+@receiver(post_delete, sender=ServiceFAQ, dispatch_uid="servicefaq_touch_service_delete")
+def touch_service(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # update() sends no post_save, so the API cache is bumped by the FAQ signal alone
+    Service.objects.filter(pk=instance.service_id).update(updated_at=timezone.now())
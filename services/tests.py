@@ -1 +1,53 @@
-# tests
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from utils.testing import NO_CACHE, stock_and_fast_list
+from .models import Service, ServiceFAQ
+from .views import ServiceViewSet
+
+
+@override_settings(CACHES=NO_CACHE)
+class ServiceQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.service = Service.objects.create(name="Kitchens", short_description="Fitted kitchens",
+                                             body="# Kitchens\nWe fit them.", order=1)
+        ServiceFAQ.objects.bulk_create(
+            ServiceFAQ(service=cls.service, question=f"Question {n}?", answer="Yes.", order=n) for n in range(6))
+        for n in range(5):
+            Service.objects.create(name=f"Service {n}", order=n + 2)
+
+    def test_list(self):
+        with self.assertNumQueries(3):  # ETag aggregate, count, rows
+            self.assertEqual(self.client.get(reverse("services-list")).status_code, 200)
+
+    def test_featured(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(len(self.client.get(reverse("services-featured")).json()), 6)
+
+    def test_detail_does_not_query_per_faq(self):
+        url = reverse("services-detail", args=[self.service.slug])
+        with self.assertNumQueries(3):  # ETag, service, all FAQs
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()["faqs"]), 6)
+
+
+@override_settings(CACHES=NO_CACHE)
+class ServiceFastListParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Service.objects.create(name="Kitchens & Bathrooms", short_description="Fitted – “bespoke”",
+                               hero_image="services/hero one.jpg", order=1)
+        Service.objects.create(name="Plastering", hero_image=None, order=2)
+        Service.objects.create(name="Retired", is_active=False, order=3)
+
+    def test_list(self):
+        stock, fast = stock_and_fast_list(self.client, ServiceViewSet, reverse("services-list"))
+        self.assertEqual(stock, fast)
+        self.assertIn(b'"hero_image":null', fast)
+        self.assertNotIn(b"Retired", fast)
+
+    def test_featured(self):
+        # featured uses fast_data(), which falls back to the serializer when fast_plan() is None
+        stock, fast = stock_and_fast_list(self.client, ServiceViewSet, reverse("services-featured"))
+        self.assertEqual(stock, fast)
@@ -2,17 +2,38 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Service
+from utils.cache import CachedResponseMixin
+from utils.conditional import ConditionalGetMixin
+from utils.fastlist import FastListMixin
+from utils.sparse import SparseFieldsMixin
+from .models import Service, ServiceFAQ
 from .serializers import ServiceListSerializer, ServiceDetailSerializer
 
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
+class ServiceViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsMixin, FastListMixin,
+                     viewsets.ReadOnlyModelViewSet):
+    cache_actions = ('list', 'retrieve', 'featured')
+    cache_models = (Service, ServiceFAQ)
     queryset = Service.objects.filter(is_active=True).order_by('order')
     lookup_field = 'slug'
 
+    # Columns ServiceListSerializer reads; list/featured skip the body, rendered HTML and tsvector
+    list_fields = ('id', 'name', 'slug', 'short_description', 'hero_image', 'order')
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'retrieve':
+            # All FAQs in one extra query, however many the service has
+            return qs.defer('search_vector').prefetch_related('faqs')
+        return qs.only(*self.list_fields)
+
     def get_serializer_class(self):
         return ServiceDetailSerializer if self.action == 'retrieve' else ServiceListSerializer
 
     @action(detail=False, methods=['get'])
     def featured(self, request):
         qs = self.get_queryset()[:6]
-        return Response(ServiceListSerializer(qs, many=True, context={'request': request}).data)
+        serializer = ServiceListSerializer(context=self.get_serializer_context())
+        data = self.fast_data(qs, serializer)
+        if data is None:
+            data = ServiceListSerializer(qs, many=True, context=self.get_serializer_context()).data
+        return Response(data)
@@ -0,0 +1,78 @@
+"""
+In-process dispatch of read-only API sub-requests, for /api/batch/.
+
+Each path is resolved against the URLconf and handed to its view as a GET
+carrying the caller's headers, cookies, session and user, so authentication,
+permissions, throttles and the response cache behave exactly as for a direct
+request. Views are called directly (no middleware), and DRF responses are
+returned as data without being rendered.
+"""
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/"
+
+# Request headers that must not leak into sub-requests: they describe the
+# batch call itself (body, content negotiation, conditional GET).
+DROPPED_META = frozenset({
+    "CONTENT_LENGTH", "CONTENT_TYPE", "HTTP_ACCEPT", "HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE",
+})
+
+
+def _error(status, detail):
+    return status, {"detail": detail}
+
+
+def subrequest(request, path, query):
+    """A GET HttpRequest for ``path?query`` on behalf of the (Django) ``request``."""
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = path
+    sub.META = {key: value for key, value in request.META.items() if key not in DROPPED_META}
+    sub.META.update(REQUEST_METHOD="GET", PATH_INFO=path, QUERY_STRING=query, HTTP_ACCEPT="application/json")
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    for attr in ("session", "user"):  # set by SessionMiddleware / AuthenticationMiddleware
+        if hasattr(request, attr):
+            setattr(sub, attr, getattr(request, attr))
+    return sub
+
+
+def dispatch_get(request, url, exclude=()):
+    """
+    GET ``url`` (an /api/ path with optional query string) in-process.
+    Returns ``(status, data)``; ``exclude`` lists URL names that may not be
+    batched (e.g. the batch view itself).
+    """
+    if not isinstance(url, str):
+        return _error(400, "Expected a path string.")
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path.startswith(API_PREFIX):
+        return _error(400, f"Only {API_PREFIX} paths on this server can be batched.")
+    try:
+        match = resolve(parts.path)
+    except Resolver404:
+        return _error(404, "Not found.")
+    if match.url_name in exclude:
+        return _error(400, "This endpoint cannot be batched.")
+
+    sub = subrequest(request, parts.path, parts.query)
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception("Batched request failed: %s", url)
+        return _error(500, "Server error.")
+
+    if isinstance(response, Response):
+        return response.status_code, response.data
+    if response.streaming or not response.get("Content-Type", "").startswith("application/json"):
+        return _error(406, "Only JSON endpoints can be batched.")
+    return response.status_code, json.loads(response.content) if response.content else None
@@ -0,0 +1,142 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.urls import get_resolver
+from rest_framework.response import Response
+
+HIT, MISS = "hit", "miss"
+
+# Hit/miss counts for this process (like utils.metrics): no shared-cache write per request
+_outcomes, _outcomes_lock = Counter(), threading.Lock()
+# Labels of the models some CachedResponseMixin view lists in cache_models
+_cached_labels = set()
+
+
+def get_cache():
+    return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+
+def _label(model):
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _version_key(label):
+    return f"apiver:{label.lower()}"
+
+
+def _bump(label):
+    cache, key = get_cache(), _version_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Missing/evicted: restart from the clock so an old version number can't come back.
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def bump_version(model):
+    """
+    Invalidate every cached response that depends on ``model`` (class or "app.model").
+    Called from post_save/post_delete, and explicitly after bulk writes that skip signals.
+    Deferred until the current transaction commits (immediate outside one): bumped
+    earlier, a concurrent request could cache the pre-commit rows under the new version.
+    """
+    label = _label(model)
+    transaction.on_commit(lambda: _bump(label))
+
+
+def cached_labels():
+    """Labels of every model a cached view reads (the URLconf is imported to find them)."""
+    if not _cached_labels:
+        get_resolver().url_patterns  # views register themselves when imported
+    return _cached_labels
+
+
+def versions(labels):
+    """Current version numbers for ``labels`` (initialised on first use)."""
+    cache = get_cache()
+    keys = [_version_key(label) for label in labels]
+    current = cache.get_many(keys)
+    for key in keys:
+        if key not in current:
+            cache.add(key, int(time.time() * 1000), None)
+            current[key] = cache.get(key)
+    return [current[key] for key in keys]
+
+
+def bump_on_change(sender, **kwargs):
+    """
+    post_save / post_delete receiver: an edit to a model some cached view reads
+    bumps its version. Others (throttle buckets, outbox and job rows) are ignored.
+    """
+    if kwargs.get("raw") or sender._meta.label_lower not in cached_labels():
+        return
+    bump_version(sender)
+
+
+def record(outcome):
+    with _outcomes_lock:
+        _outcomes[outcome] += 1
+
+
+def cache_stats():
+    """Hits and misses served by this process since it started."""
+    with _outcomes_lock:
+        hits, misses = _outcomes[HIT], _outcomes[MISS]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 4) if total else None}
+
+
+def response_cache_key(request, labels):
+    """Path + normalised query params + host/scheme + role + model versions."""
+    query = "&".join(f"{k}={v}" for k, values in sorted(request.query_params.lists())
+                     for v in sorted(values))
+    role = "staff" if getattr(request.user, "is_staff", False) else "anon"
+    parts = [request.scheme, request.get_host(), request.path, query, role,
+             ",".join(map(str, versions(labels)))]
+    return "apiresp:" + hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    """
+    Caches the serialized data of read actions listed in ``cache_actions``.
+    Entries are keyed on the models in ``cache_models``: saving or deleting any
+    of them bumps its version, so admin edits are visible immediately and stale
+    entries simply age out.
+    """
+    cache_actions = ("list", "retrieve")
+    cache_models = ()
+    cache_timeout = None  # None: the cache alias' TIMEOUT
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _cached_labels.update(_label(model) for model in cls.cache_models)
+
+    def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        action = getattr(self, "action_map", {}).get(method)
+        if method == "get" and action in self.cache_actions:
+            handler = getattr(self, method)
+            setattr(self, method, lambda req, *a, **kw: self.cached_response(handler, req, *a, **kw))
+        return super().dispatch(request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        labels = [_label(m) for m in self.cache_models]
+        key = response_cache_key(request, labels)
+        entry = cache.get(key)
+        if entry is not None:
+            record(HIT)
+            return Response(entry["data"], status=entry["status"], headers={"X-Cache": "HIT"})
+
+        record(MISS)
+        response = handler(request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            timeout = self.cache_timeout if self.cache_timeout is not None else cache.default_timeout
+            cache.set(key, {"data": response.data, "status": response.status_code}, timeout)
+        response["X-Cache"] = "MISS"
+        return response
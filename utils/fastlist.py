@@ -0,0 +1,181 @@
+"""
+Opt-in fast path for hot list endpoints.
+
+``FastListMixin.list()`` fetches ``.values()`` rows for exactly the columns the
+list serializer reads and converts them with the serializer's own field
+``to_representation`` (skipped for field types that return DB values
+unchanged), so no model instances or per-item serializer passes are built.
+File/image URLs are built from a per-request prefix instead of one
+``storage.url()`` + ``build_absolute_uri()`` round per row. Output is
+identical to the serializer's; serializers with nested or dotted-source
+fields, or a custom ``to_representation``, silently use the normal path.
+
+``SerializerMethodField`` methods receive a read-only row object exposing the
+fetched columns (plus queryset annotations) as attributes; columns they need
+beyond the declared fields go in the view's ``fast_list_columns``. Extra
+columns are fetched but not output.
+"""
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.db.models import FileField as ModelFileField
+from django.utils.encoding import filepath_to_uri
+from rest_framework import fields as drf_fields
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework import ISO_8601
+from rest_framework.settings import api_settings
+
+URL_SAFE_NAME = re.compile(r"[A-Za-z0-9_.~!*()'/-]*\Z")
+
+# DRF fields whose to_representation() returns values from the database unchanged
+PASSTHROUGH_FIELDS = (
+    drf_fields.CharField, drf_fields.BooleanField, drf_fields.IntegerField, drf_fields.ReadOnlyField,
+)
+
+
+class Row:
+    """Attribute access over a ``.values()`` dict, for SerializerMethodField methods."""
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, name):
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _path_to_uri(name):
+    # filepath_to_uri() leaves these names unchanged; skip its quote() round
+    return name if URL_SAFE_NAME.match(name) else filepath_to_uri(name)
+
+
+def storage_url_builder(storage, request=None):
+    """
+    name -> absolute URL, equal to ``request.build_absolute_uri(storage.url(name))``
+    but computing the scheme/host/MEDIA_URL prefix once.
+    """
+    if isinstance(storage, FileSystemStorage) and storage.base_url and storage.base_url.startswith("/"):
+        prefix = request.build_absolute_uri(storage.base_url) if request is not None else storage.base_url
+        return lambda name: prefix + _path_to_uri(name).lstrip("/")
+    if request is not None:
+        return lambda name: request.build_absolute_uri(storage.url(name))
+    return storage.url
+
+
+def _file_converter(drf_field, model_field, request):
+    if not getattr(drf_field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+        return lambda name: name or None
+    url = storage_url_builder(model_field.storage, request)
+    return lambda name: url(name) if name else None
+
+
+def _datetime_converter(field):
+    """DateTimeField.to_representation for ISO 8601 output with the timezone resolved once."""
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or isinstance(output_format, str) and output_format.lower() != ISO_8601:
+        return field.to_representation
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if tz is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:  # naive values need DRF's make_aware checks
+            return field.to_representation(value)
+        text = value.astimezone(tz).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    return convert
+
+
+def _is_passthrough(field):
+    if isinstance(field, drf_fields.JSONField):
+        return not field.binary
+    return isinstance(field, PASSTHROUGH_FIELDS)
+
+
+class FastListPlan:
+    """Columns to fetch and a converter per output field, for one serializer instance."""
+
+    def __init__(self, columns, steps):
+        self.columns = columns
+        self.steps = steps  # (output name, column or None, converter or None, method or None)
+
+    def render(self, rows):
+        out = []
+        for row in rows:
+            item, proxy = {}, None
+            for name, column, convert, method in self.steps:
+                if method is not None:
+                    if proxy is None:
+                        proxy = Row(row)
+                    item[name] = method(proxy)
+                    continue
+                value = row[column]
+                item[name] = value if value is None or convert is None else convert(value)
+            out.append(item)
+        return out
+
+
+def build_plan(serializer, queryset, extra_columns=()):
+    """A FastListPlan for ``serializer`` over ``queryset``, or None if unsupported."""
+    if type(serializer).to_representation is not serializers.ModelSerializer.to_representation:
+        return None
+    model_fields = {f.name: f for f in queryset.model._meta.concrete_fields}
+    request = serializer.context.get("request")
+    columns = list(extra_columns) + [a for a in queryset.query.annotation_select if a not in extra_columns]
+    steps = []
+    for field in serializer._readable_fields:
+        if isinstance(field, serializers.SerializerMethodField):
+            steps.append((field.field_name, None, None, getattr(serializer, field.method_name)))
+            continue
+        model_field = model_fields.get(field.source)
+        if model_field is None or model_field.is_relation or isinstance(field, serializers.BaseSerializer):
+            return None
+        if isinstance(field, drf_fields.FileField) and isinstance(model_field, ModelFileField):
+            convert = _file_converter(field, model_field, request)
+        elif type(field) is drf_fields.DateTimeField:
+            convert = _datetime_converter(field)
+        elif _is_passthrough(field):
+            convert = None
+        else:
+            convert = field.to_representation
+        if field.source not in columns:
+            columns.append(field.source)
+        steps.append((field.field_name, field.source, convert, None))
+    return FastListPlan(columns, steps)
+
+
+class FastListMixin:
+    """
+    For ListModelMixin views: serve ``list`` from ``.values()`` rows (see module doc).
+    Works with page-number and keyset pagination.
+    """
+    fast_list_columns = ()  # extra columns SerializerMethodFields read
+
+    def fast_plan(self, queryset, serializer=None):
+        serializer = serializer if serializer is not None else self.get_serializer()
+        # Keyset pagination reads its ordering columns from the rows
+        cursor_columns = tuple(o.lstrip("-") for o in getattr(self, "cursor_ordering", None) or ())
+        return build_plan(serializer, queryset, self.fast_list_columns + cursor_columns)
+
+    def fast_data(self, queryset, serializer=None):
+        """Serialized list data for ``queryset`` (unpaginated), via the fast path when possible."""
+        plan = self.fast_plan(queryset, serializer)
+        if plan is None:
+            return None
+        return plan.render(queryset.values(*plan.columns))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = self.fast_plan(queryset)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = queryset.values(*plan.columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
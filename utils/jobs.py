@@ -0,0 +1,100 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+# Shared status values for DB-backed work queues
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+JOB_STATUS_CHOICES = [
+    (QUEUED, "Queued"),
+    (RUNNING, "Running"),
+    (DONE, "Done"),
+    (FAILED, "Failed"),
+]
+
+
+def claim_next(queryset, order_by="created_at"):
+    """
+    Atomically move the oldest queued row of ``queryset`` to RUNNING and return it.
+    SKIP LOCKED lets several workers poll the same table without blocking each other.
+    Returns None when nothing is queued.
+    """
+    with transaction.atomic():
+        job = (queryset.select_for_update(skip_locked=True)
+               .filter(status=QUEUED).order_by(order_by).first())
+        if job is None:
+            return None
+        job.status = RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    return job
+
+
+def claim_batch(queryset, limit, order_by="created_at"):
+    """
+    Like ``claim_next`` but claims up to ``limit`` queued rows in one go.
+    Returns the claimed rows (already marked RUNNING), oldest first.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(queryset.select_for_update(skip_locked=True)
+                    .filter(status=QUEUED).order_by(order_by)[:limit])
+        if jobs:
+            queryset.model._default_manager.filter(pk__in=[job.pk for job in jobs]).update(
+                status=RUNNING, started_at=now)
+    for job in jobs:
+        job.status, job.started_at = RUNNING, now
+    return jobs
+
+
+def requeue_expired(queryset, lease):
+    """
+    Hand RUNNING rows of ``queryset`` claimed more than ``lease`` (a timedelta)
+    ago back to the queue: their worker died mid-job. Returns how many.
+    """
+    return queryset.filter(status=RUNNING, started_at__lt=timezone.now() - lease).update(status=QUEUED)
+
+
+@contextmanager
+def keep_lease(job, every=60):
+    """
+    Refresh ``job.started_at`` every ``every`` seconds while the block runs, so
+    ``requeue_expired`` only ever hands back jobs whose worker has stopped.
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(every):
+                type(job)._default_manager.filter(pk=job.pk, status=RUNNING).update(started_at=timezone.now())
+        finally:
+            connections.close_all()  # this thread's own connections
+
+    thread = threading.Thread(target=beat, name=f"lease-{job.pk}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(poll, once=False, sleep=2.0):
+    """
+    Minimal worker loop: call ``poll()`` until it reports no work.
+    ``poll`` returns True when it handled something. With ``once`` the loop exits
+    as soon as the queue is drained; otherwise it sleeps and polls again.
+    """
+    while True:
+        close_old_connections()
+        if poll():
+            continue
+        if once:
+            return
+        time.sleep(sleep)
@@ -0,0 +1,18 @@
+from django.utils.module_loading import import_string
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    URLconf entry for a class-based view that is imported on its first request,
+    keeping rarely used, import-heavy views (e.g. API docs) out of worker boot.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    wrapper.__name__ = wrapper.__qualname__ = dotted_path.rsplit(".", 1)[-1]
+    return wrapper
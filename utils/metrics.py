@@ -0,0 +1,212 @@
+"""
+Per-route request metrics, kept in process memory.
+
+RequestMetricsMiddleware times every request, counts its SQL queries and
+their time (via connection.execute_wrapper) and records them, with the
+response size, under the resolved URL name (``gallery-list``,
+``quotes-dashboard``, ...). Each response gets a ``Server-Timing`` header.
+Requests that run more than METRICS_QUERY_WARN queries are logged together
+with their most repeated statement, the usual sign of an N+1 loop.
+Streaming responses are measured up to the point the response is returned
+(their rows are fetched while the body is sent).
+
+Histograms are cumulative since the worker started and per process; the
+staff-only ``/api/_metrics`` endpoint renders them in the Prometheus text
+format (scrape each worker, or sum per route in PromQL).
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, Prometheus style (the implicit last bucket is +Inf)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)  # bytes
+UNRESOLVED = "<unresolved>"
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}  # others -> "OTHER"
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                break
+        else:
+            i = len(self.bounds)
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            yield ("+Inf" if bound == float("inf") else f"{bound:g}"), total
+
+
+class RouteStats:
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.db_duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses = Counter()
+        self.n_plus_one = 0
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, method, status, duration, db_duration, queries, size, flagged):
+        with self.lock:
+            stats = self.routes.get((route, method))
+            if stats is None:
+                stats = self.routes[(route, method)] = RouteStats()
+            stats.duration.observe(duration)
+            stats.db_duration.observe(db_duration)
+            stats.queries.observe(queries)
+            if size is not None:
+                stats.size.observe(size)
+            stats.statuses[f"{status // 100}xx"] += 1
+            stats.n_plus_one += flagged
+
+    def snapshot(self):
+        with self.lock:
+            return sorted(self.routes.items())
+
+
+registry = Registry()
+
+
+class QueryRecorder:
+    """execute_wrapper hook: counts statements and their time for one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED
+    return match.view_name or match.route or UNRESOLVED
+
+
+class RequestMetricsMiddleware:
+    """Outermost middleware: its timings cover the rest of the stack."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_warn = getattr(settings, "METRICS_QUERY_WARN", 30)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        route = route_name(request)
+        flagged = recorder.count > self.query_warn
+        if flagged:
+            sql, repeats = recorder.statements.most_common(1)[0]
+            logger.warning(
+                "Possible N+1: %s %s ran %d queries (%.1f ms); most repeated (%dx): %s",
+                request.method, route, recorder.count, recorder.duration * 1000, repeats, sql[:300])
+        size = None if response.streaming else len(response.content)
+        method = request.method if request.method in METHODS else "OTHER"
+        registry.record(route, method, response.status_code, duration,
+                        recorder.duration, recorder.count, size, flagged)
+
+        response["Server-Timing"] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"'
+        )
+        return response
+
+
+# --- Prometheus text exposition ---
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _histogram(lines, name, help_text, series):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, hist in series:
+        for bound, total in hist.cumulative():
+            lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {total}")
+        lines.append(f"{name}_sum{_labels(**labels)} {hist.sum:.6f}")
+        lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+
+def render_prometheus(extra_gauges=()):
+    """
+    The registry as Prometheus text. ``extra_gauges`` is an iterable of
+    (name, help, type, [(labels_dict, value), ...]) for app-level counters.
+    """
+    routes = registry.snapshot()
+    pid = os.getpid()
+    lines = []
+    for attr, name, help_text in (
+        ("duration", "http_request_duration_seconds", "Wall time per request, by URL name."),
+        ("db_duration", "http_request_db_seconds", "Time spent in SQL per request."),
+        ("queries", "http_request_queries", "SQL statements per request."),
+        ("size", "http_response_size_bytes", "Response body size (non-streaming responses)."),
+    ):
+        _histogram(lines, name, help_text,
+                   [({"route": r, "method": m, "pid": pid}, getattr(s, attr)) for (r, m), s in routes])
+
+    lines.append("# HELP http_responses_total Responses by status class.")
+    lines.append("# TYPE http_responses_total counter")
+    for (route, method), stats in routes:
+        for status, count in sorted(stats.statuses.items()):
+            lines.append(f"http_responses_total{_labels(route=route, method=method, status=status, pid=pid)} {count}")
+
+    lines.append("# HELP http_request_n_plus_one_total Requests over METRICS_QUERY_WARN queries.")
+    lines.append("# TYPE http_request_n_plus_one_total counter")
+    for (route, method), stats in routes:
+        lines.append(f"http_request_n_plus_one_total{_labels(route=route, method=method, pid=pid)} "
+                     f"{stats.n_plus_one}")
+
+    for name, help_text, kind, samples in extra_gauges:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(**labels) if labels else ''} {value}")
+    return "\n".join(lines) + "\n"
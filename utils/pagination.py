@@ -0,0 +1,102 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetOrPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination by default (backwards compatible), plus an opt-in
+    keyset mode when the request carries ``?cursor=`` (empty for the first page).
+
+    Keyset mode orders by the view's ``cursor_ordering`` (e.g. ("-created_at", "-id"))
+    and seeks past the last row seen with a row-value comparison, so every page
+    costs the same regardless of depth: no COUNT(*) and no OFFSET scan.
+    Responses are {"next": url-or-null, "results": [...]}; ?ordering= is ignored.
+    """
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, "cursor_ordering", None)
+        self.keyset = bool(ordering) and self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.ordering = tuple(ordering)
+        self.fields = [queryset.model._meta.get_field(o.lstrip("-")) for o in self.ordering]
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(position))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page_rows = rows[:page_size]
+        return self.page_rows
+
+    # --- Cursor encoding ---
+    def position_of(self, row):
+        if isinstance(row, dict):  # .values() rows (utils.fastlist)
+            return [row[field.attname] if field.attname in row else row[field.name] for field in self.fields]
+        return [getattr(row, field.attname) for field in self.fields]
+
+    def encode_cursor(self, position):
+        # isoformat keeps full microsecond precision (DjangoJSONEncoder truncates it)
+        raw = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value
+                          for value in position], default=str)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except (ValueError, TypeError, binascii.Error, UnicodeDecodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def seek_filter(self, position):
+        """
+        (a, b) < (x, y) expanded for mixed directions:
+        a < x OR (a = x AND b < y), with > for ascending fields.
+        """
+        condition = Q()
+        for i, (order, value) in enumerate(zip(self.ordering, position)):
+            name = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") else "gt"
+            step = Q(**{f"{name}__{lookup}": value})
+            for prev_order, prev_value in zip(self.ordering[:i], position[:i]):
+                step &= Q(**{prev_order.lstrip("-"): prev_value})
+            condition |= step
+        return condition
+
+    def get_next_link(self):
+        if self.keyset:
+            if not self.has_next or not self.page_rows:
+                return None
+            cursor = self.encode_cursor(self.position_of(self.page_rows[-1]))
+            return replace_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+        return super().get_next_link()
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("results", data),
+        ]))
@@ -0,0 +1,76 @@
+import math
+import re
+from functools import lru_cache
+
+from django.utils.html import strip_tags
+
+# Bump whenever the pipeline below changes output; `manage.py rerender_bodies`
+# then re-renders every stored body_html produced by an older version.
+RENDERER_VERSION = 1
+
+MARKDOWN_EXTENSIONS = ["extra", "toc", "sane_lists"]
+WORDS_PER_MINUTE = 200
+
+
+# markdown/nh3 are only needed when a body is saved, not to serve requests,
+# so they are imported on first use rather than at worker boot.
+@lru_cache(maxsize=None)
+def allowed_attributes():
+    """Sanitiser policy: ammonia's defaults plus heading anchors (for the TOC)
+    and language classes on code blocks."""
+    import nh3
+
+    return {
+        **{tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()},
+        **{f"h{n}": {"id"} for n in range(1, 7)},
+        "code": {"class"},
+        "pre": {"class"},
+        "img": {"src", "alt", "title", "width", "height", "loading"},
+    }
+
+
+def _toc(tokens):
+    return [
+        {"level": t["level"], "id": t["id"], "title": t["name"], "children": _toc(t["children"])}
+        for t in tokens
+    ]
+
+
+def render_body(text):
+    """
+    Markdown (or raw HTML) -> sanitised HTML, table of contents and reading time.
+    Returns {"body_html": str, "toc": [...], "reading_time": minutes}.
+    """
+    import markdown
+    import nh3
+
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    html = nh3.clean(md.convert(text or ""), attributes=allowed_attributes(),
+                     link_rel="noopener noreferrer")
+    words = len(re.findall(r"\w+", strip_tags(html)))
+    return {
+        "body_html": html,
+        "toc": _toc(getattr(md, "toc_tokens", [])),
+        "reading_time": math.ceil(words / WORDS_PER_MINUTE) if words else 0,
+    }
+
+
+class RenderedBodyMixin:
+    """
+    Renders ``body`` into the stored body_html/toc/reading_time columns on save,
+    so API detail responses are a plain row fetch.
+    """
+    rendered_fields = ["body_html", "toc", "reading_time", "body_renderer_version"]
+
+    def render_body(self):
+        for field, value in render_body(self.body).items():
+            setattr(self, field, value)
+        self.body_renderer_version = RENDERER_VERSION
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "body" in update_fields:
+            self.render_body()
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | set(self.rendered_fields)
+        super().save(*args, **kwargs)
@@ -0,0 +1,86 @@
+from django.contrib.postgres.search import (
+    SearchHeadline, SearchQuery, SearchRank, SearchVector)
+from django.db.models import F, Func, TextField
+from rest_framework.filters import SearchFilter
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = {
+    "start_sel": "<mark>",
+    "stop_sel": "</mark>",
+    "max_words": 30,
+    "min_words": 12,
+    "max_fragments": 2,
+}
+
+
+class StripTags(Func):
+    """
+    Text of a sanitised HTML column (tags replaced by spaces, entities left
+    escaped), so ts_headline snippets hold no markup but their own <mark>s.
+    """
+    function = "regexp_replace"
+    template = "%(function)s(%(expressions)s, '<[^>]*>', ' ', 'g')"
+    output_field = TextField()
+
+
+def build_search_vector(weighted_fields):
+    """(("title", "A"), ("body", "C")) -> weighted SearchVector expression."""
+    vector = None
+    for field, weight in weighted_fields:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+class SearchVectorMixin:
+    """
+    Keeps a model's stored ``search_vector`` (tsvector) in sync on save.
+    Models declare ``search_vector_fields = (("title", "A"), ...)``.
+    """
+    search_vector_fields = ()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Computed in SQL so Postgres applies the same parser/dictionary as queries.
+        type(self)._default_manager.filter(pk=self.pk).update(
+            search_vector=build_search_vector(self.search_vector_fields))
+
+    @classmethod
+    def refresh_search_vectors(cls, queryset=None):
+        """Backfill/rebuild vectors in one UPDATE (e.g. after loaddata or bulk edits)."""
+        qs = cls._default_manager.all() if queryset is None else queryset
+        return qs.update(search_vector=build_search_vector(cls.search_vector_fields))
+
+
+def ranked_search(queryset, term, vector_field="search_vector", headline_field=None):
+    """
+    Filter ``queryset`` by a websearch-style query against the stored tsvector,
+    annotated with ``search_rank`` (and ``search_headline`` when a field is given),
+    best matches first. ``headline_field`` is a sanitised HTML column (body_html),
+    never raw user input: the snippet is returned as HTML.
+    """
+    query = SearchQuery(term, search_type="websearch", config=SEARCH_CONFIG)
+    qs = queryset.filter(**{vector_field: query}).annotate(
+        search_rank=SearchRank(F(vector_field), query))
+    if headline_field:
+        qs = qs.annotate(search_headline=SearchHeadline(
+            StripTags(headline_field), query, config=SEARCH_CONFIG, **HEADLINE_OPTIONS))
+    return qs.order_by("-search_rank", "-pk")
+
+
+class RankedSearchFilter(SearchFilter):
+    """
+    ?search= backed by a stored tsvector + GIN index for views that declare
+    ``search_vector_field`` (optionally ``search_headline_field``);
+    other views keep DRF's ILIKE-based SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        vector_field = getattr(view, "search_vector_field", None)
+        if not vector_field:
+            return super().filter_queryset(request, queryset, view)
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+        return ranked_search(queryset, term, vector_field,
+                             getattr(view, "search_headline_field", None))
@@ -0,0 +1,90 @@
+"""
+Cheap in-process spam checks for the public contact and quote forms.
+
+Run after serializer validation and before anything is written:
+
+- honeypot: the forms render a hidden ``website`` input that people leave empty;
+- links: too many URLs (absolute or ``www.``) in the free-text fields;
+- duplicate: the same email + text within DUPLICATE_WINDOW (double submits,
+  replayed bot posts), tracked by content hash in the ``api`` cache.
+
+Rejections (these and the throttles) are counted per reason; see
+``rejection_stats()``.
+"""
+import hashlib
+import re
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .cache import get_cache
+
+HONEYPOT_FIELD = "website"
+MAX_LINKS = 3
+DUPLICATE_WINDOW = 10 * 60  # seconds
+REJECTION_REASONS = ("honeypot", "links", "duplicate", "throttle_ip", "throttle_email")
+
+LINK_RE = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+
+
+class SpamRejected(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Your submission could not be accepted."
+    default_code = "rejected"
+
+
+# --- Counters ---
+def record_rejection(reason):
+    cache, key = get_cache(), f"rejections:{reason}"
+    try:
+        cache.incr(key)
+    except ValueError:  # first event (or a dummy cache, which stores nothing)
+        cache.add(key, 1, None)
+
+
+def rejection_stats():
+    counts = get_cache().get_many([f"rejections:{r}" for r in REJECTION_REASONS])
+    return {reason: counts.get(f"rejections:{reason}", 0) for reason in REJECTION_REASONS}
+
+
+# --- Checks ---
+def _normalise(text):
+    return " ".join(str(text).lower().split())
+
+
+def spam_reason(scope, raw_data, email, texts):
+    """Return why a submission looks like spam, or None. Registers its content hash."""
+    if hasattr(raw_data, "get") and raw_data.get(HONEYPOT_FIELD):
+        return "honeypot"
+    if sum(len(LINK_RE.findall(str(t))) for t in texts if t) > MAX_LINKS:
+        return "links"
+    digest = hashlib.sha1(
+        "\x1f".join([scope, _normalise(email or "")] + [_normalise(t or "") for t in texts]).encode()
+    ).hexdigest()
+    # add() is a no-op if the key exists: the first submission wins the window
+    if not get_cache().add(f"spamhash:{digest}", 1, DUPLICATE_WINDOW):
+        return "duplicate"
+    return None
+
+
+class SpamCheckMixin:
+    """
+    For create views: call ``self.check_spam(serializer)`` at the top of
+    ``perform_create``. Reads ``throttle_scope`` and ``spam_text_fields``.
+    """
+    spam_text_fields = ()
+    spam_email_field = "email"
+
+    def check_spam(self, serializer):
+        if getattr(self.request.user, "is_staff", False):
+            return
+        data = serializer.validated_data
+        reason = spam_reason(
+            self.throttle_scope,
+            self.request.data,
+            data.get(self.spam_email_field),
+            [data.get(field) for field in self.spam_text_fields],
+        )
+        if reason:
+            record_rejection(reason)
+            raise SpamRejected()
@@ -0,0 +1,100 @@
+"""
+Sparse fieldsets: ``?fields=name,slug`` keeps only those top-level fields,
+``?omit=body,body_html`` drops fields; both may be combined and repeated.
+Names are checked against the serializer's own fields (unknown names are a
+400). Only reads are affected, and only the outermost serializer: nested
+serializers (e.g. service FAQs) are returned whole.
+
+SparseFieldsMixin (views) carries the selection into SQL: columns behind the
+fields that were left out are deferred, so large text columns are never read
+unless asked for. Computed fields (``SerializerMethodField`` and the like)
+declare the columns they read in the serializer's ``sparse_field_columns``,
+so keeping one keeps those columns loaded. The values()-based list path
+(utils.fastlist) projects the pruned serializer's columns directly.
+"""
+from rest_framework import permissions, serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM, OMIT_PARAM = "fields", "omit"
+
+
+def _names(params, key):
+    names = []
+    for value in params.getlist(key):
+        names.extend(name.strip() for name in value.split(",") if name.strip())
+    return names
+
+
+def requested_fields(request, allowed):
+    """The subset of ``allowed`` selected by ?fields= / ?omit=, or None for all of them."""
+    params = getattr(request, "query_params", None)
+    if params is None or request.method not in permissions.SAFE_METHODS:
+        return None
+    keep, omit = _names(params, FIELDS_PARAM), _names(params, OMIT_PARAM)
+    if not keep and not omit:
+        return None
+    errors = {}
+    for key, names in ((FIELDS_PARAM, keep), (OMIT_PARAM, omit)):
+        unknown = sorted(set(names) - set(allowed))
+        if unknown:
+            errors[key] = f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}."
+    if errors:
+        raise ValidationError(errors)
+    selected = set(keep) if keep else set(allowed)
+    return [name for name in allowed if name in selected and name not in omit]
+
+
+class DynamicFieldsMixin:
+    """Serializer mixin honouring ?fields= / ?omit= from the request in its context."""
+    sparse_field_columns = {}  # computed field name -> model columns it reads
+
+    def is_sparse_root(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or not self.is_sparse_root():
+            return fields
+        allowed = [name for name, field in fields.items() if not field.write_only]
+        selected = requested_fields(request, allowed)
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items()
+                if name in selected or field.write_only}
+
+    def sparse_deferred_columns(self, model):
+        """Model columns only needed by fields the request left out."""
+        all_fields = super().get_fields()
+        kept = self.fields
+        if len(kept) == len(all_fields):
+            return []
+        concrete = {f.name for f in model._meta.concrete_fields if not f.primary_key and not f.is_relation}
+        # Unbound fields only carry an explicit source=; otherwise it is the field name
+        needed, omitted = set(), set()
+        for name, field in all_fields.items():
+            columns = needed if name in kept else omitted
+            columns.add(field.source or name)
+            columns.update(self.sparse_field_columns.get(name, ()))
+        return sorted(omitted & concrete - needed)
+
+
+class SparseFieldsMixin:
+    """
+    View mixin: defer the columns of omitted fields on reads. The lookup field
+    and keyset ordering columns are always loaded.
+    """
+
+    def filter_queryset(self, queryset):
+        # After the view's own get_queryset(), whose .only() would reset deferrals
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in permissions.SAFE_METHODS:
+            return queryset
+        serializer = self.get_serializer()
+        if not isinstance(serializer, DynamicFieldsMixin):
+            return queryset
+        keep = {getattr(self, "lookup_field", "pk")}
+        keep.update(o.lstrip("-") for o in getattr(self, "cursor_ordering", None) or ())
+        deferred = [c for c in serializer.sparse_deferred_columns(queryset.model) if c not in keep]
+        return queryset.defer(*deferred) if deferred else queryset
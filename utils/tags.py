@@ -1,12 +1,119 @@
-from typing import Dict, List
+import hashlib
+import json
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List
 
 DEFAULT_TAG = "general"  # change to "misc"/"uncategorized" if you prefer
 
-def derive_tags(name: str, TAG_RULES: Dict[str, str]) -> List[str]:
+# Keyword (matched inside titles/filenames/captions) -> tag
+TAG_RULES = {
+    "kitchen": "kitchen",
+    "bathroom": "bathroom",
+    "bath": "bathroom",
+    "tile": "tiling",
+    "floor": "flooring",
+    "shop": "shopfitting",
+    "fitout": "shopfitting",
+    "carpentry": "carpentry",
+    "paint": "painting",
+    "plaster": "plastering",
+    "plumb": "plumbing",
+    "ceiling": "ceiling",
+    "reno": "renovation",
+    "refurb": "renovation",
+}
+
+_SEPARATOR = "\x00"  # joins texts for derive_tags_many; never part of a keyword
+
+
+class TagMatcher:
+    """
+    Keyword->tag rules compiled into one regex, scanned once per text.
+
+    A zero-width lookahead over a longest-first alternation reports the longest
+    keyword starting at every position; the shorter keywords that are its prefixes
+    are folded in at compile time, so results equal "every key `in` text" while the
+    scan stays linear in the text instead of rules x text.
+    With ``whole_words`` keywords only match on word boundaries.
+    """
+
+    def __init__(self, rules: Dict[str, str], whole_words: bool = False):
+        normalized = {key.lower(): tag.strip() for key, tag in rules.items()
+                      if key and _SEPARATOR not in key}
+        keys = sorted(normalized, key=len, reverse=True)
+        self.whole_words = whole_words
+        self._tags_for = {
+            key: {normalized[other] for other in keys if self._implies(key, other)}
+            for key in keys
+        }
+        alternation = "|".join(map(re.escape, keys))
+        if not keys:
+            self._regex = None
+        elif whole_words:
+            self._regex = re.compile(rf"(?=\b({alternation})\b)")
+        else:
+            self._regex = re.compile(rf"(?=({alternation}))")
+
+    def _implies(self, key: str, other: str) -> bool:
+        """Does a hit on ``key`` also mean ``other`` matched at the same position?"""
+        if not key.startswith(other):
+            return False
+        if self.whole_words:
+            return re.match(re.escape(other) + r"\b", key) is not None
+        return True
+
+    def _matched_tags(self, text: str):
+        for m in self._regex.finditer(text):
+            yield m.start(), self._tags_for[m.group(1)]
+
+    def derive(self, text: str) -> List[str]:
+        """Sorted, unique tags for one text; at least DEFAULT_TAG."""
+        tags = set()
+        if self._regex is not None:
+            for _, matched in self._matched_tags((text or "").lower()):
+                tags |= matched
+        return sorted(tags or {DEFAULT_TAG})
+
+    def derive_many(self, texts: Iterable[str]) -> List[List[str]]:
+        """
+        Tags for many texts with a single regex pass over their concatenation.
+        Result order matches ``texts``.
+        """
+        texts = [(t or "").lower() for t in texts]
+        found = [set() for _ in texts]
+        if self._regex is not None and texts:
+            starts, offset = [], 0
+            for text in texts:
+                starts.append(offset)
+                offset += len(text) + len(_SEPARATOR)
+            for position, matched in self._matched_tags(_SEPARATOR.join(texts)):
+                found[bisect_right(starts, position) - 1] |= matched
+        return [sorted(tags or {DEFAULT_TAG}) for tags in found]
+
+
+_COMPILED: Dict[str, TagMatcher] = {}
+
+
+def compile_rules(rules: Dict[str, str] = TAG_RULES, whole_words: bool = False) -> TagMatcher:
+    """Return a TagMatcher for ``rules``, cached by the rules' content hash."""
+    digest = hashlib.sha1(
+        json.dumps([sorted(rules.items()), whole_words]).encode()).hexdigest()
+    matcher = _COMPILED.get(digest)
+    if matcher is None:
+        matcher = _COMPILED[digest] = TagMatcher(rules, whole_words=whole_words)
+    return matcher
+
+
+def derive_tags(name: str, TAG_RULES: Dict[str, str] = TAG_RULES, whole_words: bool = False) -> List[str]:
     """
     Given a name (filename/title) and a dict of keyword->tag, produce a sorted, unique list of tags.
     Guarantees at least DEFAULT_TAG if nothing matches.
     """
-    lowered = (name or "").lower()
-    tags = {tag.strip() for key, tag in TAG_RULES.items() if key.lower() in lowered}
-    return sorted(tags or {DEFAULT_TAG})
\ No newline at end of file
+    return compile_rules(TAG_RULES, whole_words).derive(name)
+
+
+def derive_tags_many(texts: Iterable[str], TAG_RULES: Dict[str, str] = TAG_RULES,
+                     whole_words: bool = False) -> List[List[str]]:
+    """Vectorised derive_tags for bulk paths (uploads, retagging)."""
+    return compile_rules(TAG_RULES, whole_words).derive_many(texts)
@@ -0,0 +1,29 @@
+"""Helpers shared by the apps' tests.py and ``manage.py check_query_budgets``."""
+from unittest import mock
+
+from rest_framework.renderers import JSONRenderer
+
+# Query budgets and output comparisons are for uncached responses
+NO_CACHE = {alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"} for alias in ("default", "api")}
+
+
+def stock_and_fast_list(client, viewset, url):
+    """
+    (stock, fast) response bodies for ``url`` on a FastListMixin viewset: the
+    stock one from the plain ListSerializer path rendered by DRF's JSONRenderer,
+    the fast one from values() rows rendered by the default ORJSONRenderer.
+    """
+    with mock.patch.object(viewset, "fast_plan", return_value=None):
+        stock = client.get(url)
+
+    plans, fast_plan = [], viewset.fast_plan
+
+    def spy(view, *args, **kwargs):
+        plans.append(fast_plan(view, *args, **kwargs))
+        return plans[-1]
+
+    with mock.patch.object(viewset, "fast_plan", spy):
+        fast = client.get(url)
+    assert stock.status_code == fast.status_code == 200, (stock.status_code, fast.status_code)
+    assert plans and all(plan is not None for plan in plans), "the fast path was not taken"
+    return JSONRenderer().render(stock.data), fast.content
@@ -0,0 +1,100 @@
+"""
+Token-bucket throttles for the anonymous POST endpoints.
+
+Each (scope, key) has a bucket of ``N`` tokens refilled at ``N / period``
+per second, so a rate of "10/hour" allows a burst of 10 and then one
+request every 6 minutes. Rates come from REST_FRAMEWORK's
+DEFAULT_THROTTLE_RATES under ``<view.throttle_scope>_ip`` and
+``<view.throttle_scope>_email``; views without a configured rate are not
+throttled. Staff and non-POST requests are never throttled.
+
+Buckets are ``core.ThrottleBucket`` rows read and written under SELECT ...
+FOR UPDATE, so every worker process sees the same bucket and concurrent
+requests for one key cannot both spend its last token. Full buckets are
+deleted by ``manage.py prune_throttle_buckets``.
+"""
+import hashlib
+
+from django.db import transaction
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+from core.models import ThrottleBucket
+from .spam import record_rejection
+
+
+def client_ip(request):
+    """The client address as DRF sees it (honours NUM_PROXIES / X-Forwarded-For)."""
+    return BaseThrottle().get_ident(request)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    key_kind = None  # "ip" | "email"
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self):
+        # Scope (and so the rate) depends on the view; resolved in allow_request()
+        pass
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        base_scope = getattr(view, "throttle_scope", None)
+        if request.method != "POST" or not base_scope or getattr(request.user, "is_staff", False):
+            return True
+        self.scope = f"{base_scope}_{self.key_kind}"
+        self.rate = self.THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        capacity, refill = float(self.num_requests), self.num_requests / self.duration
+        with transaction.atomic():
+            bucket, _ = ThrottleBucket.objects.select_for_update().get_or_create(
+                key=self.key, defaults={"tokens": capacity, "updated": self.timer(), "full_at": 0})
+            now = self.timer()  # after the lock: another request may have just spent a token
+            tokens = min(capacity, bucket.tokens + max(0.0, now - bucket.updated) * refill)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            bucket.tokens, bucket.updated = tokens, now
+            bucket.full_at = now + (capacity - tokens) / refill
+            bucket.save()
+        if not allowed:
+            self.wait_seconds = (1 - tokens) / refill
+            record_rejection(f"throttle_{self.key_kind}")
+        return allowed
+
+    def wait(self):
+        return getattr(self, "wait_seconds", None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    key_kind = "ip"
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailTokenBucketThrottle(TokenBucketThrottle):
+    """Keyed on the submitted ``email`` field (case-insensitive)."""
+    key_kind = "email"
+
+    def get_ident_value(self, request):
+        try:
+            email = request.data.get("email")
+        except AttributeError:  # non-dict payloads (e.g. a JSON list)
+            return None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        # Hashed so cache keys stay short and free of arbitrary input
+        return hashlib.sha1(email.strip().lower().encode()).hexdigest()